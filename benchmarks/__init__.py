@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for bleak.
+
+Run from the repository root, one with e.g. ``python -m benchmarks.bench_import``,
+or all of them with ``python -m benchmarks -o results.json``.
+"""
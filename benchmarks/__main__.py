@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the benchmarks and saves their results as JSON, for comparing runs.
+
+.. code-block:: sh
+
+    python -m benchmarks -o before.json
+    python -m benchmarks -o after.json --compare before.json
+    python -m benchmarks bench_gatt bench_uuids
+
+Every ``bench_*`` module with a ``run()`` function returning a dict of metrics
+is run, or only the ones named. A module that fails is reported in the
+``errors`` of the results and the others still run.
+
+With ``--compare``, each metric is shown next to its value in the earlier run.
+Metrics ending in ``_per_s`` (rates) are better when higher, those ending in
+``_s`` (seconds) or containing ``bytes`` or ``calls`` are better when lower, and
+the others, like counts of devices, are only shown. The exit status is 1 if any
+of them is worse by more than ``--threshold``.
+
+"""
+import argparse
+import datetime
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import subprocess
+import sys
+import traceback
+
+_PACKAGE = os.path.dirname(os.path.abspath(__file__))
+
+
+def available():
+    """The names of the benchmark modules."""
+    return sorted(
+        name
+        for _, name, _ in pkgutil.iter_modules([_PACKAGE])
+        if name.startswith("bench_")
+    )
+
+
+def _git_commit():
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"],
+                cwd=_PACKAGE,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names=None):
+    """Run benchmark modules.
+
+    Args:
+        names (list): Module names, e.g. ``["bench_gatt"]``. Defaults to all.
+
+    Returns:
+        Dict with the ``meta`` data of the run, the ``results`` of each module
+        and the ``errors`` of the modules that failed.
+
+    """
+    from bleak.__version__ import __version__
+
+    results = {}
+    errors = {}
+    for name in names or available():
+        print("Running {0}...".format(name), file=sys.stderr)
+        try:
+            module = importlib.import_module("benchmarks." + name)
+            results[name] = module.run()
+        except Exception:
+            errors[name] = traceback.format_exc()
+            print(errors[name], file=sys.stderr)
+    return {
+        "meta": {
+            "time": datetime.datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "bleak": __version__,
+            "commit": _git_commit(),
+        },
+        "results": results,
+        "errors": errors,
+    }
+
+
+def _direction(metric):
+    """1 if higher values of ``metric`` are better, -1 if lower, 0 if neither."""
+    if metric.endswith("_per_s"):
+        return 1
+    if metric.endswith("_s") or "bytes" in metric or "calls" in metric:
+        return -1
+    return 0
+
+
+def compare(old, new, threshold=0.2):
+    """Compare two results of :py:func:`run`.
+
+    Returns:
+        List of ``(module, metric, old value, new value, change)`` tuples,
+        where change is the relative change, signed so that a positive value
+        is an improvement, or ``None`` for metrics with no better direction,
+        and the list of regressions larger than ``threshold`` among them.
+
+    """
+    rows = []
+    regressions = []
+    for module, metrics in sorted(new["results"].items()):
+        old_metrics = old["results"].get(module, {})
+        for metric, value in sorted(metrics.items()):
+            old_value = old_metrics.get(metric)
+            if old_value is None:
+                continue
+            direction = _direction(metric)
+            change = None
+            if direction and old_value:
+                change = direction * (value - old_value) / old_value
+            row = (module, metric, old_value, value, change)
+            rows.append(row)
+            if change is not None and change < -threshold:
+                regressions.append(row)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("names", nargs="*", help="benchmark modules to run")
+    parser.add_argument("-o", "--output", help="file to save the results in")
+    parser.add_argument("--compare", help="results of an earlier run to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative change counted as a regression (default: 0.2)",
+    )
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(available())
+    if unknown:
+        parser.error("unknown benchmarks: {0}".format(", ".join(sorted(unknown))))
+
+    results = run(args.names)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if not args.compare:
+        for module, metrics in sorted(results["results"].items()):
+            for metric, value in sorted(metrics.items()):
+                print("{0:<15} {1:<40} {2:.3e}".format(module, metric, value))
+        return 1 if results["errors"] else 0
+
+    with open(args.compare) as f:
+        old = json.load(f)
+    rows, regressions = compare(old, results, args.threshold)
+    for module, metric, old_value, value, change in rows:
+        print(
+            "{0:<15} {1:<40} {2:.3e} {3:.3e} {4}".format(
+                module,
+                metric,
+                old_value,
+                value,
+                "" if change is None else "{0:+.1%}".format(change),
+            )
+        )
+    for module, metric, old_value, value, change in regressions:
+        print(
+            "Regression: {0}.{1} {2:+.1%}".format(module, metric, change),
+            file=sys.stderr,
+        )
+    return 1 if regressions or results["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
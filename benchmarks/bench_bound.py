@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the per operation overhead of characteristic reads and writes,
+comparing ``read_gatt_char``/``write_gatt_char`` by UUID with a handle from
+``BleakClientBlueZDBus.bind``.
+
+The stand-in for BlueZ in :py:mod:`benchmarks.fakebus` replies without delay, so
+the time measured is bleak's own.
+
+Run with ``python -m benchmarks.bench_bound``.
+
+"""
+import time
+
+from benchmarks.fakebus import FakeBlueZ, new_loop
+
+_ADDRESS = "00:11:22:33:44:55"
+_DATA = bytearray(20)
+
+
+def time_operations(n=20000):
+    """Mean seconds per read and write, by UUID and through a bound handle."""
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    loop = new_loop()
+    fake = FakeBlueZ(loop)
+    fake.add_device(_ADDRESS, n_services=8, n_chars=8, n_descs=1)
+    fake.install()
+    client = BleakClientBlueZDBus(_ADDRESS, loop=loop)
+
+    async def measure():
+        await client.connect()
+        char = list(client.services.characteristics.values())[-1]
+        bound = client.bind(char.uuid)
+
+        results = {}
+        t = time.perf_counter()
+        for _ in range(n):
+            await client.read_gatt_char(char.uuid)
+        results["read_gatt_char_s"] = (time.perf_counter() - t) / n
+
+        t = time.perf_counter()
+        for _ in range(n):
+            await bound.read()
+        results["bound_read_s"] = (time.perf_counter() - t) / n
+
+        t = time.perf_counter()
+        for _ in range(n):
+            await client.write_gatt_char(char.uuid, _DATA)
+        results["write_gatt_char_s"] = (time.perf_counter() - t) / n
+
+        t = time.perf_counter()
+        for _ in range(n):
+            await bound.write(_DATA)
+        results["bound_write_s"] = (time.perf_counter() - t) / n
+
+        await client.disconnect()
+        return results
+
+    try:
+        return loop.run_until_complete(measure())
+    finally:
+        loop.close()
+
+
+def run():
+    return time_operations()
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print("{0:<30} {1:.3e}".format(name, value))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of signal dispatch with one system bus connection per client
+versus the shared, routed connection of :py:mod:`bleak.backends.bluezdbus.bus`.
+
+``N`` simulated devices each send ``PropertiesChanged`` signals. With one
+connection per client, ``dbus-daemon`` delivers every signal to every connection,
+where txdbus matches it against that connection's rules and the client
+callback discards the signals of other devices. With the shared bus, each
+signal is delivered once and routed by object path.
+
+Run with ``python -m benchmarks.bench_bus``.
+
+"""
+import asyncio
+import timeit
+
+from txdbus.router import MessageRouter
+
+from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.bus import SharedBus, PROPERTIES_CHANGED
+
+
+class _Signal(object):
+    def __init__(self, path, body):
+        self.path = path
+        self.body = body
+        self.member = PROPERTIES_CHANGED
+        self.interface = defs.PROPERTIES_INTERFACE
+
+
+def _device_path(i):
+    return "/org/bluez/hci0/dev_00_00_00_00_{0:02X}_{1:02X}".format(i // 256, i % 256)
+
+
+def _signals(n_devices):
+    return [
+        _Signal(
+            _device_path(i) + "/service000c/char000d",
+            [defs.GATT_CHARACTERISTIC_INTERFACE, {"Value": b"\x00" * 20}, []],
+        )
+        for i in range(n_devices)
+    ]
+
+
+def time_per_connection(n_devices, number=20):
+    """Mean time in seconds to dispatch one round of signals, one connection per client."""
+    routers = []
+    for i in range(n_devices):
+        device_path = _device_path(i)
+
+        def callback(message, device_path=device_path):
+            # What each client's callback did: discard other devices' signals.
+            if message.path.startswith(device_path):
+                pass
+
+        router = MessageRouter()
+        router.addMatch(
+            callback,
+            interface=defs.PROPERTIES_INTERFACE,
+            member=PROPERTIES_CHANGED,
+            path_namespace="/org/bluez",
+        )
+        routers.append(router)
+
+    messages = _signals(n_devices)
+
+    def dispatch():
+        for message in messages:
+            for router in routers:
+                router.routeMessage(message)
+
+    return timeit.timeit(dispatch, number=number) / number
+
+
+def time_shared(n_devices, number=20):
+    """Mean time in seconds to dispatch one round of signals over the shared bus."""
+    loop = asyncio.new_event_loop()
+    bus = SharedBus(loop)
+    for i in range(n_devices):
+        bus.add_signal_handler(PROPERTIES_CHANGED, _device_path(i), lambda m: None)
+    messages = _signals(n_devices)
+
+    def dispatch():
+        for message in messages:
+            bus._dispatch(message)
+
+    try:
+        return timeit.timeit(dispatch, number=number) / number
+    finally:
+        loop.close()
+
+
+def run(sizes=(10, 50, 200)):
+    results = {}
+    for n in sizes:
+        # Per signal cost; with one connection per client every connection also
+        # has to receive and unmarshal each of the n signals.
+        results["per_connection_{0}_devices_per_signal_s".format(n)] = (
+            time_per_connection(n) / n
+        )
+        results["per_connection_{0}_devices_deliveries_per_signal".format(n)] = n
+        results["shared_{0}_devices_per_signal_s".format(n)] = time_shared(n) / n
+        results["shared_{0}_devices_deliveries_per_signal".format(n)] = 1
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print("{0:<50} {1:.3e}".format(name, value))
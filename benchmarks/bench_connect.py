@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of connect-to-first-read latency of the BlueZ backend against the
+in-process stand-in for BlueZ in :py:mod:`benchmarks.fakebus`.
+
+BlueZ sets ``ServicesResolved`` ``resolve_delay`` seconds after ``Connect``; the
+time beyond that is bleak's own overhead. The number of D-Bus method calls made
+per connection is reported as well, and the time of reconnecting, which
+includes ``get_services``, with and without a
+:py:class:`bleak.backends.bluezdbus.gattcache.GATTCache`.
+
+Run with ``python -m benchmarks.bench_connect``.
+
+"""
+import time
+
+from benchmarks.fakebus import FakeBlueZ, new_loop
+
+_ADDRESS = "00:11:22:33:44:55"
+
+
+def time_connect_to_first_read(latency=0.0005, resolve_delay=0.05, repeat=20):
+    """Mean connect-to-first-read time in seconds and D-Bus calls per connection."""
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    loop = new_loop()
+    fake = FakeBlueZ(loop, latency=latency, resolve_delay=resolve_delay)
+    fake.add_device(_ADDRESS, n_services=4, n_chars=4, n_descs=1)
+    fake.install()
+
+    async def connect_and_read():
+        client = BleakClientBlueZDBus(_ADDRESS, loop=loop)
+        t = time.perf_counter()
+        await client.connect()
+        char = next(iter(client.services.characteristics.values()))
+        await client.read_gatt_char(char)
+        elapsed = time.perf_counter() - t
+        await client.disconnect()
+        return elapsed
+
+    try:
+        # Keep the shared bus referenced so it is not torn down between runs.
+        loop.run_until_complete(fake.shared_bus.acquire())
+        loop.run_until_complete(connect_and_read())
+        fake.calls.clear()
+        total = sum(loop.run_until_complete(connect_and_read()) for _ in range(repeat))
+    finally:
+        loop.close()
+    return total / repeat, sum(fake.calls.values()) / repeat
+
+
+def time_reconnect(cached, latency=0.0005, n_devices=200, repeat=20):
+    """Mean time of reconnecting, including ``get_services``, in seconds.
+
+    ``n_devices`` other devices with GATT databases are known to BlueZ, as on a
+    host keeping connections to many devices.
+    """
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+    from bleak.backends.bluezdbus.gattcache import GATTCache
+
+    loop = new_loop()
+    fake = FakeBlueZ(loop, latency=latency)
+    fake.add_device(_ADDRESS, n_services=4, n_chars=4, n_descs=1)
+    for i in range(n_devices):
+        fake.add_device(
+            "00:00:00:00:{0:02X}:{1:02X}".format(i >> 8, i & 0xFF),
+            n_services=4,
+            n_chars=4,
+            n_descs=1,
+        )
+    fake.install()
+    cache = GATTCache() if cached else None
+
+    async def reconnect():
+        client = BleakClientBlueZDBus(_ADDRESS, loop=loop, gatt_cache=cache)
+        t = time.perf_counter()
+        await client.connect()
+        elapsed = time.perf_counter() - t
+        await client.disconnect()
+        return elapsed
+
+    try:
+        loop.run_until_complete(fake.shared_bus.acquire())
+        loop.run_until_complete(reconnect())
+        total = sum(loop.run_until_complete(reconnect()) for _ in range(repeat))
+    finally:
+        loop.close()
+    return total / repeat
+
+
+def run():
+    resolve_delay = 0.05
+    latency, calls = time_connect_to_first_read(resolve_delay=resolve_delay)
+    return {
+        "connect_to_first_read_s": latency,
+        "connect_overhead_s": latency - resolve_delay,
+        "dbus_calls_per_connect": calls,
+        "reconnect_s": time_reconnect(cached=False),
+        "reconnect_gatt_cached_s": time_reconnect(cached=True),
+    }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print("{0:<30} {1:.3e}".format(name, value))
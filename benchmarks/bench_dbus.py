@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmark of the BlueZ backend against the simulated BlueZ of
+:py:mod:`tests.fakebluez`, on a private ``dbus-daemon``.
+
+Unlike the benchmarks using :py:mod:`benchmarks.fakebus`, these include
+marshalling and the round trips through ``dbus-daemon``, so they show what a
+real system bus costs, e.g. ``GetManagedObjects`` returning the objects of all
+devices BlueZ knows about. The simulated BlueZ runs in the same process and
+its share of the CPU time is included in ``discover_cpu_s``.
+
+Run with ``python -m benchmarks.bench_dbus``.
+
+"""
+import asyncio
+import time
+
+from tests.fakebluez import FakeBlueZServer
+
+_ADDRESS = "00:11:22:33:44:55"
+
+
+def _timing_hook(call):
+    # Like a tracing hook, reads the details of the call and gets it when finished.
+    call.payload_size
+    return lambda call: call.duration
+
+
+async def _measure(server, loop, n_devices, repeat, n_notifications):
+    from bleak.backends.bluezdbus.bus import add_call_hook, remove_call_hook
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+    from bleak.backends.bluezdbus.discovery import discover
+    from bleak.backends.bluezdbus.gattcache import GATTCache
+
+    results = {}
+    for i in range(n_devices):
+        server.add_device(
+            "00:00:00:00:{0:02X}:{1:02X}".format(i >> 8, i & 0xFF), n_services=0
+        )
+
+    # Every device sends an advertisement each ``advertising_interval``.
+    t = time.process_time()
+    devices = await discover(timeout=0.5, loop=loop)
+    results["discover_cpu_s"] = time.process_time() - t
+    results["discovered_devices"] = len(devices)
+
+    client = BleakClientBlueZDBus(_ADDRESS, loop=loop)
+    t = time.perf_counter()
+    for _ in range(repeat):
+        await client.connect()
+        await client.disconnect()
+    results["connect_s"] = (time.perf_counter() - t) / repeat
+
+    await client.connect()
+    t = time.perf_counter()
+    for _ in range(repeat):
+        # Resolve the services again, as after a Service Changed indication.
+        client._services_resolved = False
+        await client.get_services()
+    results["get_services_s"] = (time.perf_counter() - t) / repeat
+
+    client._gatt_cache = GATTCache()
+    client._services_resolved = False
+    await client.get_services()
+    t = time.perf_counter()
+    for _ in range(repeat):
+        client._services_resolved = False
+        await client.get_services()
+    results["get_services_gatt_cached_s"] = (time.perf_counter() - t) / repeat
+
+    char = next(iter(client.services.characteristics.values()))
+    t = time.perf_counter()
+    for _ in range(repeat):
+        await client.read_gatt_char(char)
+    results["read_s"] = (time.perf_counter() - t) / repeat
+
+    client.enable_metrics()
+    t = time.perf_counter()
+    for _ in range(repeat):
+        await client.read_gatt_char(char)
+    results["read_metrics_s"] = (time.perf_counter() - t) / repeat
+    client.disable_metrics()
+
+    add_call_hook(_timing_hook)
+    t = time.perf_counter()
+    for _ in range(repeat):
+        await client.read_gatt_char(char)
+    results["read_call_hook_s"] = (time.perf_counter() - t) / repeat
+    remove_call_hook(_timing_hook)
+
+    data = bytearray(20)
+    t = time.perf_counter()
+    for _ in range(repeat):
+        await client.write_gatt_char(char, data, True)
+    results["write_s"] = (time.perf_counter() - t) / repeat
+
+    received = []
+    done = loop.create_future()
+
+    def callback(sender, value):
+        received.append(value)
+        if len(received) == n_notifications:
+            done.set_result(None)
+
+    await client.start_notify(char, callback)
+    t = time.perf_counter()
+    for _ in range(n_notifications):
+        server.notify(char.path, data)
+    await done
+    results["notifications_per_s"] = n_notifications / (time.perf_counter() - t)
+    await client.stop_notify(char)
+    await client.disconnect()
+    return results
+
+
+def run(latency=0.0, n_devices=200, repeat=50, n_notifications=5000):
+    loop = asyncio.new_event_loop()
+
+    async def main():
+        async with FakeBlueZServer(
+            loop, latency=latency, advertising_interval=0.05
+        ) as server:
+            server.add_device(_ADDRESS, n_services=4, n_chars=4, n_descs=1)
+            return await _measure(server, loop, n_devices, repeat, n_notifications)
+
+    try:
+        return loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print("{0:<30} {1:.3e}".format(name, value))
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the memory used by ``BLEDevice`` objects, as kept in large numbers
+by analytics collecting scan results, against the previous ``BLEDevice`` with
+an instance ``__dict__``, a ``metadata`` dict and a BlueZ ``details`` dict built
+up front.
+
+The devices are built the way the BlueZ scanner builds them, from property
+dicts that are shared with the scanner, so the memory counted is that of the
+device objects themselves. ``details`` are not read.
+
+Run with ``python -m benchmarks.bench_device [n_devices]``.
+
+"""
+import gc
+import sys
+import tracemalloc
+
+from bleak.backends.device import BLEDevice
+
+
+class _DictDevice(object):
+    """The previous ``BLEDevice``."""
+
+    def __init__(self, address, name, details=None, **kwargs):
+        self.address = address
+        self.name = name if name else "Unknown"
+        self.details = details
+        self.metadata = kwargs
+
+
+def _props(n_devices):
+    props = []
+    for i in range(n_devices):
+        props.append(
+            {
+                "Address": "CA:FE:{0:02X}:{1:02X}:{2:02X}:{3:02X}".format(
+                    (i >> 24) & 0xFF, (i >> 16) & 0xFF, (i >> 8) & 0xFF, i & 0xFF
+                ),
+                "Name": "Sensor {0}".format(i),
+                "RSSI": -70,
+                "UUIDs": ["0000180f-0000-1000-8000-00805f9b34fb"],
+                "ManufacturerData": {0x0059: [0, 1, 2, 3]},
+            }
+        )
+    return props
+
+
+class _Record(object):
+    # Stands in for the scanner's DeviceRecord, which exists either way.
+    __slots__ = ("path", "props")
+
+    def __init__(self, path, props):
+        self.path = path
+        self.props = props
+
+    def details(self):
+        return {"path": self.path, "props": self.props}
+
+
+def _dict_device(record):
+    props = record.props
+    return _DictDevice(
+        props["Address"],
+        props["Name"],
+        {"path": record.path, "props": props},
+        uuids=props["UUIDs"],
+        manufacturer_data=props["ManufacturerData"],
+    )
+
+
+def _slotted_device(record):
+    props = record.props
+    return BLEDevice(
+        props["Address"],
+        props["Name"],
+        rssi=props["RSSI"],
+        uuids=props["UUIDs"],
+        manufacturer_data=props["ManufacturerData"],
+        details_factory=record.details,
+    )
+
+
+def measure(factory, records):
+    """Bytes allocated per device by building one for each of ``records``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        devices = [factory(record) for record in records]
+        used = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    del devices
+    return used / len(records)
+
+
+def run(n_devices=10000):
+    records = [
+        _Record("/org/bluez/hci0/dev_{0}".format(i), props)
+        for i, props in enumerate(_props(n_devices))
+    ]
+    return {
+        "devices": n_devices,
+        "dict_bytes_per_device": measure(_dict_device, records),
+        "slotted_bytes_per_device": measure(_slotted_device, records),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for name, value in run(n).items():
+        print("{0:<30} {1:.1f}".format(name, value))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of building the BlueZ GATT tree from ``GetManagedObjects`` output,
+and of looking characteristics up in it by handle, UUID string, short UUID and
+``uuid.UUID``.
+
+Run with ``python -m benchmarks.bench_gatt``.
+
+"""
+import timeit
+import uuid
+
+from benchmarks.fakebus import FakeBlueZ, new_loop
+
+_ADDRESS = "00:11:22:33:44:55"
+
+# (services, characteristics per service, descriptors per characteristic)
+TREES = {
+    "small": (4, 4, 1),
+    "1000_attributes": (10, 33, 2),
+}
+
+
+def time_build_tree(n_services, n_chars, n_descs, number=20):
+    """Mean time in seconds to build the service collection of one device."""
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+    from bleak.backends.service import BleakGATTServiceCollection
+
+    loop = new_loop()
+    try:
+        fake = FakeBlueZ(loop)
+        path = fake.add_device(_ADDRESS, n_services, n_chars, n_descs)
+        objs = {k: v for k, v in fake.objects.items() if k.startswith(path + "/")}
+        client = BleakClientBlueZDBus(_ADDRESS, loop=loop)
+
+        def build():
+            client.services = BleakGATTServiceCollection()
+            client._add_gatt_objects(objs)
+
+        return timeit.timeit(build, number=number) / number
+    finally:
+        loop.close()
+
+
+def time_get_characteristic(n_services=10, n_chars=33, n_descs=2, number=20000):
+    """Time in seconds of ``get_characteristic`` with each kind of specifier."""
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    loop = new_loop()
+    try:
+        fake = FakeBlueZ(loop)
+        path = fake.add_device(_ADDRESS, n_services, n_chars, n_descs)
+        objs = {k: v for k, v in fake.objects.items() if k.startswith(path + "/")}
+        client = BleakClientBlueZDBus(_ADDRESS, loop=loop)
+        client._add_gatt_objects(objs)
+    finally:
+        loop.close()
+
+    # The last characteristic, the worst case for a scan of all of them.
+    char = max(client.services.characteristics.values(), key=lambda c: c.handle)
+    specifiers = {
+        "handle": char.handle,
+        "uuid_str": char.uuid,
+        "uuid_short": char.uuid[:8],
+        "uuid_obj": uuid.UUID(char.uuid),
+    }
+    get = client.services.get_characteristic
+    results = {}
+    for name, specifier in specifiers.items():
+        assert get(specifier) is char
+        # The best of several runs, which is the least disturbed by other load.
+        times = timeit.repeat(lambda: get(specifier), number=number, repeat=5)
+        results[name] = min(times) / number
+    return results
+
+
+def run():
+    results = {
+        "build_tree_{0}_s".format(name): time_build_tree(*size)
+        for name, size in TREES.items()
+    }
+    for name, value in time_get_characteristic().items():
+        results["get_characteristic_{0}_s".format(name)] = value
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print("{0:<35} {1:.3e}".format(name, value))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of ``import bleak`` and of ``BleakClient`` construction.
+
+The breakdown of the import of the BlueZ client, as needed by a short lived
+script that connects and reads a characteristic, is taken from the
+``-X importtime`` output of a fresh interpreter. The tables of UUID and
+manufacturer names only show up in it if something loads them on import.
+
+Run with ``python -m benchmarks.bench_import``.
+
+"""
+import asyncio
+import subprocess
+import sys
+import timeit
+
+_ADDRESS = "24:71:89:CC:09:05"
+
+# Modules whose cumulative import time is reported.
+_BREAKDOWN = (
+    "bleak.backends.bluezdbus.client",
+    "bleak.backends.service",
+    "bleak.backends.device",
+    "bleak.uuids",
+    "bleak._uuid_names",
+    "bleak.backends._manufacturers",
+)
+
+
+def time_import(repeat=10):
+    """Best wall time in seconds of ``import bleak`` in a fresh interpreter."""
+    stmt = "import time; t = time.perf_counter(); import bleak; print(time.perf_counter() - t)"
+    timings = []
+    for _ in range(repeat):
+        out = subprocess.check_output([sys.executable, "-c", stmt])
+        timings.append(float(out))
+    return min(timings)
+
+
+def importtime(module, repeat=5):
+    """Cumulative import times in seconds, from ``-X importtime``, of the modules
+    imported by ``import module`` in a fresh interpreter, best of ``repeat``."""
+    best = {}
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import " + module],
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stderr
+        for line in out.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            _, cumulative, name = line[len("import time:") :].split("|")
+            name = name.strip()
+            seconds = int(cumulative) * 1e-6
+            best[name] = min(best.get(name, seconds), seconds)
+    return best
+
+
+def time_client_construction(number=1000):
+    """Mean time in seconds to construct one ``BleakClient``."""
+    from bleak import BleakClient
+
+    loop = asyncio.new_event_loop()
+    try:
+        total = timeit.timeit(lambda: BleakClient(_ADDRESS, loop=loop), number=number)
+    finally:
+        loop.close()
+    return total / number
+
+
+def run():
+    results = {
+        "import_bleak_s": time_import(),
+        "client_construction_s": time_client_construction(),
+    }
+    breakdown = importtime(_BREAKDOWN[0])
+    for module in _BREAKDOWN:
+        # Zero for the modules that are not imported.
+        results["importtime_{0}_s".format(module)] = breakdown.get(module, 0.0)
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print("{0:<30} {1:.3e}".format(name, value))
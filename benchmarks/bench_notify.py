@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the cost of delivering a notification, as ``PropertiesChanged``
+signals and on the file descriptor from ``AcquireNotify``, one by one and in
+batches.
+
+The stand-in for BlueZ in :py:mod:`benchmarks.fakebus` hands signals to the
+shared bus' router already unmarshalled, so the signal path time excludes the
+D-Bus unmarshalling txdbus does on a real bus, which is the larger part of it.
+
+Run with ``python -m benchmarks.bench_notify``.
+
+"""
+import asyncio
+import time
+
+from benchmarks.fakebus import FakeBlueZ, new_loop
+
+_ADDRESS = "00:11:22:33:44:55"
+_PAYLOAD = bytes(range(20))
+
+
+def time_notifications(n=20000):
+    """Mean seconds per delivered notification, for both paths."""
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    loop = new_loop()
+    fake = FakeBlueZ(loop)
+    fake.add_device(_ADDRESS)
+    fake.install()
+    client = BleakClientBlueZDBus(_ADDRESS, loop=loop)
+    received = []
+
+    def callback(sender, data):
+        received.append(len(data))
+
+    def batch_callback(sender, records):
+        received.extend(len(payload) for _, payload in records)
+
+    async def wait_for(count):
+        while len(received) < count:
+            await asyncio.sleep(0)
+
+    async def measure():
+        await client.connect()
+        char = next(iter(client.services.characteristics.values()))
+        results = {}
+
+        await client.start_notify(char, callback)
+        t = time.perf_counter()
+        for _ in range(n):
+            fake.notify(char.path, _PAYLOAD)
+        await wait_for(n)
+        results["signal_s"] = (time.perf_counter() - t) / n
+        await client.stop_notify(char)
+
+        del received[:]
+        await client.start_notify(char, batch_callback, batch=64, batch_capacity=n)
+        t = time.perf_counter()
+        for _ in range(n):
+            fake.notify(char.path, _PAYLOAD)
+        await wait_for(n)
+        results["batched_signal_s"] = (time.perf_counter() - t) / n
+        await client.stop_notify(char)
+
+        del received[:]
+        await client.start_notify(char, callback, acquire=True)
+        t = time.perf_counter()
+        for i in range(n):
+            fake.notify(char.path, _PAYLOAD)
+            if i % 64 == 63:
+                # Let the loop read before the socket buffer fills up.
+                await wait_for(i + 1)
+        await wait_for(n)
+        results["acquired_fd_s"] = (time.perf_counter() - t) / n
+        await client.stop_notify(char)
+
+        await client.disconnect()
+        return results
+
+    try:
+        return loop.run_until_complete(measure())
+    finally:
+        loop.close()
+
+
+def run():
+    return time_notifications()
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print("{0:<30} {1:.3e}".format(name, value))
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of keeping track of scanned devices, replaying a stream of BlueZ
+signals through the scanner's device store, with ``get_discovered_devices``
+called periodically, against the previous approach of merging the property
+dicts on every signal and building all ``BLEDevice`` objects on every call.
+
+The stream is recorded from a synthetic RF environment with a fixed seed:
+``n_devices`` advertisers that appear with ``InterfacesAdded`` and then send
+mostly ``RSSI`` updates, with the occasional ``ManufacturerData`` change. A
+stream of ``[member, path, body]`` lists saved as JSON, e.g. captured from a
+real bus, can be replayed instead by passing its file name on the command line.
+
+The same stream is also fed to ``BleakScannerBlueZDBus.parse_msg``, with an
+advertisement callback registered, as a flood of signals during a scan.
+
+Run with ``python -m benchmarks.bench_scan [recording.json]``.
+
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+
+from bleak.backends.device import BLEDevice
+from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.devices import DeviceStore, device_info
+
+_ADAPTER_PATH = "/org/bluez/hci0"
+
+
+class _Signal(object):
+    __slots__ = ("member", "path", "body", "interface")
+
+    def __init__(self, member, path, body):
+        self.member = member
+        self.path = path
+        self.body = body
+        self.interface = defs.PROPERTIES_INTERFACE
+
+
+def record(n_devices=300, n_signals=100000, seed=1):
+    """Generate a signal stream, as a list of ``(member, path, body)``."""
+    rng = random.Random(seed)
+    paths = []
+    stream = []
+    for i in range(n_devices):
+        address = "CA:FE:00:00:{0:02X}:{1:02X}".format(i >> 8, i & 0xFF)
+        path = "{0}/dev_{1}".format(_ADAPTER_PATH, address.replace(":", "_"))
+        paths.append(path)
+        stream.append(
+            (
+                "InterfacesAdded",
+                "/",
+                [
+                    path,
+                    {
+                        defs.DEVICE_INTERFACE: {
+                            "Address": address,
+                            "Name": "Sensor {0}".format(i),
+                            "RSSI": -70,
+                            "UUIDs": ["0000180f-0000-1000-8000-00805f9b34fb"],
+                            "ManufacturerData": {0x0059: [0, 1, 2, 3]},
+                        }
+                    },
+                ],
+            )
+        )
+    while len(stream) < n_signals:
+        path = rng.choice(paths)
+        if rng.random() < 0.05:
+            changed = {"ManufacturerData": {0x0059: [rng.randrange(256)] * 4}}
+        else:
+            changed = {"RSSI": rng.randrange(-100, -30)}
+        stream.append(("PropertiesChanged", path, [defs.DEVICE_INTERFACE, changed, []]))
+    return stream
+
+
+class _DictMergeStore(object):
+    """The previous device tracking of the BlueZ scanner."""
+
+    def __init__(self):
+        self.devices = {}
+
+    def handle_message(self, message):
+        if message.member == "InterfacesAdded":
+            msg_path = message.body[0]
+            device_interface = message.body[1].get(defs.DEVICE_INTERFACE, {})
+            self.devices[msg_path] = (
+                {**self.devices[msg_path], **device_interface}
+                if msg_path in self.devices
+                else device_interface
+            )
+        elif message.member == "PropertiesChanged":
+            iface, changed, invalidated = message.body
+            if iface != defs.DEVICE_INTERFACE:
+                return
+            msg_path = message.path
+            self.devices[msg_path] = (
+                {**self.devices[msg_path], **changed}
+                if msg_path in self.devices
+                else changed
+            )
+
+    def get_discovered_devices(self):
+        discovered_devices = []
+        for path, props in self.devices.items():
+            if not props:
+                continue
+            name, address, _, path = device_info(path, props)
+            if address is None:
+                continue
+            discovered_devices.append(
+                BLEDevice(
+                    address,
+                    name,
+                    {"path": path, "props": props},
+                    uuids=props.get("UUIDs", []),
+                    manufacturer_data=props.get("ManufacturerData", {}),
+                )
+            )
+        return discovered_devices
+
+
+def replay(store, messages, poll_every=1000):
+    """Seconds to feed ``messages`` to ``store``, listing the devices every ``poll_every`` signals.
+
+    Returns:
+        The total seconds, and the seconds of the average listing.
+
+    """
+    polls = []
+    t = time.perf_counter()
+    for i, message in enumerate(messages):
+        store.handle_message(message)
+        if i % poll_every == 0:
+            p = time.perf_counter()
+            store.get_discovered_devices()
+            polls.append(time.perf_counter() - p)
+    store.get_discovered_devices()
+    return time.perf_counter() - t, sum(polls) / len(polls)
+
+
+def replay_scanner(messages):
+    """Seconds to feed ``messages`` to the scanner, with an advertisement callback."""
+    from bleak.backends.bluezdbus.scanner import BleakScannerBlueZDBus
+
+    loop = asyncio.new_event_loop()
+    try:
+        scanner = BleakScannerBlueZDBus(loop)
+        scanner.register_advertisement_callback(lambda data: None)
+        t = time.perf_counter()
+        for message in messages:
+            scanner.parse_msg(message)
+        return time.perf_counter() - t
+    finally:
+        loop.close()
+
+
+def run(stream=None):
+    if stream is None:
+        stream = record()
+    messages = [_Signal(*s) for s in stream]
+    old, old_poll = replay(_DictMergeStore(), messages)
+    new, new_poll = replay(DeviceStore(), messages)
+    scanner = replay_scanner(messages)
+    return {
+        "signals": len(messages),
+        "dict_merge_s": old,
+        "device_store_s": new,
+        "dict_merge_per_signal_s": old / len(messages),
+        "device_store_per_signal_s": new / len(messages),
+        "parse_msg_per_signal_s": scanner / len(messages),
+        "dict_merge_get_discovered_devices_s": old_poll,
+        "device_store_get_discovered_devices_s": new_poll,
+    }
+
+
+if __name__ == "__main__":
+    recording = None
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            recording = json.load(f)
+    for name, value in run(recording).items():
+        print("{0:<30} {1:.3e}".format(name, value))
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of bulk write without response throughput: a loop of awaited
+``write_gatt_char`` calls against ``write_stream`` on an ``AcquireWrite`` file
+descriptor and with a window of ``WriteValue`` calls in flight.
+
+The stand-in for BlueZ in :py:mod:`benchmarks.fakebus` replies to every method
+call after ``latency`` seconds, like a round trip to ``bluetoothd`` would take.
+
+Run with ``python -m benchmarks.bench_stream``.
+
+"""
+import asyncio
+
+from benchmarks.fakebus import FakeBlueZ, new_loop
+
+_ADDRESS = "00:11:22:33:44:55"
+
+
+def measure_throughput(size=1 << 16, latency=0.0002, window=8):
+    """Bytes per second of each way of writing ``size`` bytes."""
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    loop = new_loop()
+    fake = FakeBlueZ(loop, latency=latency)
+    fake.add_device(_ADDRESS)
+    fake.install()
+    client = BleakClientBlueZDBus(_ADDRESS, loop=loop)
+    data = bytes(range(256)) * (size // 256)
+
+    async def measure():
+        await client.connect()
+        char = next(iter(client.services.characteristics.values()))
+        chunk_size = fake.mtu - 3
+        results = {}
+
+        t = loop.time()
+        for i in range(0, len(data), chunk_size):
+            await client.write_gatt_char(char, data[i : i + chunk_size])
+        results["write_gatt_char_loop_bytes_per_s"] = len(data) / (loop.time() - t)
+
+        stats = await client.write_stream(char, data, chunk_size=chunk_size)
+        results["write_stream_fd_bytes_per_s"] = stats["bytes_per_second"]
+
+        stats = await client.write_stream(
+            char, data, window=window, chunk_size=chunk_size, acquire=False
+        )
+        results["write_stream_window_bytes_per_s"] = stats["bytes_per_second"]
+
+        await client.disconnect()
+        # Let the stand-in drain the socket.
+        await asyncio.sleep(0.01)
+        assert fake.written[char.path] == 3 * len(data)
+        return results
+
+    try:
+        return loop.run_until_complete(measure())
+    finally:
+        loop.close()
+
+
+def run():
+    return measure_throughput()
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print("{0:<30} {1:.3e}".format(name, value))
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of ``bleak.uuids.uuidstr_to_str`` and ``normalize_uuid_str``,
+memoized as called in loops over services, and without the cache as for UUIDs
+seen for the first time.
+
+Run with ``python -m benchmarks.bench_uuids``.
+
+"""
+import timeit
+
+_UUIDS = [
+    "00002a37-0000-1000-8000-00805f9b34fb",
+    "0000180D-0000-1000-8000-00805F9B34FB",
+    "2a19",
+    "6e400001-b5a3-f393-e0a9-e50e24dcca9e",
+]
+
+
+def time_lookups(number=20000):
+    """Time in seconds per call, for each function, with and without the cache."""
+    from bleak.uuids import normalize_uuid_str, uuidstr_to_str
+
+    results = {}
+    for func in (uuidstr_to_str, normalize_uuid_str):
+        # Loads the name tables.
+        func(_UUIDS[0])
+        for name, f in (("cached", func), ("uncached", func.__wrapped__)):
+            # The best of several runs, which is the least disturbed by other load.
+            t = min(
+                timeit.repeat(lambda: [f(u) for u in _UUIDS], number=number, repeat=5)
+            )
+            results["{0}_{1}_s".format(func.__name__, name)] = t / (
+                number * len(_UUIDS)
+            )
+    return results
+
+
+def run():
+    return time_lookups()
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print("{0:<30} {1:.3e}".format(name, value))
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+An in-process stand-in for BlueZ, used in place of the txdbus connection of
+:py:class:`bleak.backends.bluezdbus.bus.SharedBus`.
+
+It answers the method calls made by the BlueZ backend from an object tree kept
+in memory, after an optional latency, and sends the ``PropertiesChanged``
+signals BlueZ would send through the shared bus' signal router. No D-Bus daemon
+is involved, so it measures bleak's own overhead.
+
+"""
+import asyncio
+import collections
+import socket
+
+from txdbus.error import RemoteError
+
+from bleak.backends.bluezdbus import defs, bus
+
+ADAPTER_PATH = "/org/bluez/hci0"
+
+
+class _Reply(object):
+    def __init__(self, value, latency):
+        self._value = value
+        self._latency = latency
+
+    def asFuture(self, loop):
+        future = loop.create_future()
+        if isinstance(self._value, Exception):
+            result = future.set_exception
+        else:
+            result = future.set_result
+        if self._latency:
+            loop.call_later(self._latency, result, self._value)
+        else:
+            result(self._value)
+        return future
+
+
+class _Signal(object):
+    def __init__(self, path, member, body):
+        self.path = path
+        self.member = member
+        self.body = body
+        self.interface = defs.PROPERTIES_INTERFACE
+
+
+class FakeBlueZ(object):
+    """In-memory BlueZ object tree answering txdbus ``callRemote`` calls.
+
+    Args:
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+        latency (float): Delay of every method reply, in seconds.
+        resolve_delay (float): Time from ``Connect`` until ``ServicesResolved``.
+
+    """
+
+    def __init__(self, loop, latency=0.0, resolve_delay=0.0):
+        self.loop = loop
+        self.latency = latency
+        self.resolve_delay = resolve_delay
+        self.objects = {
+            ADAPTER_PATH: {
+                defs.ADAPTER_INTERFACE: {
+                    "Address": "00:00:00:00:00:01",
+                    "Modalias": "usb:v1D6Bp0246d0535",
+                }
+            }
+        }
+        self.calls = collections.Counter()
+        self.written = collections.Counter()
+        self.acquired_notify = {}
+        self.mtu = 247
+        self.shared_bus = None
+
+    def add_device(self, address, n_services=1, n_chars=1, n_descs=0):
+        """Add a device with a GATT tree of the given size.
+
+        Returns:
+            The object path of the device.
+
+        """
+        path = "{0}/dev_{1}".format(ADAPTER_PATH, address.replace(":", "_"))
+        self.objects[path] = {
+            defs.DEVICE_INTERFACE: {
+                "Address": address,
+                "Name": "Fake",
+                "RSSI": -60,
+                "Connected": False,
+                "ServicesResolved": False,
+                "UUIDs": [],
+                "Adapter": ADAPTER_PATH,
+            }
+        }
+        handle = 1
+        for s in range(n_services):
+            s_path = "{0}/service{1:04x}".format(path, handle)
+            s_uuid = "{0:08x}-0000-1000-8000-00805f9b34fb".format(0x1800 + s)
+            self.objects[path][defs.DEVICE_INTERFACE]["UUIDs"].append(s_uuid)
+            self.objects[s_path] = {
+                defs.GATT_SERVICE_INTERFACE: {
+                    "UUID": s_uuid,
+                    "Primary": True,
+                    "Device": path,
+                }
+            }
+            handle += 1
+            for c in range(n_chars):
+                c_path = "{0}/char{1:04x}".format(s_path, handle)
+                self.objects[c_path] = {
+                    defs.GATT_CHARACTERISTIC_INTERFACE: {
+                        "UUID": "{0:08x}-0000-1000-8000-00805f9b34fb".format(
+                            0x10000 + handle
+                        ),
+                        "Service": s_path,
+                        "Flags": [
+                            "read",
+                            "write",
+                            "write-without-response",
+                            "notify",
+                        ],
+                        "Value": [0] * 20,
+                    }
+                }
+                handle += 1
+                for d in range(n_descs):
+                    d_path = "{0}/desc{1:04x}".format(c_path, handle)
+                    self.objects[d_path] = {
+                        defs.GATT_DESCRIPTOR_INTERFACE: {
+                            "UUID": "00002902-0000-1000-8000-00805f9b34fb",
+                            "Characteristic": c_path,
+                        }
+                    }
+                    handle += 1
+        return path
+
+    def install(self):
+        """Make :py:func:`bleak.backends.bluezdbus.bus.get_shared_bus` use this object on ``self.loop``."""
+        shared_bus = bus.SharedBus(self.loop)
+        shared_bus.connection = self
+        shared_bus._connecting = self.loop.create_future()
+        shared_bus._connecting.set_result(None)
+        bus._buses[self.loop] = shared_bus
+        self.shared_bus = shared_bus
+        return shared_bus
+
+    def emit_properties_changed(self, path, interface, changed):
+        self.objects[path][interface].update(changed)
+        self.shared_bus._dispatch(
+            _Signal(path, bus.PROPERTIES_CHANGED, [interface, changed, []])
+        )
+
+    def notify(self, path, value):
+        """Send a notification the way BlueZ would for the characteristic at ``path``."""
+        sock = self.acquired_notify.get(path)
+        if sock is not None:
+            sock.send(value)
+        else:
+            self.emit_properties_changed(
+                path, defs.GATT_CHARACTERISTIC_INTERFACE, {"Value": list(value)}
+            )
+
+    # The txdbus connection interface
+
+    def callRemote(self, objectPath, methodName, interface=None, body=None, **kwargs):
+        self.calls[methodName] += 1
+        try:
+            value = getattr(self, "_" + methodName)(objectPath, interface, body)
+        except Exception as e:
+            value = e
+        return _Reply(value, self.latency)
+
+    def disconnect(self):
+        pass
+
+    def delMatch(self, rule_id):
+        return _Reply(None, 0)
+
+    # BlueZ methods
+
+    def _GetManagedObjects(self, path, interface, body):
+        return self.objects
+
+    def _Get(self, path, interface, body):
+        try:
+            return self.objects[path][body[0]][body[1]]
+        except KeyError:
+            raise RemoteError("org.freedesktop.DBus.Error.InvalidArgs")
+
+    def _GetAll(self, path, interface, body):
+        return dict(self.objects[path].get(body[0], {}))
+
+    def _Connect(self, path, interface, body):
+        self.loop.call_soon(
+            self.emit_properties_changed,
+            path,
+            defs.DEVICE_INTERFACE,
+            {"Connected": True},
+        )
+        self.objects[path][defs.DEVICE_INTERFACE]["Connected"] = True
+        self.loop.call_later(
+            self.resolve_delay,
+            self.emit_properties_changed,
+            path,
+            defs.DEVICE_INTERFACE,
+            {"ServicesResolved": True},
+        )
+
+    def _Disconnect(self, path, interface, body):
+        self.emit_properties_changed(
+            path,
+            defs.DEVICE_INTERFACE,
+            {"Connected": False, "ServicesResolved": False},
+        )
+
+    def _ReadValue(self, path, interface, body):
+        return self.objects[path][interface].get("Value", [])
+
+    def _WriteValue(self, path, interface, body):
+        self.objects[path][interface]["Value"] = body[0]
+        self.written[path] += len(body[0])
+
+    def _AcquireWrite(self, path, interface, body):
+        ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        ours.setblocking(False)
+
+        def on_readable():
+            try:
+                value = ours.recv(65535)
+            except BlockingIOError:
+                return
+            if value:
+                self.objects[path][interface]["Value"] = value
+                self.written[path] += len(value)
+            else:
+                self.loop.remove_reader(ours.fileno())
+                ours.close()
+
+        self.loop.add_reader(ours.fileno(), on_readable)
+        return theirs.detach(), self.mtu
+
+    def _AcquireNotify(self, path, interface, body):
+        ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        self.acquired_notify[path] = ours
+        return theirs.detach(), self.mtu
+
+    def _StartNotify(self, path, interface, body):
+        pass
+
+    def _StopNotify(self, path, interface, body):
+        pass
+
+    def _SetDiscoveryFilter(self, path, interface, body):
+        pass
+
+    def _StartDiscovery(self, path, interface, body):
+        pass
+
+    def _StopDiscovery(self, path, interface, body):
+        pass
+
+
+def new_loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop
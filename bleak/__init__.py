@@ -5,13 +5,11 @@
 __author__ = """Henrik Blidh"""
 __email__ = "henrik.blidh@gmail.com"
 
-import re
 import os
 import sys
 import logging
 import platform
-import subprocess
-import asyncio
+import importlib
 
 from bleak.__version__ import __version__  # noqa
 from bleak.exc import BleakError
@@ -20,49 +18,51 @@ _on_rtd = os.environ.get("READTHEDOCS") == "True"
 
 _logger = logging.getLogger(__name__)
 _logger.addHandler(logging.NullHandler())
-_logger.setLevel(logging.DEBUG)
 if bool(os.environ.get("BLEAK_LOGGING", False)):
+    _logger.setLevel(logging.DEBUG)
     FORMAT = "%(asctime)-15s %(name)-8s %(levelname)s: %(message)s"
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(logging.DEBUG)
     handler.setFormatter(logging.Formatter(fmt=FORMAT))
     _logger.addHandler(handler)
 
-if platform.system() == "Linux":
-    if not _on_rtd:
-        # TODO: Check if BlueZ version 5.43 is sufficient.
-        p = subprocess.Popen(["bluetoothctl", "--version"], stdout=subprocess.PIPE)
-        out, _ = p.communicate()
-        s = re.search(b"(\\d+).(\\d+)", out.strip(b"'"))
-        if not s:
-            raise BleakError("Could not determine BlueZ version: {0}".format(out))
-
-        major, minor = s.groups()
-        if not (int(major) == 5 and int(minor) >= 43):
-            raise BleakError(
-                "Bleak requires BlueZ >= 5.43. Found version {0} installed.".format(out)
-            )
+# The backend classes are imported on first access, see ``__getattr__`` below.
+# Mapping of public name to (module, attribute) in the platform's backend.
+_backend_attributes = {}
 
-    from bleak.backends.bluezdbus.discovery import discover  # noqa
-    from bleak.backends.bluezdbus.scanner import (
-        BleakScannerBlueZDBus as BleakScanner,
-    )  # noqa
-    from bleak.backends.bluezdbus.client import (
-        BleakClientBlueZDBus as BleakClient,
-    )  # noqa
+if platform.system() == "Linux":
+    # The BlueZ version check is done lazily, over D-Bus, when a
+    # client or scanner first talks to BlueZ.
+    _backend_attributes = {
+        "discover": ("bleak.backends.bluezdbus.discovery", "discover"),
+        "BleakScanner": ("bleak.backends.bluezdbus.scanner", "BleakScannerBlueZDBus"),
+        "BleakClient": ("bleak.backends.bluezdbus.client", "BleakClientBlueZDBus"),
+        "BleakConnectionPool": (
+            "bleak.backends.bluezdbus.pool",
+            "BleakConnectionPool",
+        ),
+        "BleakAdapterScheduler": (
+            "bleak.backends.bluezdbus.scheduler",
+            "BleakAdapterScheduler",
+        ),
+    }
 elif platform.system() == "Darwin":
     from Foundation import NSClassFromString
 
     if NSClassFromString("CBPeripheral") is None:
         raise BleakError("Bleak requires the CoreBluetooth Framework")
 
-    from bleak.backends.corebluetooth.discovery import discover  # noqa
-    from bleak.backends.corebluetooth.scanner import (
-        BleakScannerCoreBluetooth as BleakScanner,
-    )  # noqa
-    from bleak.backends.corebluetooth.client import (
-        BleakClientCoreBluetooth as BleakClient,
-    )  # noqa
+    _backend_attributes = {
+        "discover": ("bleak.backends.corebluetooth.discovery", "discover"),
+        "BleakScanner": (
+            "bleak.backends.corebluetooth.scanner",
+            "BleakScannerCoreBluetooth",
+        ),
+        "BleakClient": (
+            "bleak.backends.corebluetooth.client",
+            "BleakClientCoreBluetooth",
+        ),
+    }
 
 elif platform.system() == "Windows":
     # Requires Windows 10 Creators update at least, i.e. Window 10.0.16299
@@ -79,14 +79,41 @@ elif platform.system() == "Windows":
             "Requires at least Windows 10 version 0.16299 (Fall Creators Update)."
         )
 
-    from bleak.backends.dotnet.discovery import discover  # noqa
-    from bleak.backends.dotnet.scanner import BleakScannerDotNet as BleakScanner  # noqa
-    from bleak.backends.dotnet.client import BleakClientDotNet as BleakClient  # noqa
+    _backend_attributes = {
+        "discover": ("bleak.backends.dotnet.discovery", "discover"),
+        "BleakScanner": ("bleak.backends.dotnet.scanner", "BleakScannerDotNet"),
+        "BleakClient": ("bleak.backends.dotnet.client", "BleakClientDotNet"),
+    }
+
+
+def __getattr__(name):
+    """Import the backend implementation of ``name`` on first access (PEP 562)."""
+    try:
+        module_name, attribute = _backend_attributes[name]
+    except KeyError:
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name)
+        )
+    value = getattr(importlib.import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_backend_attributes))
+
+
+if sys.version_info < (3, 7):
+    # Module level ``__getattr__`` is not supported, import the backend eagerly.
+    for _name in _backend_attributes:
+        __getattr__(_name)
 
 
 def cli():
     import argparse
+    import asyncio
     from asyncio.tasks import ensure_future
+    from bleak import discover
 
     loop = asyncio.get_event_loop()
 
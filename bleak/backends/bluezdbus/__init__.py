@@ -1,7 +1,5 @@
 from asyncio import AbstractEventLoop
 
-from twisted.internet.asyncioreactor import AsyncioSelectorReactor
-
 _reactors = {}
 
 
@@ -23,6 +21,9 @@ def get_reactor(loop: AbstractEventLoop):
 
     """
     if loop not in _reactors:
+        # Twisted is imported here to keep it out of ``import bleak``.
+        from twisted.internet.asyncioreactor import AsyncioSelectorReactor
+
         _reactors[loop] = AsyncioSelectorReactor(loop)
 
     return _reactors[loop]
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Characteristic handles with everything needed for a read or write resolved up
+front, returned by :py:meth:`bleak.backends.bluezdbus.client.BleakClientBlueZDBus.bind`.
+
+"""
+import logging
+import os
+
+from bleak.log import get_logger
+from bleak.exc import BleakError
+from bleak.backends.metrics import instrumented
+from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.bus import call_remote
+
+logger = get_logger(__name__)
+
+
+class BoundCharacteristicBlueZDBus(object):
+    """A characteristic bound to a connected client.
+
+    Use :py:meth:`bleak.backends.bluezdbus.client.BleakClientBlueZDBus.bind` to
+    create one. The object path, write type and D-Bus call arguments are worked
+    out when the handle is created, so :py:meth:`read` and :py:meth:`write` do not
+    look up the characteristic or check its properties on every call. They are
+    recorded in the client's metrics as ``read_gatt_char`` and ``write_gatt_char``.
+
+    Args:
+        client (BleakClientBlueZDBus): The connected client.
+        characteristic (BleakGATTCharacteristicBlueZDBus): The characteristic to bind.
+        response (bool): If writes are done with response, or ``None`` if the
+            characteristic cannot be written.
+
+    """
+
+    __slots__ = (
+        "client",
+        "characteristic",
+        "path",
+        "response",
+        "_read_kwargs",
+        "_write_kwargs",
+        "_write_options",
+        "_acquire_write",
+    )
+
+    def __init__(self, client, characteristic, response):
+        self.client = client
+        self.characteristic = characteristic
+        self.path = characteristic.path
+        self.response = response
+
+        self._read_kwargs = {
+            "interface": defs.GATT_CHARACTERISTIC_INTERFACE,
+            "destination": defs.BLUEZ_SERVICE,
+            "signature": "a{sv}",
+            "returnSignature": "ay",
+        }
+        # Older versions of BlueZ don't have the "type" option, see
+        # BleakClientBlueZDBus.write_gatt_char.
+        self._acquire_write = response is False and not client._has_write_type_option()
+        if self._acquire_write:
+            self._write_kwargs = {
+                "interface": defs.GATT_CHARACTERISTIC_INTERFACE,
+                "destination": defs.BLUEZ_SERVICE,
+                "signature": "a{sv}",
+                "body": [{}],
+                "returnSignature": "hq",
+            }
+        else:
+            self._write_kwargs = {
+                "interface": defs.GATT_CHARACTERISTIC_INTERFACE,
+                "destination": defs.BLUEZ_SERVICE,
+                "signature": "aya{sv}",
+                "returnSignature": "",
+            }
+        self._write_options = {"type": "request" if response else "command"}
+
+    def __repr__(self):
+        return "<{0} {1} ({2})>".format(
+            self.__class__.__name__, self.characteristic.uuid, self.path
+        )
+
+    @property
+    def uuid(self) -> str:
+        """The UUID of the bound characteristic"""
+        return self.characteristic.uuid
+
+    @property
+    def _metrics(self):
+        return self.client._metrics
+
+    @instrumented("read_gatt_char", lambda self: self.characteristic.uuid)
+    async def read(self) -> bytearray:
+        """Read the value of the characteristic.
+
+        Returns:
+            (bytearray) The read data.
+
+        """
+        bus = self.client._bus
+        if bus is None:
+            raise BleakError("Not connected")
+
+        value = bytearray(
+            await call_remote(
+                bus,
+                self.client.loop,
+                self.path,
+                "ReadValue",
+                body=[{}],
+                **self._read_kwargs
+            )
+        )
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Read Characteristic %s | %s: %s",
+                self.characteristic.uuid,
+                self.path,
+                value,
+            )
+        return value
+
+    @instrumented("write_gatt_char", lambda self, data: self.characteristic.uuid)
+    async def write(self, data: bytearray) -> None:
+        """Write to the characteristic, with the write type chosen when binding.
+
+        Args:
+            data (bytes or bytearray): The data to send.
+
+        """
+        bus = self.client._bus
+        if bus is None:
+            raise BleakError("Not connected")
+        if self.response is None:
+            raise BleakError(
+                "Characteristic {0} does not support write operations!".format(
+                    self.characteristic.uuid
+                )
+            )
+
+        if self._acquire_write:
+            fd, _ = await call_remote(
+                bus, self.client.loop, self.path, "AcquireWrite", **self._write_kwargs
+            )
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+        else:
+            await call_remote(
+                bus,
+                self.client.loop,
+                self.path,
+                "WriteValue",
+                body=[data, self._write_options],
+                **self._write_kwargs
+            )
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Write Characteristic %s | %s: %s",
+                self.characteristic.uuid,
+                self.path,
+                data,
+            )
@@ -0,0 +1,569 @@
+# -*- coding: utf-8 -*-
+"""
+A reference counted system bus connection, shared by all BlueZ clients and
+scanners running on the same event loop.
+
+Instead of each client and scanner opening a connection of its own and
+installing its own match rules, which makes ``dbus-daemon`` fan out every
+``PropertiesChanged`` signal to every connection, one connection with one set of
+match rules is used and the signals are routed to the interested parties by
+object path.
+
+All D-Bus method calls of the backend go through :py:func:`call_remote`, which
+counts the calls in flight on each bus and passes every call to the hooks added
+with :py:func:`add_call_hook`, e.g. for tracing.
+
+"""
+import asyncio
+import functools
+import logging
+import time
+import weakref
+from asyncio import AbstractEventLoop
+from typing import Callable
+
+from txdbus import marshal
+from txdbus.error import RemoteError
+
+from bleak.backends.bluezdbus import defs, signals, get_reactor
+
+logger = logging.getLogger(__name__)
+
+_buses = {}
+
+# Functions called with every DBusCall made with call_remote().
+_call_hooks = []
+
+# Calls in flight and the most calls in flight so far, per bus connection.
+_in_flight = weakref.WeakKeyDictionary()
+
+# The signals routed by the shared bus.
+PROPERTIES_CHANGED = "PropertiesChanged"
+INTERFACES_ADDED = "InterfacesAdded"
+INTERFACES_REMOVED = "InterfacesRemoved"
+
+
+class SharedBus(object):
+    """A system bus connection shared between clients and scanners.
+
+    Use :py:func:`get_shared_bus` to obtain one and call :py:meth:`release`
+    when done with it. The underlying connection is closed when the last user
+    has released it.
+
+    Signal handlers are registered per object path and signal member. A handler
+    registered on a path gets signals for that object and all objects below it,
+    e.g. a handler on ``/org/bluez/hci0`` gets the signals of all devices on that
+    adapter. For ``InterfacesAdded`` and ``InterfacesRemoved`` the path of the
+    added or removed object is used, not the path of the object manager.
+
+    BlueZ keeps one discovery session per bus connection, so discovery is also
+    reference counted per adapter, see :py:meth:`start_discovery`.
+
+    Args:
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+        bus_address (str): The bus to connect to. Defaults to ``"system"``.
+
+    """
+
+    def __init__(self, loop: AbstractEventLoop, bus_address: str = "system"):
+        self.loop = loop
+        self.bus_address = bus_address
+        self.connection = None
+
+        self._connecting = None
+        self._refcount = 0
+        self._rules = []
+        self._discovery_sessions = {}
+        self._discovery_filters = {}
+        self._discovery_starting = {}
+        self._handlers = {
+            PROPERTIES_CHANGED: {},
+            INTERFACES_ADDED: {},
+            INTERFACES_REMOVED: {},
+        }
+
+    def __repr__(self):
+        return "<{0}, {1}, users: {2}>".format(
+            self.__class__.__name__, self.bus_address, self._refcount
+        )
+
+    @property
+    def refcount(self) -> int:
+        """The number of clients and scanners currently using this bus"""
+        return self._refcount
+
+    @property
+    def in_flight(self) -> int:
+        """The number of method calls on this bus waiting for a reply"""
+        return in_flight(self.connection) if self.connection else 0
+
+    async def acquire(self) -> "SharedBus":
+        """Connect to the bus, unless already connected, and increment the reference count."""
+        if self._connecting is None:
+            self._connecting = asyncio.ensure_future(self._connect(), loop=self.loop)
+        try:
+            await asyncio.shield(self._connecting)
+        except Exception:
+            self._connecting = None
+            raise
+        self._refcount += 1
+        return self
+
+    async def release(self) -> None:
+        """Decrement the reference count and disconnect when it reaches zero."""
+        if self._refcount <= 0:
+            return
+        self._refcount -= 1
+        if self._refcount:
+            return
+
+        if _buses.get(self.loop) is self:
+            del _buses[self.loop]
+        connection, self.connection = self.connection, None
+        self._connecting = None
+        self._discovery_sessions.clear()
+        self._discovery_filters.clear()
+
+        rules, self._rules = self._rules, []
+        for rule_id in rules:
+            try:
+                await connection.delMatch(rule_id).asFuture(self.loop)
+            except Exception as e:
+                logger.error("Could not remove rule {0}: {1}".format(rule_id, e))
+
+        # Try to disconnect the System Bus.
+        try:
+            connection.disconnect()
+        except Exception as e:
+            logger.error("Attempt to disconnect system bus failed: {0}".format(e))
+
+    def add_signal_handler(
+        self, member: str, path: str, callback: Callable[[object], None]
+    ) -> None:
+        """Route ``member`` signals for ``path`` and the objects below it to ``callback``.
+
+        Args:
+            member (str): ``PropertiesChanged``, ``InterfacesAdded`` or ``InterfacesRemoved``.
+            path (str): The object path to get signals for.
+            callback: Function accepting the txdbus signal message.
+
+        """
+        self._handlers[member].setdefault(path, []).append(callback)
+
+    def remove_signal_handler(
+        self, member: str, path: str, callback: Callable[[object], None]
+    ) -> None:
+        """Remove a handler added with :py:meth:`add_signal_handler`."""
+        handlers = self._handlers[member].get(path)
+        if handlers and callback in handlers:
+            handlers.remove(callback)
+            if not handlers:
+                del self._handlers[member][path]
+
+    async def start_discovery(self, adapter_path: str, filters: dict) -> None:
+        """Start discovery on an adapter, unless already started over this bus.
+
+        Since all users share one bus connection, and thereby one BlueZ discovery
+        session, the ``filters`` are only applied by the first user. Later users
+        get the devices of the session as filtered for the first one, and a
+        warning is logged if their ``filters`` differ. Every call must be matched
+        by a call to :py:meth:`stop_discovery`, unless it raised. Users calling
+        while discovery is being started wait for it to be started.
+
+        Args:
+            adapter_path (str): Object path of the adapter, e.g. ``/org/bluez/hci0``.
+            filters (dict): Filters for the ``SetDiscoveryFilter`` method.
+
+        """
+        count = self._discovery_sessions.get(adapter_path, 0)
+        self._discovery_sessions[adapter_path] = count + 1
+        if count and filters != self._discovery_filters.get(adapter_path, filters):
+            logger.warning(
+                "Discovery on {0} is already started with filters {1}, "
+                "not applying {2}.".format(
+                    adapter_path, self._discovery_filters[adapter_path], filters
+                )
+            )
+        starting = self._discovery_starting.get(adapter_path)
+        if starting is None:
+            if count:
+                return
+            starting = asyncio.ensure_future(
+                self._begin_discovery(adapter_path, filters), loop=self.loop
+            )
+            self._discovery_starting[adapter_path] = starting
+            self._discovery_filters[adapter_path] = filters
+
+        try:
+            await asyncio.shield(starting)
+        except BaseException:
+            if starting.done() and (
+                starting.cancelled() or starting.exception() is not None
+            ):
+                # Discovery was not started, so neither was this session.
+                self._discovery_sessions[adapter_path] -= 1
+            else:
+                # Cancelled while starting, end the session once it is started.
+                asyncio.ensure_future(self.stop_discovery(adapter_path), loop=self.loop)
+            raise
+
+    async def restart_discovery(self, adapter_path: str) -> bool:
+        """Start discovery again on an adapter that stopped discovering by itself.
+
+        BlueZ ends all discovery sessions of an adapter when it is powered off
+        or reset. This starts the session of this bus again, with the filters
+        it was started with, if anyone is still using it.
+
+        Args:
+            adapter_path (str): Object path of the adapter, e.g. ``/org/bluez/hci0``.
+
+        Returns:
+            ``True`` if discovery was started, ``False`` if no one uses it.
+
+        """
+        if not self._discovery_sessions.get(adapter_path):
+            return False
+        try:
+            await self._start_discovery(
+                adapter_path, self._discovery_filters.get(adapter_path, {})
+            )
+        except RemoteError as e:
+            # Another user already restarted it.
+            if e.errName != "org.bluez.Error.InProgress":
+                raise
+        return True
+
+    async def stop_discovery(self, adapter_path: str) -> None:
+        """Stop discovery on an adapter when no one else is using it.
+
+        Args:
+            adapter_path (str): Object path of the adapter, e.g. ``/org/bluez/hci0``.
+
+        """
+        count = self._discovery_sessions.get(adapter_path, 0)
+        if count <= 0:
+            return
+        self._discovery_sessions[adapter_path] = count - 1
+        if count > 1:
+            return
+
+        starting = self._discovery_starting.get(adapter_path)
+        if starting is not None:
+            try:
+                await asyncio.shield(starting)
+            except Exception:
+                # Discovery was not started, so there is nothing to stop.
+                return
+            if self._discovery_sessions.get(adapter_path):
+                # Someone started using it while it was being started.
+                return
+        self._discovery_filters.pop(adapter_path, None)
+
+        await call_remote(
+            self.connection,
+            self.loop,
+            adapter_path,
+            "StopDiscovery",
+            interface=defs.ADAPTER_INTERFACE,
+            destination=defs.BLUEZ_SERVICE,
+        )
+
+    # Internal methods
+
+    async def _begin_discovery(self, adapter_path: str, filters: dict) -> None:
+        try:
+            await self._start_discovery(adapter_path, filters)
+        except BaseException:
+            self._discovery_filters.pop(adapter_path, None)
+            raise
+        finally:
+            self._discovery_starting.pop(adapter_path, None)
+
+    async def _start_discovery(self, adapter_path: str, filters: dict) -> None:
+        await call_remote(
+            self.connection,
+            self.loop,
+            adapter_path,
+            "SetDiscoveryFilter",
+            interface=defs.ADAPTER_INTERFACE,
+            destination=defs.BLUEZ_SERVICE,
+            signature="a{sv}",
+            body=[filters],
+        )
+        await call_remote(
+            self.connection,
+            self.loop,
+            adapter_path,
+            "StartDiscovery",
+            interface=defs.ADAPTER_INTERFACE,
+            destination=defs.BLUEZ_SERVICE,
+        )
+
+    async def _connect(self) -> None:
+        from txdbus.client import connect as txdbus_connect
+
+        reactor = get_reactor(self.loop)
+        connection = await txdbus_connect(
+            reactor, busAddress=self.bus_address
+        ).asFuture(self.loop)
+        try:
+            self._rules = [
+                await signals.listen_properties_changed(
+                    connection, self.loop, self._dispatch
+                ),
+                await signals.listen_interfaces_added(
+                    connection, self.loop, self._dispatch
+                ),
+                await signals.listen_interfaces_removed(
+                    connection, self.loop, self._dispatch
+                ),
+            ]
+        except Exception:
+            connection.disconnect()
+            raise
+        self.connection = connection
+
+    def _dispatch(self, message) -> None:
+        handlers = self._handlers.get(message.member)
+        if not handlers:
+            return
+
+        if message.member == PROPERTIES_CHANGED:
+            path = message.path
+        else:
+            path = message.body[0]
+
+        # Walk up the object tree, e.g. from a characteristic to its device and
+        # adapter, up to and including the root.
+        while True:
+            callbacks = handlers.get(path)
+            if callbacks:
+                for callback in tuple(callbacks):
+                    try:
+                        callback(message)
+                    except Exception:
+                        logger.exception(
+                            "Signal handler {0} for {1} failed.".format(callback, path)
+                        )
+            if path == "/":
+                break
+            path = path[: path.rfind("/")] or "/"
+
+
+async def get_shared_bus(loop: AbstractEventLoop) -> SharedBus:
+    """Get the shared system bus for the provided loop, connecting if needed.
+
+    The bus is cached for each loop, like the reactor returned by
+    :py:func:`bleak.backends.bluezdbus.get_reactor`. Every call must be matched by
+    a call to :py:meth:`SharedBus.release`.
+
+    Args:
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+
+    Returns:
+        A connected :py:class:`SharedBus`.
+
+    """
+    bus = _buses.get(loop)
+    if bus is None:
+        bus = _buses[loop] = SharedBus(loop)
+    return await bus.acquire()
+
+
+class DBusCall(object):
+    """A D-Bus method call made with :py:func:`call_remote`, as passed to call hooks.
+
+    Attributes:
+        bus: The txdbus connection the call was made on.
+        path (str): The object path called.
+        member (str): The method called, e.g. ``"ReadValue"``.
+        interface (str): The interface of the method, or ``None``.
+        signature (str): The signature of the arguments, or ``None``.
+        body (list): The arguments.
+        in_flight (int): The number of calls in flight on the bus when the call
+            was made, including this one.
+        start (float): The ``time.perf_counter()`` time the call was made.
+        duration (float): The seconds until the reply, or ``None`` while in flight.
+        error (Exception): The error the call failed with, or ``None``.
+
+    """
+
+    __slots__ = (
+        "bus",
+        "path",
+        "member",
+        "interface",
+        "signature",
+        "body",
+        "in_flight",
+        "start",
+        "duration",
+        "error",
+    )
+
+    def __init__(self, bus, path, member, interface, signature, body, in_flight):
+        self.bus = bus
+        self.path = path
+        self.member = member
+        self.interface = interface
+        self.signature = signature
+        self.body = body
+        self.in_flight = in_flight
+        self.start = time.perf_counter()
+        self.duration = None
+        self.error = None
+
+    def __repr__(self):
+        return "<{0} {1}.{2} {3}>".format(
+            self.__class__.__name__, self.interface, self.member, self.path
+        )
+
+    @property
+    def payload_size(self) -> int:
+        """The size in bytes of the marshalled arguments, computed when first asked for"""
+        if not self.body:
+            return 0
+        signature = self.signature or marshal.sigFromPy(self.body)
+        return marshal.marshal(signature, self.body)[0]
+
+
+def add_call_hook(hook: Callable[[DBusCall], Callable[[DBusCall], None]]) -> None:
+    """Add a function called with every D-Bus method call of the backend.
+
+    The hook is called with the :py:class:`DBusCall` when the call is made, in
+    the context of the caller, and can return a function that is called with it
+    again when the reply or error has arrived, e.g. to start and end a tracing
+    span:
+
+    .. code-block:: python
+
+        def hook(call):
+            span = tracer.start_span("{0}.{1}".format(call.interface, call.member))
+            span.set_attribute("dbus.path", call.path)
+            return lambda call: span.end()
+
+        add_call_hook(hook)
+
+    Calls are only timed while hooks are installed.
+
+    Args:
+        hook: Function accepting a :py:class:`DBusCall` and returning ``None``
+            or a function accepting the finished :py:class:`DBusCall`.
+
+    """
+    _call_hooks.append(hook)
+
+
+def remove_call_hook(hook: Callable[[DBusCall], Callable[[DBusCall], None]]) -> None:
+    """Remove a hook added with :py:func:`add_call_hook`."""
+    if hook in _call_hooks:
+        _call_hooks.remove(hook)
+
+
+def in_flight(bus) -> int:
+    """The number of method calls on a txdbus connection waiting for a reply."""
+    counts = _in_flight.get(bus)
+    return counts[0] if counts else 0
+
+
+def peak_in_flight(bus, reset: bool = False) -> int:
+    """The most method calls that have been in flight at once on a txdbus connection.
+
+    Args:
+        bus: The txdbus connection.
+        reset (bool): Start counting again from the calls in flight now.
+
+    """
+    counts = _in_flight.get(bus)
+    if not counts:
+        return 0
+    peak = counts[1]
+    if reset:
+        counts[1] = counts[0]
+    return peak
+
+
+def call_remote(bus, loop: AbstractEventLoop, path: str, member: str, **kwargs):
+    """Call a D-Bus method.
+
+    Used for all method calls instead of ``bus.callRemote(...).asFuture(loop)``,
+    so that they are counted and passed to the hooks added with
+    :py:func:`add_call_hook`. The call is sent before returning.
+
+    Args:
+        bus: The txdbus connection, e.g. :py:attr:`SharedBus.connection`.
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+        path (str): The object path to call.
+        member (str): The method to call.
+        **kwargs: ``interface``, ``destination``, ``signature``, ``body`` and
+            other keyword arguments of txdbus' ``callRemote``.
+
+    Returns:
+        An :py:class:`asyncio.Future` of the reply.
+
+    """
+    counts = _in_flight.get(bus)
+    if counts is None:
+        counts = _in_flight[bus] = [0, 0]
+    counts[0] += 1
+    if counts[0] > counts[1]:
+        counts[1] = counts[0]
+
+    call = None
+    finishers = ()
+    if _call_hooks:
+        call = DBusCall(
+            bus,
+            path,
+            member,
+            kwargs.get("interface"),
+            kwargs.get("signature"),
+            kwargs.get("body"),
+            counts[0],
+        )
+        finishers = _start_hooks(call)
+
+    try:
+        future = bus.callRemote(path, member, **kwargs).asFuture(loop)
+    except Exception as e:
+        _finish(counts, call, finishers, e)
+        raise
+    future.add_done_callback(functools.partial(_call_done, counts, call, finishers))
+    return future
+
+
+def _start_hooks(call):
+    finishers = []
+    for hook in tuple(_call_hooks):
+        try:
+            finisher = hook(call)
+        except Exception:
+            logger.exception("D-Bus call hook {0} failed.".format(hook))
+            continue
+        if finisher is not None:
+            finishers.append(finisher)
+    return finishers
+
+
+def _call_done(counts, call, finishers, future):
+    if call is None:
+        counts[0] -= 1
+        return
+    if future.cancelled():
+        error = asyncio.CancelledError()
+    else:
+        error = future.exception()
+    _finish(counts, call, finishers, error)
+
+
+def _finish(counts, call, finishers, error):
+    counts[0] -= 1
+    if call is None:
+        return
+    call.duration = time.perf_counter() - call.start
+    call.error = error
+    for finisher in finishers:
+        try:
+            finisher(call)
+        except Exception:
+            logger.exception("D-Bus call hook {0} failed.".format(finisher))
@@ -2,28 +2,39 @@
 import logging
 import asyncio
 import os
-import re
-import subprocess
 import uuid
 from asyncio import Future
 from functools import wraps, partial
 from typing import Callable, Any, Union
 
+from bleak.log import get_logger
+from bleak.uuids import normalize_uuid_str
 from bleak.backends.service import BleakGATTServiceCollection
 from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.exc import BleakError
 from bleak.backends.client import BaseBleakClient
-from bleak.backends.bluezdbus import defs, signals, utils, get_reactor
-from bleak.backends.bluezdbus.discovery import discover
-from bleak.backends.bluezdbus.utils import get_device_object_path, get_managed_objects
+from bleak.backends.notification import NotificationBatcher
+from bleak.backends.metrics import instrumented, characteristic_target, handle_target
+from bleak.backends.device import BLEDevice
+from bleak.backends.bluezdbus import defs, utils, stream, gattcache
+from bleak.backends.bluezdbus.bus import (
+    call_remote,
+    get_shared_bus,
+    PROPERTIES_CHANGED,
+    INTERFACES_ADDED,
+    INTERFACES_REMOVED,
+)
+from bleak.backends.bluezdbus.utils import get_managed_objects
+from bleak.backends.bluezdbus.version import get_bluez_version
+from bleak.backends.bluezdbus.bound import BoundCharacteristicBlueZDBus
+from bleak.backends.bluezdbus.notify import AcquiredNotification
 from bleak.backends.bluezdbus.service import BleakGATTServiceBlueZDBus
 from bleak.backends.bluezdbus.characteristic import BleakGATTCharacteristicBlueZDBus
 from bleak.backends.bluezdbus.descriptor import BleakGATTDescriptorBlueZDBus
 
-from txdbus.client import connect as txdbus_connect
 from txdbus.error import RemoteError
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 class BleakClientBlueZDBus(BaseBleakClient):
@@ -36,7 +47,12 @@ class BleakClientBlueZDBus(BaseBleakClient):
         loop (asyncio.events.AbstractEventLoop): The event loop to use.
 
     Keyword Args:
-        timeout (float): Timeout for required ``discover`` call. Defaults to 2.0.
+        timeout (float): Timeout for the discovery scan run by ``connect`` if BlueZ
+            does not know the device yet. Defaults to 2.0.
+        services_resolved_timeout (float): Time to wait for BlueZ to resolve
+            the services of the device. Defaults to 5.0.
+        gatt_cache (GATTCache): A :py:class:`bleak.backends.bluezdbus.gattcache.GATTCache`
+            to take the services from on reconnection, instead of from BlueZ.
 
     """
 
@@ -47,21 +63,23 @@ class BleakClientBlueZDBus(BaseBleakClient):
 
         # Backend specific, TXDBus objects and data
         self._device_path = None
+        self._shared_bus = None
         self._bus = None
-        self._reactor = None
-        self._rules = {}
         self._subscriptions = list()
+        self._acquired_notifications = {}
+        self._notification_batchers = {}
 
         self._disconnected_callback = None
+        self._services_resolved_timeout = kwargs.get("services_resolved_timeout", 5.0)
 
         self._char_path_to_uuid = {}
+        self._gatt_cache = kwargs.get("gatt_cache")
+        self._service_changed_path = None
 
         # We need to know BlueZ version since battery level characteristic
         # are stored in a separate DBus interface in the BlueZ >= 5.48.
-        p = subprocess.Popen(["bluetoothctl", "--version"], stdout=subprocess.PIPE)
-        out, _ = p.communicate()
-        s = re.search(b"(\\d+).(\\d+)", out.strip(b"'"))
-        self._bluez_version = tuple(map(int, s.groups()))
+        # It is probed once per process when connecting, see `get_bluez_version`.
+        self._bluez_version = None
 
     # Connectivity methods
 
@@ -93,64 +111,52 @@ class BleakClientBlueZDBus(BaseBleakClient):
 
         self._disconnected_callback = callback
 
+    @instrumented("connect")
     async def connect(self, **kwargs) -> bool:
         """Connect to the specified GATT server.
 
+        The object path of the device is taken from ``ble_device`` or ``device_path``
+        if given. Otherwise BlueZ is asked if it already knows the device, and only if
+        it does not is a discovery scan run, until the device is found or ``timeout``
+        has passed.
+
         Keyword Args:
-            timeout (float): Timeout for required ``discover`` call. Defaults to 2.0.
+            timeout (float): Timeout for the discovery scan. Defaults to 2.0.
+            ble_device (BLEDevice): A device found by a BlueZ scanner or ``discover``.
+            device_path (str): The D-Bus object path of the device.
+            services_resolved_timeout (float): Time to wait for BlueZ to resolve
+                the services of the device. Defaults to 5.0.
 
         Returns:
             Boolean representing connection status.
 
         """
-        # A Discover must have been run before connecting to any devices. Do a quick one here
-        # to ensure that it has been done.
         timeout = kwargs.get("timeout", self._timeout)
-        discovered = await discover(timeout=timeout, device=self.device, loop=self.loop)
-
-        # Issue 150 hints at the device path not being possible to create as
-        # is done in the `get_device_object_path` method. Try to get it from
-        # BlueZ instead.
-        # Otherwise, use the old fallback and hope for the best.
-        bluez_devices = list(
-            filter(lambda d: d.address.lower() == self.address.lower(), discovered)
-        )
-        if bluez_devices:
-            self._device_path = bluez_devices[0].details["path"]
-        else:
-            # TODO: Better to always get path from BlueZ backend...
-            self._device_path = get_device_object_path(self.device, self.address)
-
-        self._reactor = get_reactor(self.loop)
-
-        # Create system bus
-        self._bus = await txdbus_connect(self._reactor, busAddress="system").asFuture(
-            self.loop
-        )
 
-        def _services_resolved_callback(message):
-            iface, changed, invalidated = message.body
-            is_resolved = defs.DEVICE_INTERFACE and changed.get(
-                "ServicesResolved", False
+        # Get the system bus shared with other clients and scanners on this loop.
+        self._shared_bus = await get_shared_bus(self.loop)
+        self._bus = self._shared_bus.connection
+        try:
+            self._bluez_version = await get_bluez_version(
+                self._bus, self.loop, "/org/bluez/{0}".format(self.device)
             )
-            if iface == is_resolved:
-                logger.info("Services resolved.")
-                self.services_resolved = True
-
-        rule_id = await signals.listen_properties_changed(
-            self._bus, self.loop, _services_resolved_callback
-        )
+            self._device_path = await self._get_device_path(
+                timeout, kwargs.get("ble_device"), kwargs.get("device_path")
+            )
+        except BleakError:
+            await self._cleanup_dbus_resources()
+            raise
 
-        logger.debug(
-            "Connecting to BLE device @ {0} with {1}".format(self.address, self.device)
-        )
+        logger.debug("Connecting to BLE device @ %s with %s", self.address, self.device)
         try:
-            await self._bus.callRemote(
+            await call_remote(
+                self._bus,
+                self.loop,
                 self._device_path,
                 "Connect",
                 interface="org.bluez.Device1",
                 destination="org.bluez",
-            ).asFuture(self.loop)
+            )
         except RemoteError as e:
             await self._cleanup_all()
             if 'Method "Connect" with signature "" on interface' in str(e):
@@ -172,59 +178,188 @@ class BleakClientBlueZDBus(BaseBleakClient):
             )
 
         # Get all services. This means making the actual connection.
-        await self.get_services()
+        if "services_resolved_timeout" in kwargs:
+            self._services_resolved_timeout = kwargs["services_resolved_timeout"]
+        try:
+            await self.get_services()
+        except BleakError:
+            await self._cleanup_all()
+            raise
         properties = await self._get_device_properties()
         if not properties.get("Connected"):
             await self._cleanup_all()
             raise BleakError("Connection failed!")
 
-        await self._bus.delMatch(rule_id).asFuture(self.loop)
-        self._rules["PropChanged"] = await signals.listen_properties_changed(
-            self._bus, self.loop, self._properties_changed_callback
+        self._shared_bus.add_signal_handler(
+            PROPERTIES_CHANGED, self._device_path, self._properties_changed_callback
         )
+        for member in (INTERFACES_ADDED, INTERFACES_REMOVED):
+            self._shared_bus.add_signal_handler(
+                member, self._device_path, self._gatt_objects_changed_callback
+            )
         return True
 
+    @instrumented("discovery")
+    async def _get_device_path(
+        self, timeout: float, ble_device: BLEDevice = None, device_path: str = None
+    ) -> str:
+        """Get the object path of the device, scanning for it only if needed.
+
+        A path given by ``device_path`` or ``ble_device`` is used if BlueZ has a
+        device with the address of this client there, and connected to on the
+        adapter it is on. Otherwise the device is looked up on ``self.device``.
+
+        Args:
+            timeout (float): Timeout for the discovery scan.
+            ble_device (BLEDevice): A device found by a BlueZ scanner or ``discover``.
+            device_path (str): The D-Bus object path of the device.
+
+        Returns:
+            The object path of the device.
+
+        """
+        if not device_path and ble_device is not None:
+            if isinstance(ble_device.details, dict):
+                device_path = ble_device.details.get("path")
+        if device_path:
+            adapter = await self._get_device_adapter(device_path)
+            if adapter is not None:
+                if adapter != self.device:
+                    logger.debug(
+                        "%s is on %s, connecting on it instead of on %s.",
+                        device_path,
+                        adapter,
+                        self.device,
+                    )
+                    self.device = adapter
+                return device_path
+            logger.debug(
+                "%s is no device %s of BlueZ, looking it up.", device_path, self.address
+            )
+
+        adapter_path = "/org/bluez/{0}".format(self.device)
+        address = self.address.upper()
+        found = self.loop.create_future()
+
+        def _interfaces_added_callback(message):
+            path, interfaces = message.body
+            props = interfaces.get(defs.DEVICE_INTERFACE)
+            if props and props.get("Address", "").upper() == address:
+                if not found.done():
+                    found.set_result(path)
+
+        # Listen before asking BlueZ, to not miss the device being added in between.
+        self._shared_bus.add_signal_handler(
+            INTERFACES_ADDED, adapter_path, _interfaces_added_callback
+        )
+        try:
+            # Issue 150 hints at the device path not being possible to create as
+            # is done in the `get_device_object_path` method. Get it from BlueZ instead.
+            objects = await get_managed_objects(
+                self._bus, self.loop, adapter_path + "/"
+            )
+            for path, interfaces in objects.items():
+                props = interfaces.get(defs.DEVICE_INTERFACE)
+                if props and props.get("Address", "").upper() == address:
+                    return path
+
+            # Unknown to BlueZ. Scan until it shows up.
+            logger.debug("Scanning for %s on %s...", self.address, adapter_path)
+            await self._shared_bus.start_discovery(adapter_path, {"Transport": "le"})
+            try:
+                return await asyncio.wait_for(found, timeout)
+            except asyncio.TimeoutError:
+                raise BleakError(
+                    "Device with address {0} could not be found. "
+                    "Try increasing `timeout` value or moving the device closer.".format(
+                        self.address
+                    )
+                )
+            finally:
+                await self._shared_bus.stop_discovery(adapter_path)
+        finally:
+            self._shared_bus.remove_signal_handler(
+                INTERFACES_ADDED, adapter_path, _interfaces_added_callback
+            )
+
+    async def _get_device_adapter(self, device_path: str) -> Union[str, None]:
+        """Get the adapter of the device at ``device_path``, e.g. ``hci0``.
+
+        Returns:
+            The name of the adapter, or ``None`` if there is no device with the
+            address of this client at ``device_path``.
+
+        """
+        parts = device_path.split("/")
+        if (
+            len(parts) != 5
+            or parts[:3] != ["", "org", "bluez"]
+            or not parts[4].startswith("dev_")
+        ):
+            return None
+        try:
+            address = await call_remote(
+                self._bus,
+                self.loop,
+                device_path,
+                "Get",
+                interface=defs.PROPERTIES_INTERFACE,
+                destination=defs.BLUEZ_SERVICE,
+                signature="ss",
+                body=[defs.DEVICE_INTERFACE, "Address"],
+                returnSignature="v",
+            )
+        except RemoteError:
+            return None
+        if address.upper() != self.address.upper():
+            return None
+        return parts[3]
+
     async def _cleanup_notifications(self) -> None:
         """
         Remove all pending notifications of the client. This method is used to
-        free the DBus matches that have been established.
+        free the signal handlers that have been registered on the shared bus.
         """
-        for rule_name, rule_id in self._rules.items():
-            logger.debug("Removing rule {0}, ID: {1}".format(rule_name, rule_id))
-            try:
-                await self._bus.delMatch(rule_id).asFuture(self.loop)
-            except Exception as e:
-                logger.error(
-                    "Could not remove rule {0} ({1}): {2}".format(rule_id, rule_name, e)
+        if self._shared_bus is not None:
+            self._shared_bus.remove_signal_handler(
+                PROPERTIES_CHANGED, self._device_path, self._properties_changed_callback
+            )
+            for member in (INTERFACES_ADDED, INTERFACES_REMOVED):
+                self._shared_bus.remove_signal_handler(
+                    member, self._device_path, self._gatt_objects_changed_callback
                 )
-        self._rules = {}
 
         for _uuid in list(self._subscriptions):
             try:
                 await self.stop_notify(_uuid)
             except Exception as e:
                 logger.error(
-                    "Could not remove notifications on characteristic {0}: {1}".format(
-                        _uuid, e
-                    )
+                    "Could not remove notifications on characteristic %s: %s", _uuid, e
                 )
         self._subscriptions = []
+        for acquired in self._acquired_notifications.values():
+            acquired.close()
+        self._acquired_notifications.clear()
+        for batcher in self._notification_batchers.values():
+            batcher.close()
+        self._notification_batchers.clear()
 
     async def _cleanup_dbus_resources(self) -> None:
         """
-        Free the resources allocated for both the DBus bus and the Twisted
-        reactor. Use this method upon final disconnection.
+        Release this client's reference to the shared system bus. The bus is
+        disconnected when no other client or scanner uses it. Use this method
+        upon final disconnection.
         """
-        # Try to disconnect the System Bus.
-        try:
-            self._bus.disconnect()
-        except Exception as e:
-            logger.error("Attempt to disconnect system bus failed: {0}".format(e))
-        else:
-            # Critical to remove the `self._bus` object here to since it was
-            # closed above. If not, calls made to it later could lead to
-            # a stuck client.
-            self._bus = None
+        # The services are resolved again on the next connection.
+        self._services_resolved = False
+        self._service_changed_path = None
+        if self._shared_bus is None:
+            return
+        # Critical to remove the `self._bus` object here since it may be
+        # closed below. If not, calls made to it later could lead to
+        # a stuck client.
+        shared_bus, self._shared_bus, self._bus = self._shared_bus, None, None
+        await shared_bus.release()
 
     async def _cleanup_all(self) -> None:
         """
@@ -234,6 +369,7 @@ class BleakClientBlueZDBus(BaseBleakClient):
         await self._cleanup_notifications()
         await self._cleanup_dbus_resources()
 
+    @instrumented("disconnect")
     async def disconnect(self) -> bool:
         """Disconnect from the specified GATT server.
 
@@ -253,14 +389,16 @@ class BleakClientBlueZDBus(BaseBleakClient):
 
         # Try to disconnect the actual device/peripheral
         try:
-            await self._bus.callRemote(
+            await call_remote(
+                self._bus,
+                self.loop,
                 self._device_path,
                 "Disconnect",
                 interface=defs.DEVICE_INTERFACE,
                 destination=defs.BLUEZ_SERVICE,
-            ).asFuture(self.loop)
+            )
         except Exception as e:
-            logger.error("Attempt to disconnect device failed: {0}".format(e))
+            logger.error("Attempt to disconnect device failed: %s", e)
 
         is_disconnected = not await self.is_connected()
 
@@ -279,7 +417,9 @@ class BleakClientBlueZDBus(BaseBleakClient):
 
         """
         # TODO: Listen to connected property changes.
-        return await self._bus.callRemote(
+        return await call_remote(
+            self._bus,
+            self.loop,
             self._device_path,
             "Get",
             interface=defs.PROPERTIES_INTERFACE,
@@ -287,7 +427,7 @@ class BleakClientBlueZDBus(BaseBleakClient):
             signature="ss",
             body=[defs.DEVICE_INTERFACE, "Connected"],
             returnSignature="v",
-        ).asFuture(self.loop)
+        )
 
     # GATT services methods
 
@@ -301,74 +441,186 @@ class BleakClientBlueZDBus(BaseBleakClient):
         if self._services_resolved:
             return self.services
 
-        sleep_loop_sec = 0.02
-        total_slept_sec = 0
-        services_resolved = False
+        with self._span("get_services"):
+            await self._wait_for_services_resolved(self._services_resolved_timeout)
 
-        while total_slept_sec < 5.0:
-            properties = await self._get_device_properties()
-            services_resolved = properties.get("ServicesResolved", False)
-            if services_resolved:
-                break
-            await asyncio.sleep(sleep_loop_sec, loop=self.loop)
-            total_slept_sec += sleep_loop_sec
+            objs = db_hash = None
+            if self._gatt_cache is not None:
+                objs, db_hash = await self._get_cached_gatt_objects()
+            if objs is None:
+                logger.debug("Get Services...")
+                objs = await get_managed_objects(
+                    self._bus, self.loop, self._device_path + "/service"
+                )
+                if self._gatt_cache is not None:
+                    await self._cache_gatt_objects(objs, db_hash)
 
-        if not services_resolved:
-            raise BleakError("Services discovery error")
+            self.services = BleakGATTServiceCollection()
+            self._char_path_to_uuid = {}
+            self._add_gatt_objects(objs)
+        self._services_resolved = True
+        return self.services
+
+    async def _get_cached_gatt_objects(self):
+        """Get the GATT objects of the device from the GATT cache, if they are up to date.
 
-        logger.debug("Get Services...")
-        objs = await get_managed_objects(
-            self._bus, self.loop, self._device_path + "/service"
+        The ``Database Hash`` is only read over the air when there is an entry
+        to validate. An entry stored without it, on the first connection, is
+        not used but replaced by one with the hash.
+
+        Returns:
+            Tuple of the managed objects of the device's GATT database, or
+            ``None``, and the ``Database Hash`` as a hex string if it was read.
+
+        """
+        entry = self._gatt_cache.get(self.address)
+        if entry is None:
+            return None, None
+        objs = gattcache.add_device_path(entry["objects"], self._device_path)
+        hash_path = gattcache.find_characteristic(objs, gattcache.DATABASE_HASH_UUID)
+        db_hash = None
+        if hash_path is not None:
+            db_hash = await self._read_database_hash(hash_path)
+            if entry.get("hash") is None:
+                return None, db_hash
+            valid = db_hash == entry["hash"]
+        else:
+            # No hash to go by, compare the UUIDs BlueZ lists for the device. They
+            # include advertised UUIDs and services BlueZ does not export, so
+            # compare with the ones listed when the entry was stored if known.
+            properties = await self._get_device_properties()
+            uuids = set(properties.get("UUIDs", []))
+            if entry.get("uuids") is not None:
+                valid = sorted(uuids) == entry["uuids"]
+            else:
+                valid = uuids.issuperset(gattcache.service_uuids(objs))
+        if not valid:
+            logger.debug("GATT cache entry of %s is stale.", self.address)
+            self._gatt_cache.invalidate(self.address)
+            return None, db_hash
+        logger.debug("Services of %s taken from the GATT cache.", self.address)
+        return objs, db_hash
+
+    async def _cache_gatt_objects(self, objs: dict, db_hash: str = None) -> None:
+        uuids = None
+        if gattcache.find_characteristic(objs, gattcache.DATABASE_HASH_UUID) is None:
+            properties = await self._get_device_properties()
+            uuids = properties.get("UUIDs", [])
+        self._gatt_cache.put(
+            self.address,
+            gattcache.strip_device_path(objs, self._device_path),
+            db_hash,
+            uuids,
         )
 
-        # There is no guarantee that services are listed before characteristics
-        # Managed Objects dict.
-        # Need multiple iterations to construct the Service Collection
+    async def _read_database_hash(self, path: str):
+        """The value of the ``Database Hash`` characteristic at ``path`` as a hex
+        string, or ``None`` if it cannot be read."""
+        try:
+            value = await call_remote(
+                self._bus,
+                self.loop,
+                path,
+                "ReadValue",
+                interface=defs.GATT_CHARACTERISTIC_INTERFACE,
+                destination=defs.BLUEZ_SERVICE,
+                signature="a{sv}",
+                body=[{}],
+                returnSignature="ay",
+            )
+        except RemoteError as e:
+            logger.debug("Could not read the Database Hash: %s", e)
+            return None
+        return bytes(value).hex()
 
-        _chars, _descs = [], []
+    def _add_gatt_objects(self, objs: dict) -> None:
+        """Add the GATT services, characteristics and descriptors to ``self.services``.
+
+        Args:
+            objs (dict): The managed objects of the device's GATT database.
+
+        """
+        # There is no guarantee that services are listed before characteristics
+        # in the Managed Objects dict. Sort them out in one pass and then add them,
+        # looking up the parent of each by object path.
+        _services, _chars, _descs = [], [], []
+        log_objects = logger.isEnabledFor(logging.DEBUG)
 
         for object_path, interfaces in objs.items():
-            logger.debug(utils.format_GATT_object(object_path, interfaces))
+            if log_objects:
+                logger.debug(utils.format_GATT_object(object_path, interfaces))
             if defs.GATT_SERVICE_INTERFACE in interfaces:
-                service = interfaces.get(defs.GATT_SERVICE_INTERFACE)
-                self.services.add_service(
-                    BleakGATTServiceBlueZDBus(service, object_path)
-                )
+                _services.append((interfaces[defs.GATT_SERVICE_INTERFACE], object_path))
             elif defs.GATT_CHARACTERISTIC_INTERFACE in interfaces:
-                char = interfaces.get(defs.GATT_CHARACTERISTIC_INTERFACE)
-                _chars.append([char, object_path])
+                _chars.append(
+                    (interfaces[defs.GATT_CHARACTERISTIC_INTERFACE], object_path)
+                )
             elif defs.GATT_DESCRIPTOR_INTERFACE in interfaces:
-                desc = interfaces.get(defs.GATT_DESCRIPTOR_INTERFACE)
-                _descs.append([desc, object_path])
+                _descs.append((interfaces[defs.GATT_DESCRIPTOR_INTERFACE], object_path))
+
+        for service, object_path in _services:
+            self.services.add_service(BleakGATTServiceBlueZDBus(service, object_path))
 
         for char, object_path in _chars:
-            _service = list(filter(lambda x: x.path == char["Service"], self.services))
+            _service = self.services.get_service_by_path(char["Service"])
             self.services.add_characteristic(
-                BleakGATTCharacteristicBlueZDBus(char, object_path, _service[0].uuid)
+                BleakGATTCharacteristicBlueZDBus(char, object_path, _service.uuid)
             )
             self._char_path_to_uuid[object_path] = char.get("UUID")
+            if char.get("UUID") == gattcache.SERVICE_CHANGED_UUID:
+                self._service_changed_path = object_path
 
         for desc, object_path in _descs:
-            _characteristic = list(
-                filter(
-                    lambda x: x.path == desc["Characteristic"],
-                    self.services.characteristics.values(),
-                )
+            _characteristic = self.services.get_characteristic_by_path(
+                desc["Characteristic"]
             )
             self.services.add_descriptor(
                 BleakGATTDescriptorBlueZDBus(
                     desc,
                     object_path,
-                    _characteristic[0].uuid,
-                    int(_characteristic[0].handle),
+                    _characteristic.uuid,
+                    int(_characteristic.handle),
                 )
             )
 
-        self._services_resolved = True
-        return self.services
+    async def _wait_for_services_resolved(self, timeout: float) -> None:
+        """Wait for the ``ServicesResolved`` property of the device to become true.
+
+        Args:
+            timeout (float): Time to wait, in seconds.
+
+        """
+        resolved = self.loop.create_future()
+
+        def _services_resolved_callback(message):
+            iface, changed, invalidated = message.body
+            if (
+                iface == defs.DEVICE_INTERFACE
+                and message.path == self._device_path
+                and changed.get("ServicesResolved")
+                and not resolved.done()
+            ):
+                logger.info("Services resolved.")
+                resolved.set_result(True)
+
+        # Listen before asking, to not miss the property change in between.
+        self._shared_bus.add_signal_handler(
+            PROPERTIES_CHANGED, self._device_path, _services_resolved_callback
+        )
+        try:
+            properties = await self._get_device_properties()
+            if not properties.get("ServicesResolved", False):
+                await asyncio.wait_for(resolved, timeout)
+        except asyncio.TimeoutError:
+            raise BleakError("Services discovery error")
+        finally:
+            self._shared_bus.remove_signal_handler(
+                PROPERTIES_CHANGED, self._device_path, _services_resolved_callback
+            )
 
     # IO methods
 
+    @instrumented("read_gatt_char", characteristic_target)
     async def read_gatt_char(
         self,
         char_specifier: Union[BleakGATTCharacteristic, int, str, uuid.UUID],
@@ -391,9 +643,10 @@ class BleakClientBlueZDBus(BaseBleakClient):
             characteristic = char_specifier
 
         if not characteristic:
+            char_uuid = _specifier_uuid(char_specifier)
             # Special handling for BlueZ >= 5.48, where Battery Service (0000180f-0000-1000-8000-00805f9b34fb:)
             # has been moved to interface org.bluez.Battery1 instead of as a regular service.
-            if str(char_specifier) == "00002a19-0000-1000-8000-00805f9b34fb" and (
+            if char_uuid == "00002a19-0000-1000-8000-00805f9b34fb" and (
                 self._bluez_version[0] == 5 and self._bluez_version[1] >= 48
             ):
                 props = await self._get_device_properties(
@@ -402,12 +655,13 @@ class BleakClientBlueZDBus(BaseBleakClient):
                 # Simulate regular characteristics read to be consistent over all platforms.
                 value = bytearray([props.get("Percentage", "")])
                 logger.debug(
-                    "Read Battery Level {0} | {1}: {2}".format(
-                        char_specifier, self._device_path, value
-                    )
+                    "Read Battery Level %s | %s: %s",
+                    char_specifier,
+                    self._device_path,
+                    value,
                 )
                 return value
-            if str(char_specifier) == "00002a00-0000-1000-8000-00805f9b34fb" and (
+            if char_uuid == "00002a00-0000-1000-8000-00805f9b34fb" and (
                 self._bluez_version[0] == 5 and self._bluez_version[1] >= 48
             ):
                 props = await self._get_device_properties(
@@ -416,9 +670,10 @@ class BleakClientBlueZDBus(BaseBleakClient):
                 # Simulate regular characteristics read to be consistent over all platforms.
                 value = bytearray(props.get("Name", "").encode("ascii"))
                 logger.debug(
-                    "Read Device Name {0} | {1}: {2}".format(
-                        char_specifier, self._device_path, value
-                    )
+                    "Read Device Name %s | %s: %s",
+                    char_specifier,
+                    self._device_path,
+                    value,
                 )
                 return value
 
@@ -429,7 +684,9 @@ class BleakClientBlueZDBus(BaseBleakClient):
             )
 
         value = bytearray(
-            await self._bus.callRemote(
+            await call_remote(
+                self._bus,
+                self.loop,
                 characteristic.path,
                 "ReadValue",
                 interface=defs.GATT_CHARACTERISTIC_INTERFACE,
@@ -437,16 +694,18 @@ class BleakClientBlueZDBus(BaseBleakClient):
                 signature="a{sv}",
                 body=[{}],
                 returnSignature="ay",
-            ).asFuture(self.loop)
+            )
         )
 
         logger.debug(
-            "Read Characteristic {0} | {1}: {2}".format(
-                characteristic.uuid, characteristic.path, value
-            )
+            "Read Characteristic %s | %s: %s",
+            characteristic.uuid,
+            characteristic.path,
+            value,
         )
         return value
 
+    @instrumented("read_gatt_descriptor", handle_target)
     async def read_gatt_descriptor(self, handle: int, **kwargs) -> bytearray:
         """Perform read operation on the specified GATT descriptor.
 
@@ -462,7 +721,9 @@ class BleakClientBlueZDBus(BaseBleakClient):
             raise BleakError("Descriptor with handle {0} was not found!".format(handle))
 
         value = bytearray(
-            await self._bus.callRemote(
+            await call_remote(
+                self._bus,
+                self.loop,
                 descriptor.path,
                 "ReadValue",
                 interface=defs.GATT_DESCRIPTOR_INTERFACE,
@@ -470,14 +731,13 @@ class BleakClientBlueZDBus(BaseBleakClient):
                 signature="a{sv}",
                 body=[{}],
                 returnSignature="ay",
-            ).asFuture(self.loop)
+            )
         )
 
-        logger.debug(
-            "Read Descriptor {0} | {1}: {2}".format(handle, descriptor.path, value)
-        )
+        logger.debug("Read Descriptor %s | %s: %s", handle, descriptor.path, value)
         return value
 
+    @instrumented("write_gatt_char", characteristic_target)
     async def write_gatt_char(
         self,
         char_specifier: Union[BleakGATTCharacteristic, int, str, uuid.UUID],
@@ -510,34 +770,14 @@ class BleakClientBlueZDBus(BaseBleakClient):
 
         if not characteristic:
             raise BleakError("Characteristic {0} was not found!".format(char_specifier))
-        if (
-            "write" not in characteristic.properties
-            and "write-without-response" not in characteristic.properties
-        ):
-            raise BleakError(
-                "Characteristic %s does not support write operations!"
-                % str(characteristic.uuid)
-            )
-        if not response and "write-without-response" not in characteristic.properties:
-            response = True
-            # Force response here, since the device only supports that.
-        if (
-            response
-            and "write" not in characteristic.properties
-            and "write-without-response" in characteristic.properties
-        ):
-            response = False
-            logger.warning(
-                "Characteristic %s does not support Write with response. Trying without..."
-                % str(characteristic.uuid)
-            )
+        response = self._get_write_response(characteristic, response)
 
         # See docstring for details about this handling.
-        if not response and self._bluez_version[0] == 5 and self._bluez_version[1] < 46:
-            raise BleakError("Write without response requires at least BlueZ 5.46")
-        if response or (self._bluez_version[0] == 5 and self._bluez_version[1] > 50):
+        if response or self._has_write_type_option():
             # TODO: Add OnValueUpdated handler for response=True?
-            await self._bus.callRemote(
+            await call_remote(
+                self._bus,
+                self.loop,
                 characteristic.path,
                 "WriteValue",
                 interface=defs.GATT_CHARACTERISTIC_INTERFACE,
@@ -545,12 +785,14 @@ class BleakClientBlueZDBus(BaseBleakClient):
                 signature="aya{sv}",
                 body=[data, {"type": "request" if response else "command"}],
                 returnSignature="",
-            ).asFuture(self.loop)
+            )
         else:
             # Older versions of BlueZ don't have the "type" option, so we have
             # to write the hard way. This isn't the most efficient way of doing
             # things, but it works.
-            fd, _ = await self._bus.callRemote(
+            fd, _ = await call_remote(
+                self._bus,
+                self.loop,
                 characteristic.path,
                 "AcquireWrite",
                 interface=defs.GATT_CHARACTERISTIC_INTERFACE,
@@ -558,16 +800,135 @@ class BleakClientBlueZDBus(BaseBleakClient):
                 signature="a{sv}",
                 body=[{}],
                 returnSignature="hq",
-            ).asFuture(self.loop)
+            )
             os.write(fd, data)
             os.close(fd)
 
         logger.debug(
-            "Write Characteristic {0} | {1}: {2}".format(
-                characteristic.uuid, characteristic.path, data
+            "Write Characteristic %s | %s: %s",
+            characteristic.uuid,
+            characteristic.path,
+            data,
+        )
+
+    @instrumented("write_stream", characteristic_target)
+    async def write_stream(
+        self,
+        char_specifier: Union[BleakGATTCharacteristic, int, str, uuid.UUID],
+        data,
+        response: bool = False,
+        window: int = 8,
+        chunk_size: int = None,
+        acquire: bool = True,
+    ) -> dict:
+        """Write a stream of data to a characteristic, split into MTU sized writes.
+
+        Writes without response are done on a file descriptor from
+        "Characteristic.AcquireWrite", held open for the whole transfer. If that
+        is not possible, or for writes with response, up to ``window``
+        "Characteristic.WriteValue" calls are kept in flight instead of awaiting
+        each one before sending the next.
+
+        Args:
+            char_specifier (BleakGATTCharacteristic, int, str or UUID): The characteristic to write
+                to, specified by either integer handle, UUID or directly by the
+                BleakGATTCharacteristic object representing it.
+            data: Bytes, or an iterable or async iterable of bytes objects. The
+                data is concatenated and split into writes of at most ``chunk_size`` bytes.
+            response (bool): If write-with-response operations should be done. Defaults to `False`.
+            window (int): The maximum number of ``WriteValue`` calls in flight. Defaults to 8.
+            chunk_size (int): The size of each write. Defaults to the ATT MTU minus 3.
+            acquire (bool): If ``AcquireWrite`` is to be tried for writes without response.
+                Defaults to `True`.
+
+        Returns:
+            Dict with the number of ``bytes`` and ``writes``, the ``seconds`` taken
+            and the throughput in ``bytes_per_second``.
+
+        """
+        if self._bus is None:
+            raise BleakError("Not connected")
+        if not isinstance(char_specifier, BleakGATTCharacteristic):
+            characteristic = self.services.get_characteristic(char_specifier)
+        else:
+            characteristic = char_specifier
+        if not characteristic:
+            raise BleakError("Characteristic {0} was not found!".format(char_specifier))
+        response = self._get_write_response(characteristic, response)
+
+        writer = None
+        if not response and (acquire or not self._has_write_type_option()):
+            try:
+                fd, mtu = await call_remote(
+                    self._bus,
+                    self.loop,
+                    characteristic.path,
+                    "AcquireWrite",
+                    interface=defs.GATT_CHARACTERISTIC_INTERFACE,
+                    destination=defs.BLUEZ_SERVICE,
+                    signature="a{sv}",
+                    body=[{}],
+                    returnSignature="hq",
+                )
+            except RemoteError as e:
+                if not self._has_write_type_option():
+                    raise BleakError(
+                        "AcquireWrite on {0} failed: {1}".format(characteristic.path, e)
+                    )
+                logger.debug(
+                    "AcquireWrite on %s failed, using WriteValue: %s",
+                    characteristic.path,
+                    e,
+                )
+            else:
+                writer = stream.FdWriter(self.loop, fd)
+                chunk_size = min(chunk_size or mtu - 3, mtu - 3)
+        if writer is None:
+            writer = stream.WriteValueWriter(
+                self._bus, self.loop, characteristic.path, response, window
             )
+            if chunk_size is None:
+                chunk_size = await self._get_characteristic_mtu(characteristic) - 3
+
+        n_bytes = n_writes = 0
+        buffer = bytearray()
+        t = self.loop.time()
+        try:
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                data = (data,)
+            if hasattr(data, "__aiter__"):
+                async for item in data:
+                    for chunk in stream.split(buffer, item, chunk_size):
+                        await writer.write(chunk)
+                        n_bytes += chunk_size
+                        n_writes += 1
+            else:
+                for item in data:
+                    for chunk in stream.split(buffer, item, chunk_size):
+                        await writer.write(chunk)
+                        n_bytes += chunk_size
+                        n_writes += 1
+            if buffer:
+                await writer.write(bytes(buffer))
+                n_bytes += len(buffer)
+                n_writes += 1
+            await writer.flush()
+        finally:
+            writer.close()
+        seconds = self.loop.time() - t
+
+        stats = {
+            "bytes": n_bytes,
+            "writes": n_writes,
+            "seconds": seconds,
+            "bytes_per_second": n_bytes / seconds if seconds else float("inf"),
+        }
+        logger.debug(
+            "Write Stream %s | %s: %s", characteristic.uuid, characteristic.path, stats
         )
+        return stats
 
+    @instrumented("write_gatt_descriptor", handle_target)
     async def write_gatt_descriptor(self, handle: int, data: bytearray) -> None:
         """Perform a write operation on the specified GATT descriptor.
 
@@ -579,7 +940,9 @@ class BleakClientBlueZDBus(BaseBleakClient):
         descriptor = self.services.get_descriptor(handle)
         if not descriptor:
             raise BleakError("Descriptor with handle {0} was not found!".format(handle))
-        await self._bus.callRemote(
+        await call_remote(
+            self._bus,
+            self.loop,
             descriptor.path,
             "WriteValue",
             interface=defs.GATT_DESCRIPTOR_INTERFACE,
@@ -587,12 +950,11 @@ class BleakClientBlueZDBus(BaseBleakClient):
             signature="aya{sv}",
             body=[data, {"type": "command"}],
             returnSignature="",
-        ).asFuture(self.loop)
-
-        logger.debug(
-            "Write Descriptor {0} | {1}: {2}".format(handle, descriptor.path, data)
         )
 
+        logger.debug("Write Descriptor %s | %s: %s", handle, descriptor.path, data)
+
+    @instrumented("start_notify", characteristic_target)
     async def start_notify(
         self,
         char_specifier: Union[BleakGATTCharacteristic, int, str, uuid.UUID],
@@ -619,21 +981,38 @@ class BleakClientBlueZDBus(BaseBleakClient):
         Keyword Args:
             notification_wrapper (bool): Set to `False` to avoid parsing of
                 notification to bytearray.
+            acquire (bool): Set to `True` to receive notifications on the file
+                descriptor from "Characteristic.AcquireNotify" instead of as
+                ``PropertiesChanged`` signals. The callback then gets a
+                ``memoryview`` that is only valid until it returns. Falls back
+                to signals if BlueZ does not allow it, e.g. for indications.
+            batch (int): Deliver notifications in batches of up to this many
+                ``(timestamp, payload)`` records instead of one by one, see
+                :py:class:`bleak.backends.notification.NotificationBatcher`. The
+                callback then gets a list of records as its second argument,
+                and may be a coroutine function.
+            batch_interval (float): The longest time in seconds a notification
+                waits for its batch to fill up. Defaults to 0.1.
+            batch_capacity (int): The number of records kept while the callback
+                is busy before the oldest are dropped. Defaults to ``4 * batch``.
 
         """
         _wrap = kwargs.get("notification_wrapper", True)
+        _acquire = kwargs.get("acquire", False)
+        _batch = kwargs.get("batch")
         if not isinstance(char_specifier, BleakGATTCharacteristic):
             characteristic = self.services.get_characteristic(char_specifier)
         else:
             characteristic = char_specifier
 
         if not characteristic:
+            char_uuid = _specifier_uuid(char_specifier)
             # Special handling for BlueZ >= 5.48, where Battery Service (0000180f-0000-1000-8000-00805f9b34fb:)
             # has been moved to interface org.bluez.Battery1 instead of as a regular service.
             # The org.bluez.Battery1 on the other hand does not provide a notification method, so here we cannot
             # provide this functionality...
             # See https://kernel.googlesource.com/pub/scm/bluetooth/bluez/+/refs/tags/5.48/doc/battery-api.txt
-            if str(char_specifier) == "00002a19-0000-1000-8000-00805f9b34fb" and (
+            if char_uuid == "00002a19-0000-1000-8000-00805f9b34fb" and (
                 self._bluez_version[0] == 5 and self._bluez_version[1] >= 48
             ):
                 raise BleakError(
@@ -647,7 +1026,61 @@ class BleakClientBlueZDBus(BaseBleakClient):
                     char_specifier
                 )
             )
-        await self._bus.callRemote(
+
+        if self._metrics is not None:
+            callback = _metrics_notification_wrapper(
+                callback, self._metrics, characteristic.uuid
+            )
+
+        batcher = None
+        if _batch:
+            batcher = NotificationBatcher(
+                self.loop,
+                characteristic.uuid,
+                callback,
+                _batch,
+                kwargs.get("batch_interval", 0.1),
+                kwargs.get("batch_capacity"),
+            )
+            callback = _batch_notification_wrapper(batcher)
+
+        if _acquire and "notify" in characteristic.properties:
+            try:
+                fd, mtu = await call_remote(
+                    self._bus,
+                    self.loop,
+                    characteristic.path,
+                    "AcquireNotify",
+                    interface=defs.GATT_CHARACTERISTIC_INTERFACE,
+                    destination=defs.BLUEZ_SERVICE,
+                    signature="a{sv}",
+                    body=[{}],
+                    returnSignature="hq",
+                )
+            except RemoteError as e:
+                logger.debug(
+                    "AcquireNotify on %s failed, using StartNotify: %s",
+                    characteristic.path,
+                    e,
+                )
+            else:
+                acquired = AcquiredNotification(
+                    self.loop,
+                    fd,
+                    mtu,
+                    characteristic.uuid,
+                    callback,
+                    partial(self._on_acquired_notification_closed, characteristic),
+                )
+                self._acquired_notifications[characteristic.path] = acquired
+                if batcher is not None:
+                    self._notification_batchers[characteristic.path] = batcher
+                self._subscriptions.append(characteristic.handle)
+                return
+
+        await call_remote(
+            self._bus,
+            self.loop,
             characteristic.path,
             "StartNotify",
             interface=defs.GATT_CHARACTERISTIC_INTERFACE,
@@ -655,7 +1088,7 @@ class BleakClientBlueZDBus(BaseBleakClient):
             signature="",
             body=[],
             returnSignature="",
-        ).asFuture(self.loop)
+        )
 
         if _wrap:
             self._notification_callbacks[
@@ -669,9 +1102,12 @@ class BleakClientBlueZDBus(BaseBleakClient):
             ] = _regular_notification_wrapper(
                 callback, self._char_path_to_uuid
             )  # noqa | E123 error in flake8...
+        if batcher is not None:
+            self._notification_batchers[characteristic.path] = batcher
 
         self._subscriptions.append(characteristic.handle)
 
+    @instrumented("stop_notify", characteristic_target)
     async def stop_notify(
         self, char_specifier: Union[BleakGATTCharacteristic, int, str, uuid.UUID]
     ) -> None:
@@ -690,7 +1126,20 @@ class BleakClientBlueZDBus(BaseBleakClient):
         if not characteristic:
             raise BleakError("Characteristic {} not found!".format(char_specifier))
 
-        await self._bus.callRemote(
+        batcher = self._notification_batchers.pop(characteristic.path, None)
+        if batcher is not None:
+            batcher.close()
+
+        acquired = self._acquired_notifications.pop(characteristic.path, None)
+        if acquired is not None:
+            # Closing the file descriptor is what stops acquired notifications.
+            acquired.close()
+            self._subscriptions.remove(characteristic.handle)
+            return
+
+        await call_remote(
+            self._bus,
+            self.loop,
             characteristic.path,
             "StopNotify",
             interface=defs.GATT_CHARACTERISTIC_INTERFACE,
@@ -698,11 +1147,40 @@ class BleakClientBlueZDBus(BaseBleakClient):
             signature="",
             body=[],
             returnSignature="",
-        ).asFuture(self.loop)
+        )
         self._notification_callbacks.pop(characteristic.path, None)
 
         self._subscriptions.remove(characteristic.handle)
 
+    def get_notification_stats(
+        self, char_specifier: Union[BleakGATTCharacteristic, int, str, uuid.UUID]
+    ) -> dict:
+        """Get the counters of batched notifications on a characteristic.
+
+        Args:
+            char_specifier (BleakGATTCharacteristic, int, str or UUID): The characteristic
+                notifications were started on with the ``batch`` keyword argument.
+
+        Returns:
+            Dict of counters, see :py:meth:`bleak.backends.notification.NotificationBatcher.stats`.
+
+        """
+        if not isinstance(char_specifier, BleakGATTCharacteristic):
+            characteristic = self.services.get_characteristic(char_specifier)
+        else:
+            characteristic = char_specifier
+        if not characteristic:
+            raise BleakError("Characteristic {} not found!".format(char_specifier))
+
+        batcher = self._notification_batchers.get(characteristic.path)
+        if batcher is None:
+            raise BleakError(
+                "No batched notifications on characteristic {0}!".format(
+                    characteristic.uuid
+                )
+            )
+        return batcher.stats()
+
     # DBUS introspection method for characteristics.
 
     async def get_all_for_characteristic(
@@ -728,7 +1206,9 @@ class BleakClientBlueZDBus(BaseBleakClient):
         if not characteristic:
             raise BleakError("Characteristic {} not found!".format(char_specifier))
 
-        out = await self._bus.callRemote(
+        out = await call_remote(
+            self._bus,
+            self.loop,
             characteristic.path,
             "GetAll",
             interface=defs.PROPERTIES_INTERFACE,
@@ -736,9 +1216,52 @@ class BleakClientBlueZDBus(BaseBleakClient):
             signature="s",
             body=[defs.GATT_CHARACTERISTIC_INTERFACE],
             returnSignature="a{sv}",
-        ).asFuture(self.loop)
+        )
         return out
 
+    def bind(
+        self,
+        char_specifier: Union[BleakGATTCharacteristic, int, str, uuid.UUID],
+        response: bool = False,
+    ) -> "BoundCharacteristicBlueZDBus":
+        """Get a handle for repeated reads and writes of a characteristic.
+
+        The characteristic is looked up, and the write type decided, once. The
+        returned handle's :py:meth:`~BoundCharacteristicBlueZDBus.read` and
+        :py:meth:`~BoundCharacteristicBlueZDBus.write` then go straight to D-Bus.
+        The time they take is dominated by the D-Bus round trip all the same.
+
+        Args:
+            char_specifier (BleakGATTCharacteristic, int, str or UUID): The characteristic to bind,
+                specified by either integer handle, UUID or directly by the
+                BleakGATTCharacteristic object representing it.
+            response (bool): If writes through the handle should be write-with-response.
+                Defaults to `False`.
+
+        Returns:
+            A :py:class:`BoundCharacteristicBlueZDBus` object.
+
+        """
+        if self._bus is None:
+            raise BleakError("Not connected")
+
+        if not isinstance(char_specifier, BleakGATTCharacteristic):
+            characteristic = self.services.get_characteristic(char_specifier)
+        else:
+            characteristic = char_specifier
+        if not characteristic:
+            raise BleakError("Characteristic {0} was not found!".format(char_specifier))
+
+        if (
+            "write" in characteristic.properties
+            or "write-without-response" in characteristic.properties
+        ):
+            response = self._get_write_response(characteristic, response)
+        else:
+            response = None
+
+        return BoundCharacteristicBlueZDBus(self, characteristic, response)
+
     async def _get_device_properties(self, interface=defs.DEVICE_INTERFACE) -> dict:
         """Get properties of the connected device.
 
@@ -749,7 +1272,9 @@ class BleakClientBlueZDBus(BaseBleakClient):
             (dict) The properties.
 
         """
-        return await self._bus.callRemote(
+        return await call_remote(
+            self._bus,
+            self.loop,
             self._device_path,
             "GetAll",
             interface=defs.PROPERTIES_INTERFACE,
@@ -757,10 +1282,84 @@ class BleakClientBlueZDBus(BaseBleakClient):
             signature="s",
             body=[interface],
             returnSignature="a{sv}",
-        ).asFuture(self.loop)
+        )
+
+    def _get_write_response(
+        self, characteristic: BleakGATTCharacteristic, response: bool
+    ) -> bool:
+        """Decide if a write to ``characteristic`` is done with or without response.
+
+        Returns:
+            ``response``, or the other write type if the characteristic only supports that.
+
+        """
+        if (
+            "write" not in characteristic.properties
+            and "write-without-response" not in characteristic.properties
+        ):
+            raise BleakError(
+                "Characteristic %s does not support write operations!"
+                % str(characteristic.uuid)
+            )
+        if not response and "write-without-response" not in characteristic.properties:
+            response = True
+            # Force response here, since the device only supports that.
+        if (
+            response
+            and "write" not in characteristic.properties
+            and "write-without-response" in characteristic.properties
+        ):
+            response = False
+            logger.warning(
+                "Characteristic %s does not support Write with response. Trying without...",
+                characteristic.uuid,
+            )
+
+        # See docstring of write_gatt_char for details about this handling.
+        if not response and self._bluez_version[0] == 5 and self._bluez_version[1] < 46:
+            raise BleakError("Write without response requires at least BlueZ 5.46")
+        return response
+
+    async def _get_characteristic_mtu(
+        self, characteristic: BleakGATTCharacteristic
+    ) -> int:
+        """Get the ATT MTU of the connection, as seen by ``characteristic``.
+
+        The "MTU" property of "org.bluez.GattCharacteristic1" is only there in
+        recent versions of BlueZ. Without it, the minimum ATT MTU of 23 is assumed.
+
+        """
+        try:
+            return await call_remote(
+                self._bus,
+                self.loop,
+                characteristic.path,
+                "Get",
+                interface=defs.PROPERTIES_INTERFACE,
+                destination=defs.BLUEZ_SERVICE,
+                signature="ss",
+                body=[defs.GATT_CHARACTERISTIC_INTERFACE, "MTU"],
+                returnSignature="v",
+            )
+        except RemoteError:
+            return 23
+
+    def _has_write_type_option(self) -> bool:
+        """If ``WriteValue`` takes the "type" option, i.e. BlueZ > 5.50."""
+        return self._bluez_version[0] == 5 and self._bluez_version[1] > 50
 
     # Internal Callbacks
 
+    def _on_acquired_notification_closed(self, characteristic):
+        """BlueZ closed the socket of acquired notifications on ``characteristic``."""
+        if self._acquired_notifications.pop(characteristic.path, None) is not None:
+            logger.debug("Notifications on %s were released.", characteristic.path)
+            if characteristic.handle in self._subscriptions:
+                self._subscriptions.remove(characteristic.handle)
+            batcher = self._notification_batchers.pop(characteristic.path, None)
+            if batcher is not None:
+                batcher.close()
+
     def _properties_changed_callback(self, message):
         """Notification handler.
 
@@ -775,33 +1374,38 @@ class BleakClientBlueZDBus(BaseBleakClient):
         """
 
         logger.debug(
-            "DBUS: path: {}, domain: {}, body: {}".format(
-                message.path, message.body[0], message.body[1]
-            )
+            "DBUS: path: %s, domain: %s, body: %s",
+            message.path,
+            message.body[0],
+            message.body[1],
         )
 
         if message.body[0] == defs.GATT_CHARACTERISTIC_INTERFACE:
+            if (
+                message.path == self._service_changed_path
+                and "Value" in message.body[1]
+            ):
+                self._on_gatt_database_changed()
             if message.path in self._notification_callbacks:
-                logger.info(
-                    "GATT Char Properties Changed: {0} | {1}".format(
-                        message.path, message.body[1:]
-                    )
+                logger.debug(
+                    "GATT Char Properties Changed: %s | %s", message.path, message.body
                 )
                 self._notification_callbacks[message.path](
                     message.path, message.body[1]
                 )
         elif message.body[0] == defs.DEVICE_INTERFACE:
-            device_path = "/org/bluez/%s/dev_%s" % (
-                self.device,
-                self.address.replace(":", "_"),
-            )
-            if message.path.lower() == device_path.lower():
+            # The path connected to, which may be on another adapter than
+            # `self.device` if it was given to `connect`.
+            if message.path == self._device_path:
                 message_body_map = message.body[1]
                 if (
                     "Connected" in message_body_map
                     and not message_body_map["Connected"]
                 ):
-                    logger.debug("Device {} disconnected.".format(self.address))
+                    logger.debug("Device %s disconnected.", self.address)
+                    # BlueZ removes the GATT objects next. That is no change of
+                    # the database, so don't let it invalidate the GATT cache.
+                    self._services_resolved = False
 
                     task = self.loop.create_task(self._cleanup_all())
                     if self._disconnected_callback is not None:
@@ -809,6 +1413,29 @@ class BleakClientBlueZDBus(BaseBleakClient):
                             partial(self._disconnected_callback, self)
                         )
 
+    def _gatt_objects_changed_callback(self, message):
+        """Handler of BlueZ adding or removing GATT objects of the connected
+        device, as it does when it rediscovers the services after a ``Service
+        Changed`` indication."""
+        interfaces = message.body[1]
+        if any(interface.startswith("org.bluez.Gatt") for interface in interfaces):
+            self._on_gatt_database_changed()
+
+    def _on_gatt_database_changed(self):
+        if not self._services_resolved:
+            return
+        logger.info("GATT database of %s changed.", self.address)
+        self._services_resolved = False
+        if self._gatt_cache is not None:
+            self._gatt_cache.invalidate(self.address)
+
+
+def _specifier_uuid(char_specifier):
+    """The normalized UUID of a characteristic specifier, or ``None`` for a handle."""
+    if isinstance(char_specifier, int):
+        return None
+    return normalize_uuid_str(char_specifier)
+
 
 def _data_notification_wrapper(func, char_map):
     @wraps(func)
@@ -826,3 +1453,20 @@ def _regular_notification_wrapper(func, char_map):
         return func(char_map.get(sender, sender), data)
 
     return args_parser
+
+
+def _metrics_notification_wrapper(func, metrics, char_uuid):
+    @wraps(func)
+    def args_parser(sender, data):
+        metrics.arrival(char_uuid)
+        return func(sender, data)
+
+    return args_parser
+
+
+def _batch_notification_wrapper(batcher):
+    def append(sender, data):
+        # Acquired notifications are views of a buffer that is reused.
+        batcher.append(bytes(data) if isinstance(data, memoryview) else data)
+
+    return append
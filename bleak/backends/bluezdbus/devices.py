@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+The devices seen by a scan, kept by the BlueZ scanner and ``discover``.
+
+"""
+import collections
+import time
+
+from bleak.log import get_logger
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.bus import (
+    PROPERTIES_CHANGED,
+    INTERFACES_ADDED,
+    INTERFACES_REMOVED,
+)
+from bleak.backends.bluezdbus.utils import validate_mac_address
+
+logger = get_logger(__name__)
+
+
+def filter_on_adapter(objs, pattern="hci0"):
+    for path, interfaces in objs.items():
+        adapter = interfaces.get("org.bluez.Adapter1")
+        if adapter is None:
+            continue
+
+        if not pattern or pattern == adapter["Address"] or path.endswith(pattern):
+            return path, interfaces
+
+    raise Exception("Bluetooth adapter not found")
+
+
+def filter_on_device(objs):
+    for path, interfaces in objs.items():
+        device = interfaces.get("org.bluez.Device1")
+        if device is None:
+            continue
+
+        yield path, device
+
+
+def device_info(path, props):
+    try:
+        name = props.get("Name", props.get("Alias", path.split("/")[-1]))
+        address = props.get("Address", None)
+        if address is None:
+            try:
+                address = path[-17:].replace("_", ":")
+                if not validate_mac_address(address):
+                    address = None
+            except Exception:
+                address = None
+        rssi = props.get("RSSI", "?")
+        return name, address, rssi, path
+    except Exception:
+        return None, None, None, None
+
+
+def advertisement_data(address, props):
+    """Build the :py:class:`AdvertisementData` of a device from its ``org.bluez.Device1`` properties."""
+    return AdvertisementData(
+        address,
+        local_name=props.get("Name"),
+        rssi=props.get("RSSI"),
+        manufacturer_data={
+            k: bytes(v) for k, v in props.get("ManufacturerData", {}).items()
+        },
+        service_data={k: bytes(v) for k, v in props.get("ServiceData", {}).items()},
+        uuids=props.get("UUIDs", ()),
+        tx_power=props.get("TxPower"),
+    )
+
+
+class DeviceRecord(object):
+    """The properties of one device, updated in place as signals arrive.
+
+    The :py:class:`BLEDevice` for the record is built when first asked for and
+    kept until a property it was built from changes. RSSI updates, which are
+    the bulk of the signals during a scan, are set on it instead of causing a
+    rebuild. Its ``details["props"]`` is a copy of the properties, taken when
+    ``details`` is first read, so it does not change under the caller.
+
+    Args:
+        path (str): The object path of the device.
+        props (dict): The ``org.bluez.Device1`` properties. Owned by the record from here on.
+        last_seen (float): The time of the last signal about the device.
+
+    """
+
+    __slots__ = ("path", "props", "last_seen", "_device")
+
+    def __init__(self, path, props, last_seen=0.0):
+        self.path = path
+        self.props = props
+        self.last_seen = last_seen
+        self._device = None
+
+    def update(self, changed: dict) -> None:
+        self.props.update(changed)
+        if self._device is not None:
+            if len(changed) == 1 and "RSSI" in changed:
+                self._device.rssi = changed["RSSI"]
+            else:
+                self._device = None
+
+    @property
+    def device(self):
+        """The :py:class:`BLEDevice`, or ``None`` if the device has no address yet."""
+        if self._device is None:
+            name, address, _, path = device_info(self.path, self.props)
+            if address is None:
+                return None
+            self._device = BLEDevice(
+                address,
+                name,
+                rssi=self.props.get("RSSI", 0),
+                uuids=self.props.get("UUIDs", ()),
+                manufacturer_data=self.props.get("ManufacturerData", {}),
+                details_factory=self.details,
+            )
+        return self._device
+
+    def details(self):
+        """The ``details`` of the :py:class:`BLEDevice`, with a copy of the properties."""
+        return {"path": self.path, "props": dict(self.props)}
+
+
+class DeviceStore(object):
+    """The devices on an adapter seen during a scan, keyed by object path.
+
+    Devices are dropped from the store when BlueZ removes them, when they have
+    not been seen for ``ttl`` seconds, and, least recently seen first, when
+    there are more than ``max_size`` of them. Without these, a long running
+    scan in a busy place keeps every device it ever saw.
+
+    Args:
+        cached (dict): The ``org.bluez.Device1`` properties of the devices BlueZ
+            already knew of when the scan started, keyed by object path. A
+            device is only added to the store once it is seen during the scan.
+        ttl (float): Seconds after which a silent device is dropped. Defaults
+            to ``None``, for keeping devices until BlueZ removes them.
+        max_size (int): The number of devices kept. Defaults to ``None``, for no limit.
+        on_evict: Function called with each :py:class:`DeviceRecord` dropped from the store.
+        clock: Function returning the current time in seconds. Defaults to
+            :py:func:`time.monotonic`.
+
+    """
+
+    def __init__(self, cached=None, ttl=None, max_size=None, on_evict=None, clock=None):
+        self.cached = cached if cached is not None else {}
+        self.ttl = ttl
+        self.max_size = max_size
+        self.on_evict = on_evict
+        self.clock = clock or time.monotonic
+        self._records = collections.OrderedDict()
+
+        self.removed = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, path):
+        return path in self._records
+
+    def get(self, path):
+        """Get the :py:class:`DeviceRecord` of the device at ``path``, or ``None``."""
+        return self._records.get(path)
+
+    def stats(self) -> dict:
+        """Counters of the store.
+
+        Returns:
+            Dict with the number of devices in the store, ``size``, and the
+            number of devices dropped since it was created, because BlueZ
+            ``removed`` them, because they ``expired`` or because the store was
+            full and they were ``evicted``.
+
+        """
+        return {
+            "size": len(self._records),
+            "removed": self.removed,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+    def expire(self) -> None:
+        """Drop the devices not seen for ``ttl`` seconds."""
+        if self.ttl is None:
+            return
+        deadline = self.clock() - self.ttl
+        # Records are ordered by last_seen, so only the expired ones are visited.
+        while self._records:
+            record = next(iter(self._records.values()))
+            if record.last_seen > deadline:
+                break
+            self._drop(record.path)
+            self.expired += 1
+
+    def _drop(self, path):
+        record = self._records.pop(path)
+        if self.on_evict is not None:
+            self.on_evict(record)
+
+    def handle_message(self, message):
+        """Update the store from an ``InterfacesAdded``, ``InterfacesRemoved`` or
+        ``PropertiesChanged`` signal on the adapter.
+
+        Returns:
+            The object path of the device the signal was about, or ``None`` if
+            it did not concern a device.
+
+        """
+        member = message.member
+        if member == PROPERTIES_CHANGED:
+            iface, changed, _ = message.body
+            if iface != defs.DEVICE_INTERFACE:
+                return None
+            path = message.path
+            record = self._records.get(path)
+            if record is None:
+                # PropertiesChanged only has the changed properties, so start
+                # from the cached ones. Cached devices are not in the store
+                # until they are seen, since they may not be around.
+                cached = self.cached.get(path)
+                self._add(DeviceRecord(path, dict(cached) if cached else {}), changed)
+            else:
+                self._seen(record, changed)
+            return path
+        elif member == INTERFACES_ADDED:
+            path = message.body[0]
+            props = message.body[1].get(defs.DEVICE_INTERFACE)
+            if props is None:
+                return None
+            record = self._records.get(path)
+            if record is None:
+                self._add(DeviceRecord(path, dict(props)))
+            else:
+                self._seen(record, props)
+            return path
+        elif member == INTERFACES_REMOVED:
+            if defs.DEVICE_INTERFACE not in message.body[1]:
+                return None
+            path = message.body[0]
+            if path in self._records:
+                self._drop(path)
+                self.removed += 1
+            return path
+        return None
+
+    def _add(self, record, changed=None):
+        record.last_seen = self.clock()
+        if changed:
+            record.update(changed)
+        self._records[record.path] = record
+        self.expire()
+        if self.max_size is not None:
+            while len(self._records) > self.max_size:
+                self._drop(next(iter(self._records)))
+                self.evicted += 1
+
+    def _seen(self, record, changed):
+        record.last_seen = self.clock()
+        record.update(changed)
+        self._records.move_to_end(record.path)
+
+    def get_discovered_devices(self):
+        """Get the devices seen, reusing the :py:class:`BLEDevice` objects that are up to date."""
+        self.expire()
+        discovered_devices = []
+        for record in self._records.values():
+            if not record.props:
+                logger.debug(
+                    "Disregarding %s since no properties could be obtained.",
+                    record.path,
+                )
+                continue
+            device = record.device
+            if device is not None:
+                discovered_devices.append(device)
+        return discovered_devices
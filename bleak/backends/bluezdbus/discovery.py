@@ -3,52 +3,24 @@
 import asyncio
 import logging
 
-from bleak.backends.device import BLEDevice
-from bleak.backends.bluezdbus import defs, get_reactor
-from bleak.backends.bluezdbus.utils import validate_mac_address
-
-from txdbus import client
-
-logger = logging.getLogger(__name__)
-
-
-def _filter_on_adapter(objs, pattern="hci0"):
-    for path, interfaces in objs.items():
-        adapter = interfaces.get("org.bluez.Adapter1")
-        if adapter is None:
-            continue
-
-        if not pattern or pattern == adapter["Address"] or path.endswith(pattern):
-            return path, interfaces
-
-    raise Exception("Bluetooth adapter not found")
-
-
-def _filter_on_device(objs):
-    for path, interfaces in objs.items():
-        device = interfaces.get("org.bluez.Device1")
-        if device is None:
-            continue
-
-        yield path, device
-
-
-def _device_info(path, props):
-    try:
-        name = props.get("Name", props.get("Alias", path.split("/")[-1]))
-        address = props.get("Address", None)
-        if address is None:
-            try:
-                address = path[-17:].replace("_", ":")
-                if not validate_mac_address(address):
-                    address = None
-            except Exception:
-                address = None
-        rssi = props.get("RSSI", "?")
-        return name, address, rssi, path
-    except Exception as e:
-        # logger.exception(e, exc_info=True)
-        return None, None, None, None
+from bleak.log import get_logger
+from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.bus import (
+    call_remote,
+    get_shared_bus,
+    PROPERTIES_CHANGED,
+    INTERFACES_ADDED,
+    INTERFACES_REMOVED,
+)
+from bleak.backends.bluezdbus.devices import (
+    DeviceStore,
+    device_info,
+    filter_on_adapter,
+    filter_on_device,
+)
+from bleak.backends.bluezdbus.version import get_bluez_version
+
+logger = get_logger(__name__)
 
 
 async def discover(timeout=5.0, loop=None, **kwargs):
@@ -66,7 +38,10 @@ async def discover(timeout=5.0, loop=None, **kwargs):
 
     Keyword Args:
         device (str): Bluetooth device to use for discovery.
-        filters (dict): A dict of filters to be applied on discovery.
+        filters (dict): A dict of filters to be applied on discovery. Only
+            applied if no other scanner or client on the event loop is
+            discovering on the adapter already, see
+            :py:meth:`bleak.backends.bluezdbus.bus.SharedBus.start_discovery`.
 
     Returns:
         List of tuples containing name, address and signal strength
@@ -75,162 +50,71 @@ async def discover(timeout=5.0, loop=None, **kwargs):
     """
     device = kwargs.get("device", "hci0")
     loop = loop if loop else asyncio.get_event_loop()
-    cached_devices = {}
-    devices = {}
-    rules = list()
-    reactor = get_reactor(loop)
+    devices = DeviceStore()
 
     # Discovery filters
     filters = kwargs.get("filters", {})
     filters["Transport"] = "le"
 
     def parse_msg(message):
-        if message.member == "InterfacesAdded":
-            msg_path = message.body[0]
-            try:
-                device_interface = message.body[1].get("org.bluez.Device1", {})
-            except Exception as e:
-                raise e
-            devices[msg_path] = (
-                {**devices[msg_path], **device_interface}
-                if msg_path in devices
-                else device_interface
-            )
-        elif message.member == "PropertiesChanged":
-            iface, changed, invalidated = message.body
-            if iface != defs.DEVICE_INTERFACE:
+        msg_path = devices.handle_message(message)
+        if message.member == PROPERTIES_CHANGED:
+            if msg_path is None:
                 return
-
-            msg_path = message.path
-            # the PropertiesChanged signal only sends changed properties, so we
-            # need to get remaining properties from cached_devices. However, we
-            # don't want to add all cached_devices to the devices dict since
-            # they may not actually be nearby or powered on.
-            if msg_path not in devices and msg_path in cached_devices:
-                devices[msg_path] = cached_devices[msg_path]
-            devices[msg_path] = (
-                {**devices[msg_path], **changed} if msg_path in devices else changed
-            )
-        elif (
-            message.member == "InterfacesRemoved"
-            and message.body[1][0] == defs.BATTERY_INTERFACE
-        ):
-            logger.info(
-                "{0}, {1} ({2}): {3}".format(
-                    message.member, message.interface, message.path, message.body
-                )
-            )
-            return
         else:
-            msg_path = message.path
             logger.info(
-                "{0}, {1} ({2}): {3}".format(
-                    message.member, message.interface, message.path, message.body
-                )
+                "%s, %s (%s): %s",
+                message.member,
+                message.interface,
+                message.path,
+                message.body,
             )
+            if (
+                message.member == INTERFACES_REMOVED
+                and message.body[1][0] == defs.BATTERY_INTERFACE
+            ):
+                return
 
-        logger.info(
-            "{0}, {1} ({2} dBm), Object Path: {3}".format(
-                *_device_info(msg_path, devices.get(msg_path))
-            )
-        )
-
-    bus = await client.connect(reactor, "system").asFuture(loop)
-
-    # Add signal listeners
-    rules.append(
-        await bus.addMatch(
-            parse_msg,
-            interface="org.freedesktop.DBus.ObjectManager",
-            member="InterfacesAdded",
-            path_namespace="/org/bluez",
-        ).asFuture(loop)
-    )
-
-    rules.append(
-        await bus.addMatch(
-            parse_msg,
-            interface="org.freedesktop.DBus.ObjectManager",
-            member="InterfacesRemoved",
-            path_namespace="/org/bluez",
-        ).asFuture(loop)
-    )
-
-    rules.append(
-        await bus.addMatch(
-            parse_msg,
-            interface="org.freedesktop.DBus.Properties",
-            member="PropertiesChanged",
-            path_namespace="/org/bluez",
-        ).asFuture(loop)
-    )
-
-    # Find the HCI device to use for scanning and get cached device properties
-    objects = await bus.callRemote(
-        "/",
-        "GetManagedObjects",
-        interface=defs.OBJECT_MANAGER_INTERFACE,
-        destination=defs.BLUEZ_SERVICE,
-    ).asFuture(loop)
-    adapter_path, interface = _filter_on_adapter(objects, device)
-    cached_devices = dict(_filter_on_device(objects))
-
-    # Running Discovery loop.
-    await bus.callRemote(
-        adapter_path,
-        "SetDiscoveryFilter",
-        interface="org.bluez.Adapter1",
-        destination="org.bluez",
-        signature="a{sv}",
-        body=[filters],
-    ).asFuture(loop)
-
-    await bus.callRemote(
-        adapter_path,
-        "StartDiscovery",
-        interface="org.bluez.Adapter1",
-        destination="org.bluez",
-    ).asFuture(loop)
-
-    await asyncio.sleep(timeout)
-
-    await bus.callRemote(
-        adapter_path,
-        "StopDiscovery",
-        interface="org.bluez.Adapter1",
-        destination="org.bluez",
-    ).asFuture(loop)
-
-    # Reduce output.
-    discovered_devices = []
-    for path, props in devices.items():
-        if not props:
-            logger.debug(
-                "Disregarding %s since no properties could be obtained." % path
-            )
-            continue
-        name, address, _, path = _device_info(path, props)
-        if address is None:
-            continue
-        uuids = props.get("UUIDs", [])
-        manufacturer_data = props.get("ManufacturerData", {})
-        discovered_devices.append(
-            BLEDevice(
-                address,
-                name,
-                {"path": path, "props": props},
-                uuids=uuids,
-                manufacturer_data=manufacturer_data,
+        record = devices.get(msg_path)
+        if record is not None and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "%s, %s (%s dBm), Object Path: %s", *device_info(msg_path, record.props)
             )
-        )
 
-    for rule in rules:
-        await bus.delMatch(rule).asFuture(loop)
+    # Get the system bus shared with clients and scanners on this loop.
+    shared_bus = await get_shared_bus(loop)
+    bus = shared_bus.connection
 
-    # Try to disconnect the System Bus.
     try:
-        bus.disconnect()
-    except Exception as e:
-        logger.error("Attempt to disconnect system bus failed: {0}".format(e))
-
-    return discovered_devices
+        # Find the HCI device to use for scanning and get cached device properties
+        objects = await call_remote(
+            bus,
+            loop,
+            "/",
+            "GetManagedObjects",
+            interface=defs.OBJECT_MANAGER_INTERFACE,
+            destination=defs.BLUEZ_SERVICE,
+        )
+        adapter_path, interface = filter_on_adapter(objects, device)
+        devices.cached = dict(filter_on_device(objects))
+        await get_bluez_version(bus, loop, adapter_path)
+
+        # Add signal handlers for all devices on the adapter.
+        for member in (INTERFACES_ADDED, INTERFACES_REMOVED, PROPERTIES_CHANGED):
+            shared_bus.add_signal_handler(member, adapter_path, parse_msg)
+        try:
+            # Running Discovery loop.
+            await shared_bus.start_discovery(adapter_path, filters)
+            try:
+                await asyncio.sleep(timeout)
+            finally:
+                await shared_bus.stop_discovery(adapter_path)
+        finally:
+            for member in (INTERFACES_ADDED, INTERFACES_REMOVED, PROPERTIES_CHANGED):
+                shared_bus.remove_signal_handler(member, adapter_path, parse_msg)
+    finally:
+        # Release the shared system bus, it is disconnected when no one else
+        # uses it. Also when cancelled, to not leak the bus and discovery session.
+        await shared_bus.release()
+
+    return devices.get_discovered_devices()
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+A cache of the GATT databases of devices, for rebuilding the services of a
+device on reconnection without walking the objects BlueZ manages.
+
+Entries are keyed by device address and hold the GATT objects of the device as
+exported by BlueZ, with object paths relative to the device, so that they can
+be used whichever adapter the device is connected with. If the device has a
+``Database Hash`` characteristic, its value is read when there is an entry to
+validate, stored with the entry from the second connection on and compared
+with the current one before the entry is used.
+
+"""
+import json
+import os
+
+from bleak.log import get_logger
+from bleak.backends.bluezdbus import defs
+
+logger = get_logger(__name__)
+
+DATABASE_HASH_UUID = "00002b2a-0000-1000-8000-00805f9b34fb"
+SERVICE_CHANGED_UUID = "00002a05-0000-1000-8000-00805f9b34fb"
+
+# Properties holding the object paths of other objects of the device.
+_PATH_PROPERTIES = ("Service", "Characteristic")
+# Properties that describe the state of a connection rather than the database.
+_VOLATILE_PROPERTIES = ("Value", "Notifying", "NotifyAcquired", "WriteAcquired")
+
+
+def strip_device_path(objects: dict, device_path: str) -> dict:
+    """Make the paths of the GATT objects of a device relative to the device.
+
+    Also drops the properties that are only valid for the current connection,
+    like ``Value``.
+
+    Args:
+        objects (dict): The managed objects of the device's GATT database.
+        device_path (str): The object path of the device.
+
+    """
+    n = len(device_path)
+    stripped = {}
+    for path, interfaces in objects.items():
+        stripped_interfaces = {}
+        for interface, props in interfaces.items():
+            if not interface.startswith("org.bluez.Gatt"):
+                continue
+            props = {k: v for k, v in props.items() if k not in _VOLATILE_PROPERTIES}
+            props.pop("Device", None)
+            for key in _PATH_PROPERTIES:
+                if key in props:
+                    props[key] = props[key][n:]
+            if "Includes" in props:
+                props["Includes"] = [p[n:] for p in props["Includes"]]
+            stripped_interfaces[interface] = props
+        if stripped_interfaces:
+            stripped[path[n:]] = stripped_interfaces
+    return stripped
+
+
+def add_device_path(objects: dict, device_path: str) -> dict:
+    """Turn objects from :py:func:`strip_device_path` back into managed objects."""
+    added = {}
+    for path, interfaces in objects.items():
+        added_interfaces = {}
+        for interface, props in interfaces.items():
+            props = dict(props)
+            for key in _PATH_PROPERTIES:
+                if key in props:
+                    props[key] = device_path + props[key]
+            if "Includes" in props:
+                props["Includes"] = [device_path + p for p in props["Includes"]]
+            if interface == defs.GATT_SERVICE_INTERFACE:
+                props["Device"] = device_path
+            added_interfaces[interface] = props
+        added[device_path + path] = added_interfaces
+    return added
+
+
+def find_characteristic(objects: dict, uuid: str):
+    """The object path of the first characteristic with ``uuid``, or ``None``."""
+    for path, interfaces in objects.items():
+        char = interfaces.get(defs.GATT_CHARACTERISTIC_INTERFACE)
+        if char is not None and char.get("UUID") == uuid:
+            return path
+    return None
+
+
+def service_uuids(objects: dict) -> list:
+    """The sorted UUIDs of the primary services in ``objects``, without duplicates."""
+    uuids = set()
+    for interfaces in objects.values():
+        service = interfaces.get(defs.GATT_SERVICE_INTERFACE)
+        if service is not None and service.get("Primary", True):
+            uuids.add(service["UUID"])
+    return sorted(uuids)
+
+
+class GATTCache(object):
+    """The GATT databases of devices, kept in memory and optionally on disk.
+
+    Pass an instance as the ``gatt_cache`` keyword argument of
+    :py:class:`bleak.backends.bluezdbus.client.BleakClientBlueZDBus` to use it.
+    It can be shared by any number of clients.
+
+    The client validates an entry before using it: by reading the ``Database
+    Hash`` characteristic if the entry has a hash, otherwise by comparing the
+    ``UUIDs`` BlueZ lists for the device with those it listed when the entry
+    was stored. An entry is invalidated on a mismatch, and when BlueZ reports a
+    change of the GATT database of a connected device, e.g. after a ``Service
+    Changed`` indication.
+
+    Args:
+        directory (str): Directory to keep the entries in, one JSON file per
+            device, so that they are kept across processes. Defaults to
+            ``None``, for keeping them in memory only.
+
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory
+        self._entries = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, address: str):
+        """Get the entry of a device.
+
+        Returns:
+            Dict with the ``objects`` of the device, with relative paths, the
+            ``hash``, as a hex string or ``None``, and the sorted ``uuids`` of
+            the device or ``None``, or ``None`` if there is no entry.
+
+        """
+        key = address.upper()
+        entry = self._entries.get(key)
+        if entry is None and self.directory is not None:
+            entry = self._load(key)
+            if entry is not None:
+                self._entries[key] = entry
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(
+        self, address: str, objects: dict, db_hash: str = None, uuids: list = None
+    ) -> None:
+        """Store the GATT objects of a device.
+
+        Args:
+            address (str): The address of the device.
+            objects (dict): Objects from :py:func:`strip_device_path`.
+            db_hash (str): The value of the ``Database Hash`` characteristic as
+                a hex string, if the device has one.
+            uuids (list): The ``UUIDs`` property of the device, for validating
+                the entry of a device without ``Database Hash``.
+
+        """
+        key = address.upper()
+        entry = {
+            "hash": db_hash,
+            "uuids": sorted(set(uuids)) if uuids is not None else None,
+            "objects": objects,
+        }
+        self._entries[key] = entry
+        self.stores += 1
+        if self.directory is not None:
+            self._save(key, entry)
+
+    def invalidate(self, address: str) -> None:
+        """Drop the entry of a device."""
+        key = address.upper()
+        found = self._entries.pop(key, None) is not None
+        if self.directory is not None:
+            try:
+                os.remove(self._file_name(key))
+                found = True
+            except FileNotFoundError:
+                pass
+        if found:
+            logger.debug("GATT cache entry of %s invalidated.", key)
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Counters of the cache.
+
+        Returns:
+            Dict with the number of entries in memory, ``size``, and the number
+            of ``hits``, including entries found to be stale, ``misses``,
+            ``stores`` and ``invalidations``.
+
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+        }
+
+    # Internal methods
+
+    def _file_name(self, key):
+        return os.path.join(self.directory, key.replace(":", "_") + ".json")
+
+    def _load(self, key):
+        try:
+            with open(self._file_name(key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read GATT cache entry of %s: %s", key, e)
+            return None
+
+    def _save(self, key, entry):
+        file_name = self._file_name(key)
+        try:
+            with open(file_name + ".tmp", "w") as f:
+                json.dump(entry, f)
+            os.replace(file_name + ".tmp", file_name)
+        except (OSError, TypeError) as e:
+            logger.warning("Could not write GATT cache entry of %s: %s", key, e)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Notifications read from the file descriptor returned by
+"Characteristic.AcquireNotify", see
+:py:meth:`bleak.backends.bluezdbus.client.BleakClientBlueZDBus.start_notify`.
+
+"""
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class AcquiredNotification(object):
+    """Delivers the notifications of one characteristic straight from a socket.
+
+    Every notification is one packet on the socket. It is read into a buffer
+    allocated once, and the callback gets a :py:class:`memoryview` of it, which
+    is only valid until the callback returns.
+
+    Args:
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+        fd (int): The file descriptor from ``AcquireNotify``. It is closed by :py:meth:`close`.
+        mtu (int): The MTU returned by ``AcquireNotify``.
+        sender (str): The UUID of the characteristic, passed as the first argument of ``callback``.
+        callback: Function accepting the sender and the payload.
+        on_close: Function called without arguments when BlueZ closes the socket.
+
+    """
+
+    def __init__(self, loop, fd, mtu, sender, callback, on_close=None):
+        self.loop = loop
+        self.fd = fd
+        self.sender = sender
+        self.callback = callback
+        self.on_close = on_close
+
+        self._buffer = bytearray(max(mtu, 23))
+        self._view = memoryview(self._buffer)
+        self._buffers = [self._buffer]
+
+        os.set_blocking(fd, False)
+        loop.add_reader(fd, self._on_readable)
+
+    def close(self) -> None:
+        """Stop reading and close the file descriptor, which makes BlueZ stop notifications."""
+        if self.fd is None:
+            return
+        fd, self.fd = self.fd, None
+        self.loop.remove_reader(fd)
+        os.close(fd)
+
+    def _on_readable(self) -> None:
+        # Drain all packets that arrived since the last wakeup.
+        while self.fd is not None:
+            try:
+                n = os.readv(self.fd, self._buffers)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                logger.error(
+                    "Reading notifications from {0} failed: {1}".format(self.sender, e)
+                )
+                n = 0
+
+            if not n:
+                # BlueZ closed the socket, e.g. on disconnection.
+                self.close()
+                if self.on_close is not None:
+                    self.on_close()
+                return
+
+            try:
+                self.callback(self.sender, self._view[:n])
+            except Exception:
+                logger.exception(
+                    "Notification callback for {0} failed.".format(self.sender)
+                )
@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+"""
+A pool of connections to many peripherals, made over the shared system bus.
+
+BlueZ handles one connection attempt per adapter at a time and fails the others
+with ``org.bluez.Error.InProgress``, so independent clients connecting at once
+get in each other's way. The pool queues connection attempts per adapter, in
+the order they were made, keeps connections open for reuse by address, and
+closes them when they have been idle for a while.
+
+"""
+import asyncio
+import collections
+from asyncio import AbstractEventLoop
+
+from bleak.exc import BleakError
+from bleak.log import get_logger
+from bleak.backends.bluezdbus.bus import get_shared_bus
+from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+logger = get_logger(__name__)
+
+
+class _AdapterQueue(object):
+    """Lets ``limit`` connection attempts on an adapter through at a time, first come first served."""
+
+    def __init__(self, loop, limit):
+        self.loop = loop
+        self.limit = limit
+        self.active = 0
+        self.connections = 0
+        self._waiters = collections.deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        waiter = self.loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                self._waiters.remove(waiter)
+            else:
+                # Handed the slot just before being cancelled, pass it on.
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot goes to the waiter, ``active`` stays the same.
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class _PoolEntry(object):
+    __slots__ = ("address", "device", "client", "users", "connecting", "idle_handle")
+
+    def __init__(self, address, device):
+        self.address = address
+        self.device = device
+        self.client = None
+        self.users = 0
+        self.connecting = None
+        self.idle_handle = None
+
+
+class _PooledConnection(object):
+    """Async context manager returned by :py:meth:`BleakConnectionPool.connection`."""
+
+    def __init__(self, pool, address, kwargs):
+        self._pool = pool
+        self._address = address
+        self._kwargs = kwargs
+        self._client = None
+
+    async def __aenter__(self):
+        self._client = await self._pool.acquire(self._address, **self._kwargs)
+        return self._client
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._pool.release(self._client)
+
+
+class BleakConnectionPool(object):
+    """A pool of :py:class:`BleakClientBlueZDBus` connections, keyed by address.
+
+    .. code-block:: python
+
+        async with BleakConnectionPool(max_connecting=1, idle_timeout=30) as pool:
+            async with pool.connection("24:71:89:CC:09:05") as client:
+                value = await client.read_gatt_char(char_uuid)
+
+    A connection is shared by everyone who acquires the same address while it
+    is open. When no one is using it, it is disconnected after ``idle_timeout``
+    seconds, unless it is acquired again before that.
+
+    Connection attempts, including the discovery scan ``connect`` may run,
+    are queued per adapter and run ``max_connecting`` at a time. Attempts
+    failing with ``org.bluez.Error.InProgress``, e.g. because of a client
+    outside of the pool, are retried ``retries`` times.
+
+    The pool holds a reference to the shared system bus while it is open, so
+    the bus and its match rules are kept between connections.
+
+    Args:
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+        max_connecting (int): The number of connection attempts run at the same
+            time on each adapter. Defaults to 1.
+        idle_timeout (float): Seconds after which an unused connection is
+            closed. ``None`` keeps it open until :py:meth:`close`. Defaults to 30.0.
+        retries (int): The number of times an attempt failing with
+            ``InProgress`` is retried. Defaults to 2.
+        retry_delay (float): Seconds before the first retry, doubled for each
+            following one. Defaults to 0.5.
+        client_class: The client class. Defaults to :py:class:`BleakClientBlueZDBus`.
+
+    Keyword Args:
+        Passed on to the clients created by the pool, e.g. ``timeout``.
+
+    """
+
+    def __init__(
+        self,
+        loop: AbstractEventLoop = None,
+        max_connecting: int = 1,
+        idle_timeout: float = 30.0,
+        retries: int = 2,
+        retry_delay: float = 0.5,
+        client_class=BleakClientBlueZDBus,
+        **kwargs
+    ):
+        self.loop = loop if loop else asyncio.get_event_loop()
+        self.max_connecting = max(1, max_connecting)
+        self.idle_timeout = idle_timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.client_class = client_class
+        self._client_kwargs = kwargs
+
+        self._entries = {}
+        self._queues = {}
+        # Acquiring the shared bus, once for all connection attempts.
+        self._shared_bus = None
+        self._closed = False
+
+        self.connects = 0
+        self.reuses = 0
+        self.failures = 0
+        self.retried = 0
+        self.idle_closed = 0
+        self.disconnects = 0
+        self.wait_time = 0.0
+
+    def __repr__(self):
+        return "<{0}, connections: {1}>".format(
+            self.__class__.__name__, len(self._entries)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def connection(self, address: str, **kwargs) -> _PooledConnection:
+        """Acquire a connection for the duration of an ``async with`` block.
+
+        Args:
+            address (str): The address of the peripheral.
+
+        Keyword Args:
+            See :py:meth:`acquire`.
+
+        """
+        return _PooledConnection(self, address, kwargs)
+
+    async def acquire(self, address: str, device: str = "hci0", **kwargs):
+        """Get a connected client for a peripheral, connecting if needed.
+
+        Every call must be matched by a call to :py:meth:`release`. Do not call
+        ``disconnect`` on the client, the pool does that.
+
+        The client's disconnected callback is used by the pool. A client that
+        has lost its connection is dropped from the pool and the next call
+        connects again.
+
+        Args:
+            address (str): The address of the peripheral.
+            device (str): The adapter to connect with, if a new connection is
+                made. Defaults to ``"hci0"``.
+
+        Keyword Args:
+            Passed on to ``connect`` if a new connection is made, e.g.
+            ``ble_device`` or ``device_path``.
+
+        Returns:
+            The connected client.
+
+        """
+        if self._closed:
+            raise BleakError("The connection pool is closed.")
+        key = address.upper()
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _PoolEntry(key, device)
+            entry.connecting = asyncio.ensure_future(
+                self._connect(entry, address, kwargs), loop=self.loop
+            )
+        elif entry.connecting is None:
+            self.reuses += 1
+
+        entry.users += 1
+        if entry.idle_handle is not None:
+            entry.idle_handle.cancel()
+            entry.idle_handle = None
+        try:
+            if entry.connecting is not None:
+                # Shielded, since others may be waiting for the same connection.
+                await asyncio.shield(entry.connecting)
+        except BaseException:
+            entry.users -= 1
+            if entry.client is not None:
+                self._release_entry(entry)
+            raise
+        return entry.client
+
+    async def release(self, client) -> None:
+        """Give back a client returned by :py:meth:`acquire`."""
+        entry = self._entries.get(client.address.upper())
+        if entry is None or entry.client is not client:
+            # Lost its connection and dropped from the pool.
+            return
+        entry.users -= 1
+        self._release_entry(entry)
+
+    async def close(self) -> None:
+        """Disconnect all clients and release the shared bus."""
+        if self._closed:
+            return
+        self._closed = True
+        entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            if entry.idle_handle is not None:
+                entry.idle_handle.cancel()
+                entry.idle_handle = None
+            if entry.connecting is not None:
+                entry.connecting.cancel()
+        await asyncio.gather(
+            *(self._disconnect(entry) for entry in entries if entry.client is not None)
+        )
+        acquiring, self._shared_bus = self._shared_bus, None
+        if acquiring is not None:
+            try:
+                shared_bus = await acquiring
+            except Exception:
+                return
+            await shared_bus.release()
+
+    def is_pooled(self, address: str) -> bool:
+        """If a connection to ``address`` is open or being made."""
+        return address.upper() in self._entries
+
+    def adapter_load(self, device: str) -> int:
+        """The number of connections open or being made on an adapter, including queued attempts."""
+        return sum(1 for entry in self._entries.values() if entry.device == device)
+
+    def stats(self) -> dict:
+        """Metrics of the pool.
+
+        Returns:
+            Dict with the current number of open ``connections``, of those
+            ``in_use`` and ``idle``, and of attempts ``connecting`` and
+            ``waiting`` in the queues, the counts since the pool was created of
+            ``connects``, ``reuses`` of open connections, ``failures``,
+            ``retries``, connections closed by the pool as ``idle_closed`` and
+            lost as ``disconnects``, the total time in seconds attempts waited
+            in the queues, ``wait_time``, and a dict of ``adapters`` with the
+            ``connections``, ``connecting`` and ``waiting`` of each.
+
+        """
+        connected = [e for e in self._entries.values() if e.client is not None]
+        in_use = sum(1 for e in connected if e.users)
+        return {
+            "connections": len(connected),
+            "in_use": in_use,
+            "idle": len(connected) - in_use,
+            "connecting": sum(q.active for q in self._queues.values()),
+            "waiting": sum(q.waiting for q in self._queues.values()),
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "failures": self.failures,
+            "retries": self.retried,
+            "idle_closed": self.idle_closed,
+            "disconnects": self.disconnects,
+            "wait_time": self.wait_time,
+            "adapters": {
+                device: {
+                    "connections": q.connections,
+                    "connecting": q.active,
+                    "waiting": q.waiting,
+                }
+                for device, q in self._queues.items()
+            },
+        }
+
+    # Internal methods
+
+    def _queue(self, device) -> _AdapterQueue:
+        queue = self._queues.get(device)
+        if queue is None:
+            queue = self._queues[device] = _AdapterQueue(self.loop, self.max_connecting)
+        return queue
+
+    async def _connect(self, entry, address, kwargs) -> None:
+        try:
+            if self._shared_bus is None:
+                self._shared_bus = asyncio.ensure_future(
+                    get_shared_bus(self.loop), loop=self.loop
+                )
+            acquiring = self._shared_bus
+            try:
+                # Shielded, since the other connection attempts wait for it too.
+                await asyncio.shield(acquiring)
+            except Exception:
+                if self._shared_bus is acquiring:
+                    self._shared_bus = None
+                raise
+
+            queue = self._queue(entry.device)
+            start = self.loop.time()
+            await queue.acquire()
+            self.wait_time += self.loop.time() - start
+            try:
+                client = await self._connect_client(entry, address, kwargs)
+            finally:
+                queue.release()
+        except BaseException:
+            if self._entries.get(entry.address) is entry:
+                del self._entries[entry.address]
+            self.failures += 1
+            raise
+        finally:
+            entry.connecting = None
+
+        entry.client = client
+        queue.connections += 1
+        self.connects += 1
+        client.set_disconnected_callback(
+            lambda *args: self._on_disconnected(entry, client)
+        )
+        if not entry.users:
+            # Everyone waiting for it was cancelled.
+            self._release_entry(entry)
+
+    async def _connect_client(self, entry, address, kwargs):
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            client = self.client_class(
+                address, loop=self.loop, device=entry.device, **self._client_kwargs
+            )
+            try:
+                await client.connect(**kwargs)
+                return client
+            except BleakError as e:
+                if "InProgress" not in str(e) or attempt == self.retries:
+                    raise
+            logger.debug("Connecting to %s is in progress, retrying.", address)
+            self.retried += 1
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    def _release_entry(self, entry) -> None:
+        if entry.users or self.idle_timeout is None or self._closed:
+            return
+        entry.idle_handle = self.loop.call_later(
+            self.idle_timeout, self._on_idle_timeout, entry
+        )
+
+    def _on_idle_timeout(self, entry) -> None:
+        entry.idle_handle = None
+        if entry.users or self._entries.get(entry.address) is not entry:
+            return
+        del self._entries[entry.address]
+        self.idle_closed += 1
+        asyncio.ensure_future(self._disconnect(entry), loop=self.loop)
+
+    def _on_disconnected(self, entry, client) -> None:
+        if self._entries.get(entry.address) is not entry or entry.client is not client:
+            return
+        logger.info("%s disconnected, dropping it from the pool.", entry.address)
+        del self._entries[entry.address]
+        self._queue(entry.device).connections -= 1
+        self.disconnects += 1
+        if entry.idle_handle is not None:
+            entry.idle_handle.cancel()
+            entry.idle_handle = None
+
+    async def _disconnect(self, entry) -> None:
+        self._queue(entry.device).connections -= 1
+        try:
+            await entry.client.disconnect()
+        except Exception as e:
+            logger.error("Could not disconnect from %s: %s", entry.address, e)
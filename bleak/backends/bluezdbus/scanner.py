@@ -6,56 +6,34 @@ from asyncio.events import AbstractEventLoop
 from functools import wraps
 from typing import Callable, Any, Union, List
 
-from bleak.backends.scanner import BaseBleakScanner
+from bleak.log import get_logger
+from bleak.backends.scanner import (
+    BaseBleakScanner,
+    AdvertisementData,
+    AdvertisementTracker,
+)
 from bleak.backends.device import BLEDevice
-from bleak.backends.bluezdbus import defs, get_reactor
-from bleak.backends.bluezdbus.utils import validate_mac_address
-
-from txdbus import client
-
-logger = logging.getLogger(__name__)
+from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.bus import (
+    call_remote,
+    get_shared_bus,
+    PROPERTIES_CHANGED,
+    INTERFACES_ADDED,
+    INTERFACES_REMOVED,
+)
+from bleak.backends.bluezdbus.devices import (
+    DeviceStore,
+    advertisement_data,
+    device_info,
+    filter_on_adapter,
+    filter_on_device,
+)
+from bleak.backends.bluezdbus.version import get_bluez_version
+
+logger = get_logger(__name__)
 _here = pathlib.Path(__file__).parent
 
 
-def _filter_on_adapter(objs, pattern="hci0"):
-    for path, interfaces in objs.items():
-        adapter = interfaces.get("org.bluez.Adapter1")
-        if adapter is None:
-            continue
-
-        if not pattern or pattern == adapter["Address"] or path.endswith(pattern):
-            return path, interfaces
-
-    raise Exception("Bluetooth adapter not found")
-
-
-def _filter_on_device(objs):
-    for path, interfaces in objs.items():
-        device = interfaces.get("org.bluez.Device1")
-        if device is None:
-            continue
-
-        yield path, device
-
-
-def _device_info(path, props):
-    try:
-        name = props.get("Name", props.get("Alias", path.split("/")[-1]))
-        address = props.get("Address", None)
-        if address is None:
-            try:
-                address = path[-17:].replace("_", ":")
-                if not validate_mac_address(address):
-                    address = None
-            except Exception:
-                address = None
-        rssi = props.get("RSSI", "?")
-        return name, address, rssi, path
-    except Exception as e:
-        # logger.exception(e, exc_info=True)
-        return None, None, None, None
-
-
 class BleakScannerBlueZDBus(BaseBleakScanner):
     """The native Linux Bleak BLE Scanner.
 
@@ -68,7 +46,18 @@ class BleakScannerBlueZDBus(BaseBleakScanner):
 
     Keyword Args:
         device (str): Bluetooth device to use for discovery.
-        filters (dict): A dict of filters to be applied on discovery.
+        filters (dict): A dict of filters to be applied on discovery. Only
+            applied if no other scanner or client on the event loop is
+            discovering on the adapter already, see
+            :py:meth:`bleak.backends.bluezdbus.bus.SharedBus.start_discovery`.
+        device_ttl (float): Seconds after which a device that has not been seen
+            is dropped from the discovered devices. Defaults to ``None``, for
+            keeping devices until BlueZ removes them.
+        max_devices (int): The number of discovered devices kept, dropping the
+            least recently seen ones. Defaults to ``None``, for no limit.
+        continuous (bool): Start discovery again when BlueZ stops it, e.g. when
+            the adapter is reset or powered off and on, until :py:meth:`stop`
+            is called. Defaults to ``False``.
 
     """
 
@@ -76,12 +65,14 @@ class BleakScannerBlueZDBus(BaseBleakScanner):
         super(BleakScannerBlueZDBus, self).__init__(loop, **kwargs)
 
         self._device = kwargs.get("device", "hci0")
-        self._reactor = None
+        self._shared_bus = None
         self._bus = None
 
-        self._cached_devices = {}
-        self._devices = {}
-        self._rules = list()
+        self._devices = DeviceStore(
+            ttl=kwargs.get("device_ttl"),
+            max_size=kwargs.get("max_devices"),
+            on_evict=self._on_device_evicted,
+        )
 
         # Discovery filters
         self._filters = kwargs.get("filters", {})
@@ -91,84 +82,59 @@ class BleakScannerBlueZDBus(BaseBleakScanner):
         self._interface = None
 
         self._callback = None
+        self._advertisement_callback = None
+        self._tracker = None
+        self._continuous = kwargs.get("continuous", False)
+        self._restarting = None
 
     async def start(self):
-        self._reactor = get_reactor(self.loop)
-        self._bus = await client.connect(self._reactor, "system").asFuture(self.loop)
-
-        # Add signal listeners
-        self._rules.append(
-            await self._bus.addMatch(
-                self.parse_msg,
-                interface="org.freedesktop.DBus.ObjectManager",
-                member="InterfacesAdded",
-            ).asFuture(self.loop)
-        )
-
-        self._rules.append(
-            await self._bus.addMatch(
-                self.parse_msg,
-                interface="org.freedesktop.DBus.ObjectManager",
-                member="InterfacesRemoved",
-            ).asFuture(self.loop)
-        )
-
-        self._rules.append(
-            await self._bus.addMatch(
-                self.parse_msg,
-                interface="org.freedesktop.DBus.Properties",
-                member="PropertiesChanged",
-            ).asFuture(self.loop)
-        )
+        # Get the system bus shared with other clients and scanners on this loop.
+        self._shared_bus = await get_shared_bus(self.loop)
+        self._bus = self._shared_bus.connection
 
         # Find the HCI device to use for scanning and get cached device properties
-        objects = await self._bus.callRemote(
-            "/",
-            "GetManagedObjects",
-            interface=defs.OBJECT_MANAGER_INTERFACE,
-            destination=defs.BLUEZ_SERVICE,
-        ).asFuture(self.loop)
-        self._adapter_path, self._interface = _filter_on_adapter(objects, self._device)
-        self._cached_devices = dict(_filter_on_device(objects))
-
-        # Apply the filters
-        await self._bus.callRemote(
-            self._adapter_path,
-            "SetDiscoveryFilter",
-            interface="org.bluez.Adapter1",
-            destination="org.bluez",
-            signature="a{sv}",
-            body=[self._filters],
-        ).asFuture(self.loop)
-
-        # Start scanning
-        await self._bus.callRemote(
-            self._adapter_path,
-            "StartDiscovery",
-            interface="org.bluez.Adapter1",
-            destination="org.bluez",
-        ).asFuture(self.loop)
+        try:
+            objects = await call_remote(
+                self._bus,
+                self.loop,
+                "/",
+                "GetManagedObjects",
+                interface=defs.OBJECT_MANAGER_INTERFACE,
+                destination=defs.BLUEZ_SERVICE,
+            )
+            self._adapter_path, self._interface = filter_on_adapter(
+                objects, self._device
+            )
+            self._devices.cached = dict(filter_on_device(objects))
+            await get_bluez_version(self._bus, self.loop, self._adapter_path)
+        except Exception:
+            shared_bus, self._shared_bus, self._bus = self._shared_bus, None, None
+            await shared_bus.release()
+            raise
+
+        # Add signal handlers for all devices on the adapter.
+        for member in (INTERFACES_ADDED, INTERFACES_REMOVED, PROPERTIES_CHANGED):
+            self._shared_bus.add_signal_handler(
+                member, self._adapter_path, self.parse_msg
+            )
+
+        # Apply the filters and start scanning
+        await self._shared_bus.start_discovery(self._adapter_path, self._filters)
 
     async def stop(self):
-        await self._bus.callRemote(
-            self._adapter_path,
-            "StopDiscovery",
-            interface="org.bluez.Adapter1",
-            destination="org.bluez",
-        ).asFuture(self.loop)
-
-        for rule in self._rules:
-            await self._bus.delMatch(rule).asFuture(self.loop)
-        self._rules.clear()
-
-        # Try to disconnect the System Bus.
-        try:
-            self._bus.disconnect()
-        except Exception as e:
-            logger.error("Attempt to disconnect system bus failed: {0}".format(e))
+        if self._restarting is not None:
+            self._restarting.cancel()
+            self._restarting = None
+        await self._shared_bus.stop_discovery(self._adapter_path)
+
+        for member in (INTERFACES_ADDED, INTERFACES_REMOVED, PROPERTIES_CHANGED):
+            self._shared_bus.remove_signal_handler(
+                member, self._adapter_path, self.parse_msg
+            )
 
-        self._bus = None
-        self._reactor = None
+        # Release the shared system bus, it is disconnected when no one else uses it.
+        shared_bus, self._shared_bus, self._bus = self._shared_bus, None, None
+        await shared_bus.release()
 
     async def set_scanning_filter(self, **kwargs):
         """Sets OS level scanning filters for the BleakScanner.
@@ -178,36 +144,28 @@ class BleakScannerBlueZDBus(BaseBleakScanner):
         <https://git.kernel.org/pub/scm/bluetooth/bluez.git/tree/doc/adapter-api.txt?h=5.48&id=0d1e3b9c5754022c779da129025d493a198d49cf>`_
 
         Keyword Args:
-            filters (dict): A dict of filters to be applied on discovery.
+            filters (dict): A dict of filters to be applied on discovery. Only
+            applied if no other scanner or client on the event loop is
+            discovering on the adapter already, see
+            :py:meth:`bleak.backends.bluezdbus.bus.SharedBus.start_discovery`.
 
         """
         self._filters = kwargs.get("filters", {})
         self._filters["Transport"] = "le"
 
     async def get_discovered_devices(self) -> List[BLEDevice]:
-        # Reduce output.
-        discovered_devices = []
-        for path, props in self._devices.items():
-            if not props:
-                logger.debug(
-                    "Disregarding %s since no properties could be obtained." % path
-                )
-                continue
-            name, address, _, path = _device_info(path, props)
-            if address is None:
-                continue
-            uuids = props.get("UUIDs", [])
-            manufacturer_data = props.get("ManufacturerData", {})
-            discovered_devices.append(
-                BLEDevice(
-                    address,
-                    name,
-                    {"path": path, "props": props},
-                    uuids=uuids,
-                    manufacturer_data=manufacturer_data,
-                )
-            )
-        return discovered_devices
+        return self._devices.get_discovered_devices()
+
+    def get_device_stats(self) -> dict:
+        """Counters of the discovered devices.
+
+        Returns:
+            Dict with the number of discovered devices, ``size``, and the number
+            of devices dropped because BlueZ ``removed`` them, because they
+            ``expired`` or because there were too many and they were ``evicted``.
+
+        """
+        return self._devices.stats()
 
     def register_detection_callback(self, callback: Callable):
         """Set a function to be called on each Scanner discovery.
@@ -220,60 +178,92 @@ class BleakScannerBlueZDBus(BaseBleakScanner):
         """
         self._callback = callback
 
+    def register_advertisement_callback(
+        self,
+        callback: Callable[[AdvertisementData], None],
+        rssi_hysteresis: int = 5,
+    ) -> None:
+        """Set a function to be called with the advertisements of scanned devices.
+
+        The function gets an :py:class:`AdvertisementData` when a device is
+        first seen and when what it advertises changes, including RSSI changes
+        of at least ``rssi_hysteresis`` dB, but not for every advertisement.
+
+        Args:
+            callback: Function accepting an :py:class:`AdvertisementData`, or ``None`` to unset.
+            rssi_hysteresis (int): The RSSI change in dB that is reported. Defaults to 5.
+
+        """
+        self._advertisement_callback = callback
+        self._tracker = None
+        if callback is not None:
+            self._tracker = AdvertisementTracker(rssi_hysteresis)
+            # Track at least the devices the store keeps.
+            max_devices = self._devices.max_size
+            if max_devices is not None and max_devices > self._tracker.max_size:
+                self._tracker.max_size = max_devices
+
     # Helper methods
 
     def parse_msg(self, message):
-        if message.member == "InterfacesAdded":
-            msg_path = message.body[0]
-            try:
-                device_interface = message.body[1].get("org.bluez.Device1", {})
-            except Exception as e:
-                raise e
-            self._devices[msg_path] = (
-                {**self._devices[msg_path], **device_interface}
-                if msg_path in self._devices
-                else device_interface
-            )
-        elif message.member == "PropertiesChanged":
-            iface, changed, invalidated = message.body
-            if iface != defs.DEVICE_INTERFACE:
+        msg_path = self._devices.handle_message(message)
+        if message.member == PROPERTIES_CHANGED:
+            if msg_path is None:
+                if self._continuous and message.path == self._adapter_path:
+                    self._check_discovering(message)
                 return
-
-            msg_path = message.path
-            # the PropertiesChanged signal only sends changed properties, so we
-            # need to get remaining properties from cached_devices. However, we
-            # don't want to add all cached_devices to the devices dict since
-            # they may not actually be nearby or powered on.
-            if msg_path not in self._devices and msg_path in self._cached_devices:
-                self._devices[msg_path] = self._cached_devices[msg_path]
-            self._devices[msg_path] = (
-                {**self._devices[msg_path], **changed}
-                if msg_path in self._devices
-                else changed
-            )
-        elif (
-            message.member == "InterfacesRemoved"
-            and message.body[1][0] == defs.BATTERY_INTERFACE
-        ):
-            logger.info(
-                "{0}, {1} ({2}): {3}".format(
-                    message.member, message.interface, message.path, message.body
-                )
-            )
-            return
         else:
-            msg_path = message.path
             logger.info(
-                "{0}, {1} ({2}): {3}".format(
-                    message.member, message.interface, message.path, message.body
-                )
+                "%s, %s (%s): %s",
+                message.member,
+                message.interface,
+                message.path,
+                message.body,
             )
+            if (
+                message.member == INTERFACES_REMOVED
+                and message.body[1][0] == defs.BATTERY_INTERFACE
+            ):
+                return
 
-        logger.info(
-            "{0}, {1} ({2} dBm), Object Path: {3}".format(
-                *_device_info(msg_path, self._devices.get(msg_path))
+        record = self._devices.get(msg_path)
+        if record is not None and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "%s, %s (%s dBm), Object Path: %s", *device_info(msg_path, record.props)
             )
-        )
 
         if self._callback is not None:
             self._callback(message)
+
+        if self._tracker is not None and record is not None:
+            address = device_info(msg_path, record.props)[1]
+            if address is None:
+                return
+            data = advertisement_data(address, record.props)
+            if self._tracker.update(data):
+                self._advertisement_callback(data)
+
+    def _on_device_evicted(self, record):
+        # Report the device again when it comes back.
+        if self._tracker is not None:
+            self._tracker.forget(device_info(record.path, record.props)[1])
+
+    def _check_discovering(self, message):
+        iface, changed, _ = message.body
+        if iface != defs.ADAPTER_INTERFACE or self._shared_bus is None:
+            return
+        if changed.get("Discovering") is False or changed.get("Powered") is True:
+            if self._restarting is None:
+                self._restarting = asyncio.ensure_future(
+                    self._restart_discovery(), loop=self.loop
+                )
+
+    async def _restart_discovery(self):
+        try:
+            logger.info("Discovery stopped on %s, restarting.", self._adapter_path)
+            await self._shared_bus.restart_discovery(self._adapter_path)
+        except Exception as e:
+            # Fails while the adapter is powered off, retried when it is powered on.
+            logger.warning("Could not restart discovery: %s", e)
+        finally:
+            self._restarting = None
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Scheduling of connections over all Bluetooth adapters of the host.
+
+"""
+import asyncio
+import collections
+from asyncio import AbstractEventLoop
+
+from bleak.exc import BleakError
+from bleak.log import get_logger
+from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.bus import (
+    get_shared_bus,
+    PROPERTIES_CHANGED,
+    INTERFACES_ADDED,
+    INTERFACES_REMOVED,
+)
+from bleak.backends.bluezdbus.pool import BleakConnectionPool, _PooledConnection
+from bleak.backends.bluezdbus.scanner import BleakScannerBlueZDBus
+from bleak.backends.bluezdbus.utils import get_managed_objects
+
+logger = get_logger(__name__)
+
+_BLUEZ_PATH = "/org/bluez"
+
+# Sorts adapters that have not seen a device after those that have.
+_NO_RSSI = -1000
+
+
+def _split_path(path):
+    """The adapter name and device address of an object path below ``/org/bluez``."""
+    parts = path.split("/")
+    adapter = parts[3] if len(parts) > 3 else None
+    address = None
+    if len(parts) > 4 and parts[4].startswith("dev_"):
+        address = parts[4][4:].replace("_", ":")
+    return adapter, address
+
+
+def _path_on_adapter(kwargs, adapter):
+    """Keep a device path of the ``connect`` keyword arguments only if it is on ``adapter``.
+
+    ``ble_device`` and ``device_path`` are removed, and ``device_path`` is set
+    again to the path they gave if it is below ``adapter``.
+    """
+    ble_device = kwargs.pop("ble_device", None)
+    path = kwargs.pop("device_path", None)
+    if not path and ble_device is not None and isinstance(ble_device.details, dict):
+        path = ble_device.details.get("path")
+    if path and _split_path(path)[0] == adapter:
+        kwargs["device_path"] = path
+
+
+class BleakAdapterScheduler(object):
+    """Spreads connections over the adapters of the host.
+
+    The adapters are taken from ``GetManagedObjects`` on :py:meth:`start` and
+    followed as they are added, removed, powered on and off. A new connection
+    goes to the powered adapter with the fewest connections, counting attempts
+    in progress and queued. Among equally loaded adapters, the one that has seen
+    the device with the strongest RSSI is picked. The RSSI is taken from the
+    ``org.bluez.Device1`` objects and signals of every adapter, e.g. from the
+    discovery scans run when connecting, for at most ``max_devices`` devices.
+    Connections are made and reused through a :py:class:`BleakConnectionPool`.
+
+    One adapter, ``scan_adapter``, is kept for scanning, see
+    :py:meth:`create_scanner`, and only gets connections when it is the only
+    powered adapter.
+
+    .. code-block:: python
+
+        async with BleakAdapterScheduler(max_connections=7) as scheduler:
+            scanner = scheduler.create_scanner(continuous=True)
+            ...
+            async with scheduler.connection(address) as client:
+                ...
+
+    Args:
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+        pool (BleakConnectionPool): The pool to make connections with. One is
+            created, and closed with the scheduler, if not given.
+        scan_adapter (str): The adapter used for scanning, e.g. ``"hci0"``.
+            Defaults to the first adapter, if there is more than one.
+        max_connections (int): The number of connections an adapter takes
+            before the others are preferred, whatever their RSSI. Defaults to
+            ``None``, for no limit.
+        max_devices (int): The number of devices the RSSI is kept of, the
+            least recently seen are dropped first. Defaults to 1024.
+
+    Keyword Args:
+        Passed on to the :py:class:`BleakConnectionPool` created if ``pool`` is not given.
+
+    """
+
+    def __init__(
+        self,
+        loop: AbstractEventLoop = None,
+        pool: BleakConnectionPool = None,
+        scan_adapter: str = None,
+        max_connections: int = None,
+        max_devices: int = 1024,
+        **kwargs
+    ):
+        self.loop = loop if loop else asyncio.get_event_loop()
+        self._owns_pool = pool is None
+        self.pool = (
+            pool if pool is not None else BleakConnectionPool(self.loop, **kwargs)
+        )
+        self.scan_adapter = scan_adapter
+        self.max_connections = max_connections
+        self.max_devices = max_devices
+
+        self._shared_bus = None
+        # Adapter name to its ``org.bluez.Adapter1`` properties.
+        self._adapters = {}
+        # Device address to a dict of adapter name to the last RSSI seen,
+        # least recently seen first.
+        self._rssi = collections.OrderedDict()
+        self._assigned = {}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def adapters(self) -> list:
+        """The names of the adapters, e.g. ``["hci0", "hci1"]``"""
+        return sorted(self._adapters)
+
+    async def start(self) -> None:
+        """Find the adapters and start following them and the RSSI of devices."""
+        self._shared_bus = await get_shared_bus(self.loop)
+        try:
+            objects = await get_managed_objects(
+                self._shared_bus.connection, self.loop, _BLUEZ_PATH + "/"
+            )
+        except Exception:
+            shared_bus, self._shared_bus = self._shared_bus, None
+            await shared_bus.release()
+            raise
+        self._load_objects(objects)
+        if not self._adapters:
+            await self.close()
+            raise BleakError("No Bluetooth adapters found.")
+        if self.scan_adapter is None and len(self._adapters) > 1:
+            self.scan_adapter = self.adapters[0]
+
+        for member in (INTERFACES_ADDED, INTERFACES_REMOVED, PROPERTIES_CHANGED):
+            self._shared_bus.add_signal_handler(member, _BLUEZ_PATH, self._on_signal)
+
+    async def close(self) -> None:
+        """Stop following the adapters and close the pool, if created by the scheduler."""
+        if self._shared_bus is not None:
+            for member in (INTERFACES_ADDED, INTERFACES_REMOVED, PROPERTIES_CHANGED):
+                self._shared_bus.remove_signal_handler(
+                    member, _BLUEZ_PATH, self._on_signal
+                )
+            shared_bus, self._shared_bus = self._shared_bus, None
+            await shared_bus.release()
+        if self._owns_pool:
+            await self.pool.close()
+
+    def choose_adapter(self, address: str) -> str:
+        """Pick the adapter for a new connection to ``address``.
+
+        Returns:
+            The name of the adapter, e.g. ``"hci1"``.
+
+        """
+        candidates = [
+            name for name, props in self._adapters.items() if props.get("Powered")
+        ]
+        if not candidates:
+            raise BleakError("No powered Bluetooth adapter.")
+        if len(candidates) > 1 and self.scan_adapter in candidates:
+            candidates.remove(self.scan_adapter)
+
+        rssi = self._rssi.get(address.upper(), {})
+
+        def key(name):
+            load = self.pool.adapter_load(name)
+            full = self.max_connections is not None and load >= self.max_connections
+            return full, load, -rssi.get(name, _NO_RSSI), name
+
+        return min(candidates, key=key)
+
+    async def acquire(self, address: str, **kwargs):
+        """Get a connected client for a peripheral from the pool, with a new
+        connection made on the adapter picked by :py:meth:`choose_adapter`.
+
+        Every call must be matched by a call to :py:meth:`release`.
+
+        A ``ble_device`` or ``device_path`` of another adapter than the one
+        picked, e.g. of a device found by the scanner of :py:meth:`create_scanner`,
+        is not passed on, and the device is looked up on the adapter picked.
+
+        Keyword Args:
+            Passed on to :py:meth:`BleakConnectionPool.acquire`.
+
+        """
+        if "device" not in kwargs and not self.pool.is_pooled(address):
+            kwargs["device"] = self.choose_adapter(address)
+            _path_on_adapter(kwargs, kwargs["device"])
+            self._assigned[kwargs["device"]] = (
+                self._assigned.get(kwargs["device"], 0) + 1
+            )
+        return await self.pool.acquire(address, **kwargs)
+
+    async def release(self, client) -> None:
+        """Give back a client returned by :py:meth:`acquire`."""
+        await self.pool.release(client)
+
+    def connection(self, address: str, **kwargs) -> _PooledConnection:
+        """Acquire a connection for the duration of an ``async with`` block.
+
+        Keyword Args:
+            See :py:meth:`acquire`.
+
+        """
+        return _PooledConnection(self, address, kwargs)
+
+    def create_scanner(self, **kwargs) -> BleakScannerBlueZDBus:
+        """Create a scanner on ``scan_adapter``.
+
+        Keyword Args:
+            Passed on to :py:class:`BleakScannerBlueZDBus`.
+
+        """
+        device = self.scan_adapter or (self.adapters[0] if self._adapters else "hci0")
+        return BleakScannerBlueZDBus(self.loop, device=device, **kwargs)
+
+    def stats(self) -> dict:
+        """Utilization of the adapters.
+
+        Returns:
+            Dict of adapter name to a dict with its ``address``, if it is
+            ``powered``, if it is the ``scan_adapter``, its current ``load``
+            of connections and attempts, its open ``connections`` and
+            ``waiting`` attempts, the number of connections ``assigned`` to it
+            by the scheduler, its ``utilization``, the load divided by
+            ``max_connections`` if set, and the number of devices it has seen,
+            ``seen``.
+
+        """
+        pool_adapters = self.pool.stats()["adapters"]
+        stats = {}
+        for name, props in self._adapters.items():
+            load = self.pool.adapter_load(name)
+            pool_stats = pool_adapters.get(name, {})
+            stats[name] = {
+                "address": props.get("Address"),
+                "powered": bool(props.get("Powered")),
+                "scan_adapter": name == self.scan_adapter,
+                "load": load,
+                "connections": pool_stats.get("connections", 0),
+                "waiting": pool_stats.get("waiting", 0),
+                "assigned": self._assigned.get(name, 0),
+                "utilization": (
+                    load / self.max_connections if self.max_connections else None
+                ),
+                "seen": sum(1 for seen in self._rssi.values() if name in seen),
+            }
+        return stats
+
+    # Internal methods
+
+    def _load_objects(self, objects) -> None:
+        for path, interfaces in objects.items():
+            adapter, address = _split_path(path)
+            if defs.ADAPTER_INTERFACE in interfaces:
+                self._adapters[adapter] = dict(interfaces[defs.ADAPTER_INTERFACE])
+            device = interfaces.get(defs.DEVICE_INTERFACE)
+            if device is not None and device.get("RSSI") is not None:
+                self._seen(device.get("Address", address), adapter, device["RSSI"])
+
+    def _seen(self, address, adapter, rssi) -> None:
+        seen = self._rssi.get(address)
+        if seen is None:
+            seen = self._rssi[address] = {}
+            while len(self._rssi) > self.max_devices:
+                self._rssi.popitem(last=False)
+        else:
+            self._rssi.move_to_end(address)
+        seen[adapter] = rssi
+
+    def _on_signal(self, message) -> None:
+        if message.member == PROPERTIES_CHANGED:
+            iface, changed, _ = message.body
+            adapter, address = _split_path(message.path)
+            if iface == defs.DEVICE_INTERFACE and address is not None:
+                rssi = changed.get("RSSI")
+                if rssi is not None:
+                    self._seen(address, adapter, rssi)
+            elif iface == defs.ADAPTER_INTERFACE and adapter in self._adapters:
+                self._adapters[adapter].update(changed)
+        elif message.member == INTERFACES_ADDED:
+            self._load_objects({message.body[0]: message.body[1]})
+        elif message.member == INTERFACES_REMOVED:
+            path, interfaces = message.body
+            adapter, address = _split_path(path)
+            if defs.ADAPTER_INTERFACE in interfaces and address is None:
+                logger.info("Adapter %s removed.", adapter)
+                self._adapters.pop(adapter, None)
+                for device, seen in list(self._rssi.items()):
+                    seen.pop(adapter, None)
+                    if not seen:
+                        del self._rssi[device]
+            elif defs.DEVICE_INTERFACE in interfaces and address is not None:
+                seen = self._rssi.get(address)
+                if seen is not None:
+                    seen.pop(adapter, None)
+                    if not seen:
+                        del self._rssi[address]
@@ -26,6 +26,8 @@ def listen_properties_changed(bus, loop, callback):
 def listen_interfaces_added(bus, loop, callback):
     """Create a future for a InterfacesAdded signal listener.
 
+    The BlueZ object manager lives on ``/``, so that is where the signal is sent from.
+
     Args:
         bus: The system bus object to use.
         loop: The asyncio loop to use for adding the future to.
@@ -39,12 +41,14 @@ def listen_interfaces_added(bus, loop, callback):
         callback,
         interface=OBJECT_MANAGER_INTERFACE,
         member="InterfacesAdded",
-        path_namespace="/org/bluez",
+        path="/",
     ).asFuture(loop)
 
 
 def listen_interfaces_removed(bus, loop, callback):
-    """Create a future for a InterfacesAdded signal listener.
+    """Create a future for a InterfacesRemoved signal listener.
+
+    The BlueZ object manager lives on ``/``, so that is where the signal is sent from.
 
     Args:
         bus: The system bus object to use.
@@ -59,5 +63,5 @@ def listen_interfaces_removed(bus, loop, callback):
         callback,
         interface=OBJECT_MANAGER_INTERFACE,
         member="InterfacesRemoved",
-        path_namespace="/org/bluez",
+        path="/",
     ).asFuture(loop)
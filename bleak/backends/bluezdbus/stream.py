@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Writers used by :py:meth:`bleak.backends.bluezdbus.client.BleakClientBlueZDBus.write_stream`.
+
+"""
+import collections
+import os
+
+from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.bus import call_remote
+
+
+class FdWriter(object):
+    """Writes to the file descriptor returned by "Characteristic.AcquireWrite".
+
+    Every write on the descriptor is sent as one Write Command. When the socket
+    buffer is full, the writer waits for the descriptor to become writable.
+
+    Args:
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+        fd (int): The file descriptor. It is made non-blocking and closed by :py:meth:`close`.
+
+    """
+
+    def __init__(self, loop, fd):
+        self.loop = loop
+        self.fd = fd
+        os.set_blocking(fd, False)
+
+    async def write(self, chunk: bytes) -> None:
+        while True:
+            try:
+                os.write(self.fd, chunk)
+                return
+            except BlockingIOError:
+                await self._writable()
+
+    async def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        # Not to leave a writer on a closed descriptor, which may be reused.
+        self.loop.remove_writer(self.fd)
+        os.close(self.fd)
+
+    def _writable(self):
+        waiter = self.loop.create_future()
+
+        def on_writable():
+            self.loop.remove_writer(self.fd)
+            if not waiter.done():
+                waiter.set_result(None)
+
+        def on_done(waiter):
+            if waiter.cancelled():
+                self.loop.remove_writer(self.fd)
+
+        self.loop.add_writer(self.fd, on_writable)
+        waiter.add_done_callback(on_done)
+        return waiter
+
+
+class WriteValueWriter(object):
+    """Keeps up to ``window`` "Characteristic.WriteValue" calls in flight.
+
+    Args:
+        bus: The system bus connection to use.
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+        path (str): Object path of the characteristic.
+        response (bool): If write-with-response operations should be done.
+        window (int): The maximum number of calls not yet replied to.
+
+    """
+
+    def __init__(self, bus, loop, path, response, window):
+        self.bus = bus
+        self.loop = loop
+        self.path = path
+        self.window = max(1, window)
+        self._options = {"type": "request" if response else "command"}
+        self._pending = collections.deque()
+
+    async def write(self, chunk: bytes) -> None:
+        if len(self._pending) >= self.window:
+            # Replies come in order, so the oldest call is the one to wait for.
+            await self._pending.popleft()
+        self._pending.append(
+            call_remote(
+                self.bus,
+                self.loop,
+                self.path,
+                "WriteValue",
+                interface=defs.GATT_CHARACTERISTIC_INTERFACE,
+                destination=defs.BLUEZ_SERVICE,
+                signature="aya{sv}",
+                body=[chunk, self._options],
+                returnSignature="",
+            )
+        )
+
+    async def flush(self) -> None:
+        while self._pending:
+            await self._pending.popleft()
+
+    def close(self) -> None:
+        while self._pending:
+            self._pending.popleft().cancel()
+
+
+def split(buffer: bytearray, data, size: int):
+    """Split ``buffer`` followed by ``data`` into chunks of ``size`` bytes.
+
+    The bytes left over are kept in ``buffer``, to be completed by the next call.
+
+    Args:
+        buffer (bytearray): The bytes left over from the previous call.
+        data (bytes-like): The data to split.
+        size (int): The chunk size.
+
+    Yields:
+        ``bytes`` objects of length ``size``.
+
+    """
+    view = memoryview(data)
+    start = 0
+    if buffer:
+        start = size - len(buffer)
+        buffer += view[:start]
+        if len(buffer) < size:
+            return
+        yield bytes(buffer)
+        del buffer[:]
+    while len(view) - start >= size:
+        yield bytes(view[start : start + size])
+        start += size
+    buffer += view[start:]
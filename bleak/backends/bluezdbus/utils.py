@@ -4,6 +4,7 @@ import re
 from bleak.uuids import uuidstr_to_str
 
 from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.bus import call_remote
 from bleak.exc import BleakError
 
 _mac_address_regex = re.compile("^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$")
@@ -69,12 +70,14 @@ def get_gatt_service_path(hci_device, address, service_id):
 
 
 async def get_managed_objects(bus, loop, object_path_filter=None):
-    objects = await bus.callRemote(
+    objects = await call_remote(
+        bus,
+        loop,
         "/",
         "GetManagedObjects",
         interface="org.freedesktop.DBus.ObjectManager",
         destination="org.bluez",
-    ).asFuture(loop)
+    )
     if object_path_filter:
         return dict(
             filter(lambda i: i[0].startswith(object_path_filter), objects.items())
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy, process-wide probe of the installed BlueZ version.
+
+"""
+import asyncio
+import logging
+import re
+import subprocess
+
+from bleak.exc import BleakError
+from bleak.backends.bluezdbus import defs
+from bleak.backends.bluezdbus.bus import call_remote
+
+logger = logging.getLogger(__name__)
+
+_bluez_version = None
+# Event loop to the probe in progress on it, for callers to wait for.
+_probes = {}
+
+# Unless overridden with ``DeviceID`` in ``main.conf``, ``bluetoothd`` publishes its
+# own version in the Device ID of every adapter, i.e. the ``Modalias`` property of
+# ``org.bluez.Adapter1`` reads ``usb:v1D6Bp0246dMMmm`` for BlueZ version MM.mm.
+_modalias_regex = re.compile("^usb:v1D6Bp0246d([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})$")
+_version_regex = re.compile(b"(\\d+).(\\d+)")
+
+
+def _version_from_modalias(modalias):
+    """Parse the BlueZ version out of an adapter's ``Modalias`` property.
+
+    Args:
+        modalias (str): The ``Modalias`` property of an ``org.bluez.Adapter1``.
+
+    Returns:
+        Tuple of integers ``(major, minor)`` or ``None`` if it is not a BlueZ Device ID.
+
+    """
+    m = _modalias_regex.match(modalias or "")
+    if not m:
+        return None
+    return int(m.group(1), 16), int(m.group(2), 16)
+
+
+def _version_from_bluetoothctl():
+    """Run ``bluetoothctl --version`` and parse its output.
+
+    This blocks until ``bluetoothctl`` exits, run it in an executor.
+
+    Returns:
+        Tuple of integers ``(major, minor)``.
+
+    """
+    try:
+        p = subprocess.Popen(["bluetoothctl", "--version"], stdout=subprocess.PIPE)
+    except OSError as e:
+        raise BleakError("Could not determine BlueZ version: {0}".format(e))
+    out, _ = p.communicate()
+    s = _version_regex.search(out.strip(b"'"))
+    if not s:
+        raise BleakError("Could not determine BlueZ version: {0}".format(out))
+    return tuple(map(int, s.groups()))
+
+
+def _check_version(version):
+    # TODO: Check if BlueZ version 5.43 is sufficient.
+    if not (version[0] == 5 and version[1] >= 43):
+        raise BleakError(
+            "Bleak requires BlueZ >= 5.43. Found version {0}.{1} installed.".format(
+                *version
+            )
+        )
+
+
+async def get_bluez_version(bus, loop, adapter_path="/org/bluez/hci0"):
+    """Get the version of the running BlueZ daemon.
+
+    The version is probed once per process and cached. The ``Modalias`` property
+    of the adapter is asked for first, and only if that does not identify BlueZ
+    is ``bluetoothctl --version`` run, in the default executor of ``loop``.
+    Callers on the same loop while the version is probed wait for that probe.
+
+    Args:
+        bus: The system bus object to use.
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+        adapter_path (str): Object path of the adapter to query.
+
+    Returns:
+        Tuple of integers ``(major, minor)``.
+
+    Raises:
+        BleakError: if the version cannot be determined or is older than 5.43.
+
+    """
+    if _bluez_version is None:
+        probe = _probes.get(loop)
+        if probe is None:
+            probe = _probes[loop] = asyncio.ensure_future(
+                _probe_version(bus, loop, adapter_path), loop=loop
+            )
+            probe.add_done_callback(lambda _: _probes.pop(loop, None))
+        await asyncio.shield(probe)
+
+    _check_version(_bluez_version)
+    return _bluez_version
+
+
+async def _probe_version(bus, loop, adapter_path):
+    global _bluez_version
+    version = None
+    try:
+        modalias = await call_remote(
+            bus,
+            loop,
+            adapter_path,
+            "Get",
+            interface=defs.PROPERTIES_INTERFACE,
+            destination=defs.BLUEZ_SERVICE,
+            signature="ss",
+            body=[defs.ADAPTER_INTERFACE, "Modalias"],
+            returnSignature="v",
+        )
+        version = _version_from_modalias(modalias)
+    except Exception as e:
+        logger.debug("Could not read Modalias of {0}: {1}".format(adapter_path, e))
+
+    if version is None:
+        version = await loop.run_in_executor(None, _version_from_bluetoothctl)
+    _bluez_version = version
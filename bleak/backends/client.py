@@ -12,6 +12,8 @@ from typing import Callable, Any, Union
 
 from bleak.backends.service import BleakGATTServiceCollection
 from bleak.backends.characteristic import BleakGATTCharacteristic
+from bleak.backends.notification import NotificationStream
+from bleak.backends.metrics import ClientMetrics, NULL_SPAN
 
 
 class BaseBleakClient(abc.ABC):
@@ -21,6 +23,8 @@ class BaseBleakClient(abc.ABC):
 
     Keyword Args:
         timeout (float): Timeout for required ``discover`` call. Defaults to 2.0.
+        metrics (bool): Record latency histograms and error counters of the
+            operations of the client, see :py:meth:`enable_metrics`. Defaults to ``False``.
 
     """
 
@@ -35,6 +39,10 @@ class BaseBleakClient(abc.ABC):
 
         self._timeout = kwargs.get("timeout", 2.0)
 
+        self._metrics = None
+        if kwargs.get("metrics"):
+            self.enable_metrics()
+
     def __str__(self):
         return "{0}, {1}".format(self.__class__.__name__, self.address)
 
@@ -43,6 +51,49 @@ class BaseBleakClient(abc.ABC):
             self.__class__.__name__, self.address, self.loop
         )
 
+    # Metrics
+
+    @property
+    def metrics(self) -> ClientMetrics:
+        """The :py:class:`bleak.backends.metrics.ClientMetrics` being recorded, or ``None``"""
+        return self._metrics
+
+    def enable_metrics(self, metrics: ClientMetrics = None) -> ClientMetrics:
+        """Start recording latency histograms and error counters of operations.
+
+        .. code-block:: python
+
+            metrics = client.enable_metrics()
+            ...
+            print(metrics.as_dict()["read_gatt_char"]["p99"])
+            print(metrics.prometheus())
+
+        Which operations are recorded depends on the backend. Notification
+        intervals are recorded for notifications started while enabled.
+
+        Args:
+            metrics (ClientMetrics): Where to record, e.g. one shared by
+                several clients. Defaults to a new one labelled with the address.
+
+        Returns:
+            The :py:class:`bleak.backends.metrics.ClientMetrics` recorded in.
+
+        """
+        if metrics is None:
+            metrics = ClientMetrics(labels={"address": self.address})
+        self._metrics = metrics
+        return metrics
+
+    def disable_metrics(self) -> None:
+        """Stop recording metrics."""
+        self._metrics = None
+
+    def _span(self, operation: str, target=None):
+        """Context manager timing an operation if metrics are enabled."""
+        if self._metrics is None:
+            return NULL_SPAN
+        return self._metrics.span(operation, target)
+
     # Async Context managers
 
     async def __aenter__(self):
@@ -224,3 +275,39 @@ class BaseBleakClient(abc.ABC):
 
         """
         raise NotImplementedError()
+
+    def notifications(
+        self,
+        char_specifier: Union[BleakGATTCharacteristic, int, str, uuid.UUID],
+        maxsize: int = 64,
+        overflow: str = NotificationStream.DROP_OLDEST,
+        **kwargs
+    ) -> NotificationStream:
+        """Get the notifications of a characteristic as an async iterator.
+
+        .. code-block:: python
+
+            async for data in client.notifications(char_uuid):
+                print(data)
+
+        Notifications are started with :py:meth:`start_notify` when iteration
+        starts and queued until consumed. Call ``aclose()`` on the returned
+        object, or use it as an async context manager, to stop them.
+
+        Args:
+            char_specifier (BleakGATTCharacteristic, int, str or UUID): The characteristic to get
+                notifications/indications from, specified by either integer handle, UUID or
+                directly by the BleakGATTCharacteristic object representing it.
+            maxsize (int): The number of notifications queued. Defaults to 64.
+            overflow (str): What to do when the queue is full, ``"drop-oldest"``,
+                ``"drop-newest"`` or ``"block"`` to stop notifications until it
+                has room again. Defaults to ``"drop-oldest"``.
+
+        Keyword Args:
+            Passed on to :py:meth:`start_notify`.
+
+        Returns:
+            A :py:class:`bleak.backends.notification.NotificationStream`.
+
+        """
+        return NotificationStream(self, char_specifier, maxsize, overflow, **kwargs)
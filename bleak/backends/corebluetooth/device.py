@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from bleak.backends._manufacturers import MANUFACTURERS
+from bleak.backends.device import manufacturer_name
 
 from Foundation import NSDictionary
 
@@ -35,7 +35,6 @@ class BLEDeviceCoreBluetooth(BLEDevice):
 
     def __init__(self, *args, **kwargs):
         super(BLEDeviceCoreBluetooth, self).__init__(*args, **kwargs)
-        self.metadata = {}
         self._rssi = kwargs.get("rssi")
 
     def _update(self, advertisementData: NSDictionary):
@@ -47,7 +46,7 @@ class BLEDeviceCoreBluetooth(BLEDevice):
         if not cbuuids:
             return
         # converting to lower case to match other platforms
-        self.metadata["uuids"] = [str(u).lower() for u in cbuuids]
+        self.uuids = tuple(str(u).lower() for u in cbuuids)
 
     def _update_manufacturer(self, advertisementData: NSDictionary):
         mfg_bytes = advertisementData.get("kCBAdvDataManufacturerData")
@@ -56,7 +55,7 @@ class BLEDeviceCoreBluetooth(BLEDevice):
 
         mfg_id = int.from_bytes(mfg_bytes[0:2], byteorder="little")
         mfg_val = bytes(mfg_bytes[2:])
-        self.metadata["manufacturer_data"] = {mfg_id: mfg_val}
+        self.manufacturer_data = {mfg_id: mfg_val}
 
     @property
     def rssi(self):
@@ -103,10 +102,8 @@ class BLEDevice(object):
             if "manufacturer_data" in self.metadata:
                 ks = list(self.metadata["manufacturer_data"].keys())
                 if len(ks):
-                    mf = MANUFACTURERS.get(ks[0], MANUFACTURERS.get(0xFFFF))
-                    value = self.metadata["manufacturer_data"].get(
-                        ks[0], MANUFACTURERS.get(0xFFFF)
-                    )
+                    mf = manufacturer_name(ks[0])
+                    value = self.metadata["manufacturer_data"][ks[0]]
                     # TODO: Evaluate how to interpret the value of the company identifier...
                     return "{0}: {1} ({2})".format(self.address, mf, value)
         return "{0}: {1}".format(self.address, self.name)
@@ -6,7 +6,43 @@ Wrapper class for Bluetooth LE servers returned from calling
 Created on 2018-04-23 by hbldh <henrik.blidh@nedomkull.com>
 
 """
-from ._manufacturers import MANUFACTURERS
+import sys
+
+_NOT_SET = object()
+
+
+def manufacturer_name(company_id: int) -> str:
+    """Get the name of a company from its Bluetooth SIG company identifier.
+
+    The table of names is loaded on the first call.
+
+    Args:
+        company_id (int): The company identifier, e.g. a key of ``manufacturer_data``.
+
+    Returns:
+        The name of the company, or the description of the reserved identifier
+        0xFFFF if it is unknown.
+
+    """
+    manufacturers = globals().get("MANUFACTURERS") or __getattr__("MANUFACTURERS")
+    return manufacturers.get(company_id, manufacturers.get(0xFFFF))
+
+
+def __getattr__(name):
+    """Load ``MANUFACTURERS`` on first access (PEP 562)."""
+    if name != "MANUFACTURERS":
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name)
+        )
+    from bleak.backends._manufacturers import MANUFACTURERS
+
+    globals()[name] = MANUFACTURERS
+    return MANUFACTURERS
+
+
+def _int_to_address(value):
+    address = "{0:012X}".format(value)
+    return ":".join(address[i : i + 2] for i in range(0, 12, 2))
 
 
 class BLEDevice(object):
@@ -21,23 +57,142 @@ class BLEDevice(object):
       dict with keys `path` which has the string path to the DBus device object and `props`
       which houses the properties dictionary of the D-Bus Device.
     - When using macOS backend, `details` attribute will be a CBPeripheral object
+
+    The fields are slots, to keep the memory use of many devices down.
+
+    Args:
+        address (str or int): The address of the device.
+        name (str): The name of the device.
+        details: The backend specific details, see above.
+
+    Keyword Args:
+        rssi (int): The signal strength in dBm. Read from ``details`` if not given.
+        uuids (list): The advertised service UUIDs.
+        manufacturer_data (dict): Company identifier to manufacturer data.
+        details_factory: Function returning ``details``, called the first time
+            :py:attr:`details` is read, instead of passing ``details``.
+
+    Other keyword arguments are kept in :py:attr:`metadata`.
+
     """
 
+    __slots__ = (
+        "_address",
+        "name",
+        "_rssi",
+        "_uuids",
+        "_manufacturer_data",
+        "_details",
+        "_details_factory",
+        "_metadata",
+    )
+
     def __init__(self, address, name, details=None, **kwargs):
         self.address = address
         self.name = name if name else "Unknown"
-        self.details = details
-        self.metadata = kwargs
+        self._details = details
+        self._details_factory = kwargs.pop("details_factory", None)
+        self._rssi = kwargs.pop("rssi", _NOT_SET)
+        self._uuids = tuple(kwargs.pop("uuids", ()))
+        self._manufacturer_data = kwargs.pop("manufacturer_data", {})
+        self._metadata = kwargs or None
+
+    @property
+    def address(self) -> str:
+        """The address of the device"""
+        return self._address
+
+    @address.setter
+    def address(self, address):
+        if isinstance(address, int):
+            address = _int_to_address(address)
+        self._address = address
+
+    @property
+    def address_int(self):
+        """The address as a 48-bit integer, or ``None`` if it is not a MAC address,
+        e.g. a macOS device UUID"""
+        address = self._address
+        if not isinstance(address, str) or len(address) != 17 or address[2] != ":":
+            return None
+        try:
+            return int(address.replace(":", ""), 16)
+        except ValueError:
+            return None
+
+    @property
+    def uuids(self) -> tuple:
+        """The advertised service UUIDs"""
+        return self._uuids
+
+    @uuids.setter
+    def uuids(self, uuids):
+        self._uuids = tuple(uuids)
+        if self._metadata is not None and "uuids" in self._metadata:
+            self._metadata["uuids"] = list(self._uuids)
+
+    @property
+    def manufacturer_data(self) -> dict:
+        """Company identifier to manufacturer data"""
+        return self._manufacturer_data
+
+    @manufacturer_data.setter
+    def manufacturer_data(self, manufacturer_data):
+        self._manufacturer_data = manufacturer_data
+        if self._metadata is not None and "uuids" in self._metadata:
+            self._metadata["manufacturer_data"] = manufacturer_data
+
+    @property
+    def details(self):
+        """The backend specific details, see above"""
+        if self._details_factory is not None:
+            self._details = self._details_factory()
+            self._details_factory = None
+        return self._details
+
+    @details.setter
+    def details(self, details):
+        self._details, self._details_factory = details, None
+
+    @property
+    def metadata(self) -> dict:
+        """A dict with the keys ``uuids`` and ``manufacturer_data``, and any other
+        keyword arguments the device was created with.
+
+        Built from the fields when first read and kept, so that changes made to
+        it are kept too. Setting :py:attr:`uuids` or :py:attr:`manufacturer_data`
+        replaces their entry.
+        """
+        metadata = self._metadata
+        if metadata is None or "uuids" not in metadata:
+            extra = metadata
+            metadata = self._metadata = {
+                "uuids": list(self.uuids),
+                "manufacturer_data": self.manufacturer_data,
+            }
+            if extra:
+                metadata.update(extra)
+        return metadata
 
     @property
     def rssi(self):
         """Get the signal strength in dBm"""
-        if isinstance(self.details, dict) and "props" in self.details:
-            rssi = self.details["props"].get("RSSI", 0)  # Should not be set to 0...
-        elif hasattr(self.details, "RawSignalStrengthInDBm"):
-            rssi = self.details.RawSignalStrengthInDBm
-        elif hasattr(self.details, "Properties"):
-            rssi = {p.Key: p.Value for p in self.details.Properties}[
+        if self._rssi is _NOT_SET:
+            self._rssi = self._rssi_from_details()
+        return self._rssi
+
+    @rssi.setter
+    def rssi(self, rssi):
+        self._rssi = rssi
+
+    def _rssi_from_details(self):
+        details = self.details
+        if isinstance(details, dict) and "props" in details:
+            rssi = details["props"].get("RSSI", 0)  # Should not be set to 0...
+        elif hasattr(details, "RawSignalStrengthInDBm"):
+            rssi = details.RawSignalStrengthInDBm
+        elif hasattr(details, "Properties"):
+            rssi = {p.Key: p.Value for p in details.Properties}[
                 "System.Devices.Aep.SignalStrength"
             ]
         else:
@@ -45,14 +200,17 @@ class BLEDevice(object):
         return int(rssi) if rssi is not None else None
 
     def __str__(self):
-        if self.name == "Unknown":
-            if "manufacturer_data" in self.metadata:
-                ks = list(self.metadata["manufacturer_data"].keys())
-                if len(ks):
-                    mf = MANUFACTURERS.get(ks[0], MANUFACTURERS.get(0xFFFF))
-                    value = self.metadata["manufacturer_data"].get(
-                        ks[0], MANUFACTURERS.get(0xFFFF)
-                    )
-                    # TODO: Evaluate how to interpret the value of the company identifier...
-                    return "{0}: {1} ({2})".format(self.address, mf, value)
+        if self.name == "Unknown" and self.manufacturer_data:
+            company_id = next(iter(self.manufacturer_data))
+            # TODO: Evaluate how to interpret the value of the company identifier...
+            return "{0}: {1} ({2})".format(
+                self.address,
+                manufacturer_name(company_id),
+                self.manufacturer_data[company_id],
+            )
         return "{0}: {1}".format(self.address, self.name)
+
+
+if sys.version_info < (3, 7):
+    # Module level ``__getattr__`` is not supported, load the table eagerly.
+    __getattr__("MANUFACTURERS")
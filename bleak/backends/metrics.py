@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""
+Latency histograms and error counters of client operations.
+
+Recording is off by default and costs an attribute check per operation. Turn it
+on with :py:meth:`bleak.backends.client.BaseBleakClient.enable_metrics`.
+
+"""
+import asyncio
+import math
+import time
+from functools import wraps
+
+# Bucket bounds of the Prometheus export, in seconds.
+PROMETHEUS_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class LatencyHistogram(object):
+    """A histogram of durations with buckets of bounded relative width.
+
+    Like an HDR histogram, durations are counted in microseconds in buckets
+    that are linear up to ``2 ** precision`` microseconds and log-linear above,
+    so that every bucket is less than ``2 ** (1 - precision)`` of its lower
+    bound wide. Only buckets that have been hit are kept.
+
+    Args:
+        precision (int): The number of significant bits kept. Defaults to 7,
+            for buckets below 1.6 % wide.
+
+    """
+
+    __slots__ = ("precision", "count", "sum", "min", "max", "_half", "_buckets")
+
+    def __init__(self, precision: int = 7):
+        self.precision = precision
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._half = 1 << (precision - 1)
+        self._buckets = {}
+
+    def record(self, seconds: float) -> None:
+        """Count a duration."""
+        self.count += 1
+        self.sum += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+        index = self._index(max(0, int(seconds * 1e6)))
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """The duration ``q`` percent of the counted durations are at most, in seconds.
+
+        The upper bound of the bucket the percentile falls in, so at most one
+        bucket width above the exact value, or ``None`` if nothing was counted.
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(self.count * q / 100.0)))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self._upper(index) / 1e6, self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds) -> list:
+        """The number of durations in buckets at most ``bound`` seconds, for each of ``bounds``."""
+        counts = []
+        items = sorted(self._buckets.items())
+        i = 0
+        seen = 0
+        for bound in bounds:
+            while i < len(items) and self._upper(items[i][0]) <= bound * 1e6:
+                seen += items[i][1]
+                i += 1
+            counts.append(seen)
+        return counts
+
+    def as_dict(self) -> dict:
+        """Count, sum, min, max, mean and percentiles, in seconds."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+
+    def _index(self, us: int) -> int:
+        shift = us.bit_length() - self.precision
+        if shift <= 0:
+            return us
+        return shift * self._half + (us >> shift)
+
+    def _upper(self, index: int) -> int:
+        """The largest duration in microseconds counted in the bucket ``index``."""
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        return ((index - shift * self._half + 1) << shift) - 1
+
+
+class _Span(object):
+    __slots__ = ("_metrics", "_operation", "_target", "_start")
+
+    def __init__(self, metrics, operation, target):
+        self._metrics = metrics
+        self._operation = operation
+        self._target = target
+
+    def __enter__(self):
+        self._start = self._metrics.clock()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self._metrics.record(
+                self._operation, self._metrics.clock() - self._start, self._target
+            )
+        elif not issubclass(exc_type, asyncio.CancelledError):
+            self._metrics.error(self._operation, self._target)
+        return False
+
+
+class _NullSpan(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class ClientMetrics(object):
+    """Latency histograms and error counters of the operations of a client.
+
+    Durations are kept per operation, e.g. ``"read_gatt_char"``, and per
+    operation and target, the characteristic UUID or descriptor handle the
+    operation was on. Operations that raise are counted as errors instead. The
+    time between notifications of a characteristic is kept as the
+    ``"notification_interval"`` operation.
+
+    An instance can be shared by several clients, to aggregate their metrics.
+
+    Args:
+        labels (dict): Labels added to every metric of the Prometheus export,
+            e.g. ``{"address": "24:71:89:CC:09:05"}``.
+        precision (int): See :py:class:`LatencyHistogram`.
+
+    """
+
+    def __init__(self, labels: dict = None, precision: int = 7):
+        self.labels = dict(labels or {})
+        self.precision = precision
+        self.clock = time.perf_counter
+        self._histograms = {}
+        self._errors = {}
+        self._last_arrival = {}
+
+    def span(self, operation: str, target=None) -> _Span:
+        """Context manager timing an operation, or counting an error if it raises."""
+        return _Span(self, operation, target)
+
+    def record(self, operation: str, seconds: float, target=None) -> None:
+        """Count a duration of ``operation``."""
+        self._histogram(operation, None).record(seconds)
+        if target is not None:
+            self._histogram(operation, target).record(seconds)
+
+    def error(self, operation: str, target=None) -> None:
+        """Count a failure of ``operation``."""
+        for key in ((operation, None), (operation, target)):
+            self._errors[key] = self._errors.get(key, 0) + 1
+            if target is None:
+                break
+
+    def arrival(self, target: str) -> None:
+        """Record the arrival of a notification of ``target``."""
+        now = self.clock()
+        last = self._last_arrival.get(target)
+        self._last_arrival[target] = now
+        if last is not None:
+            self.record("notification_interval", now - last, target)
+
+    def histogram(self, operation: str, target=None) -> LatencyHistogram:
+        """The histogram of an operation, of all targets if ``target`` is ``None``, or ``None``."""
+        return self._histograms.get((operation, target))
+
+    def errors(self, operation: str, target=None) -> int:
+        """The number of failures of an operation."""
+        return self._errors.get((operation, target), 0)
+
+    def reset(self) -> None:
+        """Forget everything recorded."""
+        self._histograms.clear()
+        self._errors.clear()
+        self._last_arrival.clear()
+
+    def as_dict(self) -> dict:
+        """The metrics as a dict.
+
+        Returns:
+            Dict of operation to a dict with the statistics of
+            :py:meth:`LatencyHistogram.as_dict`, the number of ``errors``, and
+            the same for each target under ``targets``.
+
+        """
+        result = {}
+        for key in sorted(set(self._histograms) | set(self._errors), key=_sort_key):
+            operation, target = key
+            histogram = self._histograms.get(key) or LatencyHistogram(self.precision)
+            stats = histogram.as_dict()
+            stats["errors"] = self._errors.get(key, 0)
+            entry = result.setdefault(operation, {"targets": {}})
+            if target is None:
+                entry.update(stats)
+            else:
+                entry["targets"][str(target)] = stats
+        return result
+
+    def prometheus(self, prefix: str = "bleak") -> str:
+        """The metrics in the Prometheus text exposition format.
+
+        Durations are exported as the ``<prefix>_operation_seconds`` histogram
+        and errors as the ``<prefix>_operation_errors_total`` counter, with
+        ``operation`` and ``target`` labels. Only the per target metrics are
+        exported, plus the totals of operations without targets, so that
+        summing over the labels gives the totals.
+
+        """
+        # Totals are only exported for operations that have no per target metrics.
+        targeted = set(
+            op for op, t in list(self._histograms) + list(self._errors) if t is not None
+        )
+        name = prefix + "_operation_seconds"
+        lines = [
+            "# HELP {0} Duration of client operations.".format(name),
+            "# TYPE {0} histogram".format(name),
+        ]
+        for key in sorted(self._histograms, key=_sort_key):
+            if key[1] is None and key[0] in targeted:
+                continue
+            labels = self._labels(key)
+            histogram = self._histograms[key]
+            counts = histogram.cumulative_counts(PROMETHEUS_BUCKETS)
+            for bound, count in zip(PROMETHEUS_BUCKETS, counts):
+                lines.append(
+                    '{0}_bucket{{{1},le="{2}"}} {3}'.format(name, labels, bound, count)
+                )
+            lines.append(
+                '{0}_bucket{{{1},le="+Inf"}} {2}'.format(name, labels, histogram.count)
+            )
+            lines.append("{0}_sum{{{1}}} {2!r}".format(name, labels, histogram.sum))
+            lines.append("{0}_count{{{1}}} {2}".format(name, labels, histogram.count))
+
+        name = prefix + "_operation_errors_total"
+        lines.append("# HELP {0} Failed client operations.".format(name))
+        lines.append("# TYPE {0} counter".format(name))
+        for key in sorted(self._errors, key=_sort_key):
+            if key[1] is not None or key[0] not in targeted:
+                lines.append(
+                    "{0}{{{1}}} {2}".format(name, self._labels(key), self._errors[key])
+                )
+        return "\n".join(lines) + "\n"
+
+    # Internal methods
+
+    def _histogram(self, operation, target) -> LatencyHistogram:
+        key = (operation, target)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram(self.precision)
+        return histogram
+
+    def _labels(self, key) -> str:
+        operation, target = key
+        labels = dict(self.labels)
+        labels["operation"] = operation
+        labels["target"] = "" if target is None else str(target)
+        return ",".join(
+            '{0}="{1}"'.format(k, _escape(str(v))) for k, v in sorted(labels.items())
+        )
+
+
+def _sort_key(key):
+    operation, target = key
+    return operation, "" if target is None else str(target)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def characteristic_target(client, char_specifier=None, *args, **kwargs):
+    """The UUID of the characteristic a client method is called on, for :py:func:`instrumented`."""
+    if char_specifier is None:
+        char_specifier = kwargs.get("char_specifier")
+    target = getattr(char_specifier, "uuid", None)
+    if target is None:
+        characteristic = client.services.get_characteristic(char_specifier)
+        target = characteristic.uuid if characteristic else str(char_specifier)
+    return target
+
+
+def handle_target(client, handle=None, *args, **kwargs):
+    """The descriptor handle a client method is called on, for :py:func:`instrumented`."""
+    return handle if handle is not None else kwargs.get("handle")
+
+
+def instrumented(operation: str, target=None):
+    """Decorator timing a coroutine method of a client as ``operation``.
+
+    Nothing is recorded unless the client's metrics are enabled.
+
+    Args:
+        operation (str): The name of the operation.
+        target: Function of the client and the arguments of the method
+            returning the target of the operation, e.g. the UUID of the
+            characteristic. Only called when metrics are enabled.
+
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            metrics = self._metrics
+            if metrics is None:
+                return await func(self, *args, **kwargs)
+            with metrics.span(
+                operation, target(self, *args, **kwargs) if target else None
+            ):
+                return await func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+Batched and streamed delivery of notifications, shared by the backends.
+
+"""
+import asyncio
+import collections
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationBatcher(object):
+    """Collects notifications in a ring buffer and delivers them in batches.
+
+    Every notification is stored as a ``(timestamp, payload)`` record, with the
+    timestamp taken from the event loop clock on arrival. The records are handed
+    to the callback as a list, from the event loop rather than from the handler
+    of the notification, when ``size`` records are waiting or the oldest has
+    waited ``interval`` seconds.
+
+    The callback may be a coroutine function. Until it has finished, records are
+    kept in the buffer. When it is full, the oldest record is dropped.
+
+    Args:
+        loop (asyncio.events.AbstractEventLoop): The event loop to use.
+        sender (str): Passed as the first argument of ``callback``.
+        callback: Function accepting the sender and a list of records.
+        size (int): The number of records that triggers a flush.
+        interval (float): The time in seconds after which a record is flushed
+            even if fewer than ``size`` are waiting. Defaults to 0.1.
+        capacity (int): The size of the ring buffer. Defaults to ``4 * size``.
+
+    """
+
+    def __init__(self, loop, sender, callback, size, interval=0.1, capacity=None):
+        self.loop = loop
+        self.sender = sender
+        self.callback = callback
+        self.size = max(1, size)
+        self.interval = interval
+        self.capacity = max(capacity or 4 * self.size, self.size)
+
+        self._records = [None] * self.capacity
+        self._head = 0
+        self._depth = 0
+        self._scheduled = None
+        self._running = None
+        self._closed = False
+
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """The number of records waiting to be delivered"""
+        return self._depth
+
+    def stats(self) -> dict:
+        """Counters of this subscription.
+
+        Returns:
+            Dict with the number of notifications ``received``, ``delivered`` and
+            ``dropped``, the number of ``flushes``, and the current and highest
+            queue ``depth`` and ``max_depth``.
+
+        """
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "depth": self._depth,
+            "max_depth": self.max_depth,
+        }
+
+    def append(self, payload) -> None:
+        """Add a notification. Called from the backend's notification handler."""
+        if self._closed:
+            return
+        if self._depth == self.capacity:
+            self._records[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+            self._depth -= 1
+            self.dropped += 1
+        self._records[(self._head + self._depth) % self.capacity] = (
+            self.loop.time(),
+            payload,
+        )
+        self._depth += 1
+        self.received += 1
+        if self._depth > self.max_depth:
+            self.max_depth = self._depth
+        self._schedule()
+
+    def close(self) -> None:
+        """Stop collecting and deliver the records still waiting."""
+        self._closed = True
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        if self._running is None and self._depth:
+            self._flush()
+
+    def _schedule(self) -> None:
+        if self._running is not None or self._closed:
+            # Rescheduled when the callback is done.
+            return
+        if self._depth >= self.size:
+            if isinstance(self._scheduled, asyncio.TimerHandle):
+                self._scheduled.cancel()
+                self._scheduled = None
+            if self._scheduled is None:
+                self._scheduled = self.loop.call_soon(self._flush)
+        elif self._depth and self._scheduled is None:
+            self._scheduled = self.loop.call_at(
+                self._records[self._head][0] + self.interval, self._flush
+            )
+
+    def _flush(self) -> None:
+        self._scheduled = None
+        if not self._depth:
+            return
+
+        records = []
+        for _ in range(self._depth):
+            records.append(self._records[self._head])
+            self._records[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+        self._depth = 0
+        self.delivered += len(records)
+        self.flushes += 1
+
+        try:
+            result = self.callback(self.sender, records)
+        except Exception:
+            logger.exception(
+                "Notification callback for {0} failed.".format(self.sender)
+            )
+            return
+        if asyncio.iscoroutine(result):
+            self._running = asyncio.ensure_future(result, loop=self.loop)
+            self._running.add_done_callback(self._on_callback_done)
+
+    def _on_callback_done(self, future) -> None:
+        self._running = None
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(
+                "Notification callback for {0} failed: {1}".format(
+                    self.sender, future.exception()
+                )
+            )
+        if self._closed:
+            self._flush()
+        else:
+            self._schedule()
+
+
+class NotificationStream(object):
+    """Notifications on a characteristic as an async iterator over a bounded queue.
+
+    Use :py:meth:`bleak.backends.client.BaseBleakClient.notifications` to create
+    one. Notifications are started when iteration starts, or on entering it as
+    an async context manager, and stopped by :py:meth:`aclose`.
+
+    .. code-block:: python
+
+        async with client.notifications(char_uuid, maxsize=32) as stream:
+            async for data in stream:
+                print(data)
+
+    When the queue is full, the ``overflow`` policy decides what happens with
+    the next notification:
+
+    - ``"drop-oldest"``: the oldest queued notification is dropped.
+    - ``"drop-newest"``: the new notification is dropped.
+    - ``"block"``: notifications are stopped until the consumer has emptied
+      half of the queue, so that the peripheral holds back its data.
+
+    Args:
+        client (BaseBleakClient): The connected client.
+        char_specifier (BleakGATTCharacteristic, int, str or UUID): The characteristic.
+        maxsize (int): The size of the queue. Defaults to 64.
+        overflow (str): ``"drop-oldest"``, ``"drop-newest"`` or ``"block"``.
+            Defaults to ``"drop-oldest"``.
+
+    Keyword Args:
+        Passed on to ``start_notify``.
+
+    """
+
+    DROP_OLDEST = "drop-oldest"
+    DROP_NEWEST = "drop-newest"
+    BLOCK = "block"
+
+    def __init__(
+        self, client, char_specifier, maxsize=64, overflow=DROP_OLDEST, **kwargs
+    ):
+        if overflow not in (self.DROP_OLDEST, self.DROP_NEWEST, self.BLOCK):
+            raise ValueError("Unknown overflow policy {0!r}".format(overflow))
+        self.client = client
+        self.char_specifier = char_specifier
+        self.maxsize = max(1, maxsize)
+        self.overflow = overflow
+        self.dropped = 0
+        self.pauses = 0
+
+        self._kwargs = kwargs
+        self._queue = collections.deque()
+        self._waiter = None
+        self._started = False
+        self._paused = False
+        self._pausing = None
+        self._closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._started:
+            await self.start()
+        while not self._queue:
+            if self._closed:
+                raise StopAsyncIteration
+            self._waiter = self.client.loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+        data = self._queue.popleft()
+        if self._paused and len(self._queue) <= self.maxsize // 2:
+            await self._resume()
+        return data
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    @property
+    def qsize(self) -> int:
+        """The number of notifications waiting to be consumed"""
+        return len(self._queue)
+
+    async def start(self) -> None:
+        """Start notifications. Called on the first iteration, if not before."""
+        if self._started or self._closed:
+            return
+        await self.client.start_notify(
+            self.char_specifier, self._on_notification, **self._kwargs
+        )
+        self._started = True
+        if self._closed:
+            # Closed while starting, after aclose had nothing to stop.
+            await self.client.stop_notify(self.char_specifier)
+
+    async def aclose(self) -> None:
+        """Stop notifications and end the iteration once the queue is empty."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+        if self._pausing is not None:
+            await self._pausing
+        if self._started and not self._paused:
+            await self.client.stop_notify(self.char_specifier)
+
+    def _on_notification(self, sender, data) -> None:
+        if isinstance(data, memoryview):
+            # Acquired notifications are views of a buffer that is reused.
+            data = bytearray(data)
+
+        if len(self._queue) >= self.maxsize:
+            if self.overflow == self.DROP_NEWEST:
+                self.dropped += 1
+                return
+            if self.overflow == self.DROP_OLDEST:
+                self._queue.popleft()
+                self.dropped += 1
+            elif not self._paused and not self._closed:
+                # Notifications already on their way are still queued.
+                self._paused = True
+                self.pauses += 1
+                self._pausing = asyncio.ensure_future(
+                    self.client.stop_notify(self.char_specifier), loop=self.client.loop
+                )
+
+        self._queue.append(data)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def _resume(self) -> None:
+        pausing, self._pausing = self._pausing, None
+        if pausing is not None:
+            await pausing
+        if self._closed:
+            return
+        await self.client.start_notify(
+            self.char_specifier, self._on_notification, **self._kwargs
+        )
+        self._paused = False
+        if self._closed:
+            # Closed while resuming, after aclose had nothing to stop.
+            await self.client.stop_notify(self.char_specifier)
@@ -1,11 +1,129 @@
 import abc
 import asyncio
+import collections
 from asyncio import AbstractEventLoop
 from typing import Callable, List
 
 from bleak.backends.device import BLEDevice
 
 
+class AdvertisementData(object):
+    """The advertised data of a device, as passed to advertisement callbacks.
+
+    Args:
+        address (str): The address of the device.
+        local_name (str): The advertised name, or ``None``.
+        rssi (int): The signal strength in dBm, or ``None``.
+        manufacturer_data (dict): Company identifier to ``bytes``.
+        service_data (dict): Service UUID to ``bytes``.
+        uuids (tuple): The advertised service UUIDs.
+        tx_power (int): The advertised transmit power in dBm, or ``None``.
+
+    """
+
+    __slots__ = (
+        "address",
+        "local_name",
+        "rssi",
+        "manufacturer_data",
+        "service_data",
+        "uuids",
+        "tx_power",
+    )
+
+    def __init__(
+        self,
+        address,
+        local_name=None,
+        rssi=None,
+        manufacturer_data=None,
+        service_data=None,
+        uuids=(),
+        tx_power=None,
+    ):
+        self.address = address
+        self.local_name = local_name
+        self.rssi = rssi
+        self.manufacturer_data = manufacturer_data or {}
+        self.service_data = service_data or {}
+        self.uuids = tuple(uuids)
+        self.tx_power = tx_power
+
+    def __repr__(self):
+        return "AdvertisementData({0})".format(
+            ", ".join(
+                "{0}={1!r}".format(name, getattr(self, name)) for name in self.__slots__
+            )
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, AdvertisementData):
+            return NotImplemented
+        return self.rssi == other.rssi and self.same_content(other)
+
+    def same_content(self, other: "AdvertisementData") -> bool:
+        """If ``other`` advertises the same data, not taking the RSSI into account."""
+        return (
+            self.address == other.address
+            and self.local_name == other.local_name
+            and self.tx_power == other.tx_power
+            and self.uuids == other.uuids
+            and self.manufacturer_data == other.manufacturer_data
+            and self.service_data == other.service_data
+        )
+
+
+class AdvertisementTracker(object):
+    """Decides which advertisements are worth passing on, per device.
+
+    An advertisement is passed on if it is the first from its device, if its
+    content differs from the last one passed on, or if its RSSI has moved by at
+    least ``rssi_hysteresis`` dB from it. Repeated advertisements with
+    jittering RSSI are dropped.
+
+    At most ``max_size`` devices are tracked. When there are more, the least
+    recently seen device is forgotten, as by :py:meth:`forget`.
+
+    Args:
+        rssi_hysteresis (int): The RSSI change in dB that is reported. Defaults to 5.
+        max_size (int): The number of devices tracked. Defaults to 1024.
+
+    """
+
+    def __init__(self, rssi_hysteresis: int = 5, max_size: int = 1024):
+        self.rssi_hysteresis = rssi_hysteresis
+        self.max_size = max_size
+        self.seen = 0
+        self.passed = 0
+        self._last = collections.OrderedDict()
+
+    def update(self, data: AdvertisementData) -> bool:
+        """Track an advertisement.
+
+        Returns:
+            ``True`` if it should be passed on.
+
+        """
+        self.seen += 1
+        last = self._last.get(data.address)
+        if last is not None:
+            self._last.move_to_end(data.address)
+            if last.same_content(data):
+                if data.rssi is None or last.rssi is None:
+                    return False
+                if abs(data.rssi - last.rssi) < self.rssi_hysteresis:
+                    return False
+        self._last[data.address] = data
+        while len(self._last) > self.max_size:
+            self._last.popitem(last=False)
+        self.passed += 1
+        return True
+
+    def forget(self, address: str) -> None:
+        """Forget the device, so that its next advertisement is passed on."""
+        self._last.pop(address, None)
+
+
 class BaseBleakScanner(abc.ABC):
     """Interface for Bleak Bluetooth LE Scanners.
 
@@ -37,6 +155,24 @@ class BaseBleakScanner(abc.ABC):
     def register_detection_callback(self, callback: Callable):
         raise NotImplementedError()
 
+    def register_advertisement_callback(
+        self,
+        callback: Callable[[AdvertisementData], None],
+        rssi_hysteresis: int = 5,
+    ) -> None:
+        """Set a function to be called with the advertisements of scanned devices.
+
+        The function gets an :py:class:`AdvertisementData` when a device is
+        first seen and when what it advertises changes, including RSSI changes
+        of at least ``rssi_hysteresis`` dB, but not for every advertisement.
+
+        Args:
+            callback: Function accepting an :py:class:`AdvertisementData`, or ``None`` to unset.
+            rssi_hysteresis (int): The RSSI change in dB that is reported. Defaults to 5.
+
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     async def start(self):
         raise NotImplementedError()
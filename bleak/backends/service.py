@@ -11,7 +11,7 @@ from uuid import UUID
 from typing import List, Union, Iterator
 
 from bleak import BleakError
-from bleak.uuids import uuidstr_to_str
+from bleak.uuids import uuidstr_to_str, normalize_uuid_str
 from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.descriptor import BleakGATTDescriptor
 
@@ -59,12 +59,19 @@ class BleakGATTService(abc.ABC):
 
 
 class BleakGATTServiceCollection(object):
-    """Simple data container for storing the peripheral's service complement."""
+    """Simple data container for storing the peripheral's service complement.
+
+    Services and characteristics that have a ``path`` attribute, i.e. the D-Bus
+    object path in the BlueZ backend, are also indexed by it.
+    """
 
     def __init__(self):
         self.__services = {}
         self.__characteristics = {}
         self.__descriptors = {}
+        self.__service_paths = {}
+        self.__characteristic_paths = {}
+        self.__characteristic_uuids = {}
 
     def __getitem__(
         self, item: Union[str, int, uuid.UUID]
@@ -100,6 +107,9 @@ class BleakGATTServiceCollection(object):
         """
         if service.uuid not in self.__services:
             self.__services[service.uuid] = service
+            path = getattr(service, "path", None)
+            if path is not None:
+                self.__service_paths[path] = service
         else:
             raise BleakError(
                 "This service is already present in this BleakGATTServiceCollection!"
@@ -109,6 +119,10 @@ class BleakGATTServiceCollection(object):
         """Get a service by UUID string"""
         return self.services.get(str(_uuid), None)
 
+    def get_service_by_path(self, path: str) -> BleakGATTService:
+        """Get a service by its backend object path"""
+        return self.__service_paths.get(path, None)
+
     def add_characteristic(self, characteristic: BleakGATTCharacteristic):
         """Add a :py:class:`~BleakGATTCharacteristic` to the service collection.
 
@@ -119,6 +133,12 @@ class BleakGATTServiceCollection(object):
             self.__services[characteristic.service_uuid].add_characteristic(
                 characteristic
             )
+            path = getattr(characteristic, "path", None)
+            if path is not None:
+                self.__characteristic_paths[path] = characteristic
+            self.__characteristic_uuids.setdefault(
+                normalize_uuid_str(characteristic.uuid), []
+            ).append(characteristic)
         else:
             raise BleakError(
                 "This characteristic is already present in this BleakGATTServiceCollection!"
@@ -127,16 +147,15 @@ class BleakGATTServiceCollection(object):
     def get_characteristic(
         self, specifier: Union[int, str, UUID]
     ) -> BleakGATTCharacteristic:
-        """Get a characteristic by handle (int) or UUID (str or uuid.UUID)"""
+        """Get a characteristic by handle (int) or UUID (str or uuid.UUID)
+
+        UUID strings may be given in 16-bit or 32-bit short form, e.g. ``"2a37"``.
+        """
         if isinstance(specifier, int):
             return self.characteristics.get(specifier, None)
         else:
             # Assume uuid usage.
-            x = list(
-                filter(
-                    lambda x: x.uuid == str(specifier), self.characteristics.values()
-                )
-            )
+            x = self.__characteristic_uuids.get(normalize_uuid_str(specifier), ())
             if len(x) > 1:
                 raise BleakError(
                     "Multiple Characteristics with this UUID, refer to your desired characteristic by the `handle` attribute instead."
@@ -144,6 +163,10 @@ class BleakGATTServiceCollection(object):
             else:
                 return x[0] if x else None
 
+    def get_characteristic_by_path(self, path: str) -> BleakGATTCharacteristic:
+        """Get a characteristic by its backend object path"""
+        return self.__characteristic_paths.get(path, None)
+
     def add_descriptor(self, descriptor: BleakGATTDescriptor):
         """Add a :py:class:`~BleakGATTDescriptor` to the service collection.
 
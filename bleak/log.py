@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Logging for hot paths, like signal handlers that run for every advertisement
+or notification.
+
+Loggers from :py:func:`get_logger` take %-style arguments and only format the
+message if the level is enabled. Call sites whose arguments are expensive to
+compute guard them with :py:meth:`HotPathLogger.isEnabledFor`.
+
+For profiling without the cost of ``logging``, :py:func:`enable_trace` makes
+the DEBUG and INFO records of these loggers go into a ring buffer as
+``(timestamp, logger name, level, message, args)`` tuples, unformatted. Records
+of level WARNING and above are recorded and still logged as usual.
+
+.. code-block:: python
+
+    import bleak.log
+
+    bleak.log.enable_trace(capacity=10000)
+    ...
+    for timestamp, name, level, msg, args in bleak.log.get_trace():
+        print(timestamp, name, msg % args)
+
+"""
+import collections
+import logging
+import sys
+import time
+
+_trace = None
+
+# Make records point at the caller of the HotPathLogger method, not at this module.
+if sys.version_info >= (3, 8):
+    _stacklevel = {"stacklevel": 3}
+    _exception_stacklevel = {"stacklevel": 2}
+else:
+    _stacklevel = _exception_stacklevel = {}
+
+
+def enable_trace(capacity: int = 10000) -> None:
+    """Record DEBUG and INFO records of all hot path loggers in a ring buffer.
+
+    Args:
+        capacity (int): The number of records kept. Older ones are discarded.
+
+    """
+    global _trace
+    _trace = collections.deque(maxlen=capacity)
+
+
+def disable_trace() -> list:
+    """Stop recording and go back to logging.
+
+    Returns:
+        The records in the ring buffer, see :py:func:`get_trace`.
+
+    """
+    global _trace
+    records, _trace = get_trace(), None
+    return records
+
+
+def get_trace() -> list:
+    """Get the records in the ring buffer, oldest first.
+
+    Returns:
+        List of ``(timestamp, logger name, level, message, args)`` tuples, or an
+        empty list if tracing is not enabled.
+
+    """
+    return list(_trace) if _trace is not None else []
+
+
+class HotPathLogger(object):
+    """A wrapper of a :py:class:`logging.Logger` for hot paths.
+
+    Args:
+        logger (logging.Logger): The logger to wrap.
+
+    """
+
+    __slots__ = ("logger", "name")
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.name = logger.name
+
+    def isEnabledFor(self, level: int) -> bool:
+        """If a record of ``level`` would be logged or traced."""
+        return _trace is not None or self.logger.isEnabledFor(level)
+
+    def debug(self, msg, *args) -> None:
+        self._log(logging.DEBUG, msg, args)
+
+    def info(self, msg, *args) -> None:
+        self._log(logging.INFO, msg, args)
+
+    def warning(self, msg, *args) -> None:
+        self._log(logging.WARNING, msg, args)
+
+    def error(self, msg, *args) -> None:
+        self._log(logging.ERROR, msg, args)
+
+    def exception(self, msg, *args) -> None:
+        if _trace is not None:
+            _trace.append((time.time(), self.name, logging.ERROR, msg, args))
+        self.logger.exception(msg, *args, **_exception_stacklevel)
+
+    def _log(self, level, msg, args) -> None:
+        if _trace is not None:
+            _trace.append((time.time(), self.name, level, msg, args))
+            if level < logging.WARNING:
+                return
+        if self.logger.isEnabledFor(level):
+            self.logger._log(level, msg, args, **_stacklevel)
+
+
+def get_logger(name: str) -> HotPathLogger:
+    """Get a :py:class:`HotPathLogger` wrapping ``logging.getLogger(name)``."""
+    return HotPathLogger(logging.getLogger(name))
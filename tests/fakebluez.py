@@ -0,0 +1,677 @@
+# -*- coding: utf-8 -*-
+"""
+A simulated BlueZ, exported as ``org.bluez`` on a private ``dbus-daemon``.
+
+Unlike :py:mod:`benchmarks.fakebus`, which stands in for the txdbus connection,
+this goes through a real D-Bus daemon, so the BlueZ backend runs unmodified:
+messages are marshalled, routed by ``dbus-daemon`` and matched against the
+backend's match rules as they would be with BlueZ. It needs the
+``dbus-daemon`` executable, but no Bluetooth hardware, BlueZ or system bus.
+
+.. code-block:: python
+
+    async with FakeBlueZServer(loop, latency=0.001, notify_rate=100) as server:
+        server.add_device("00:11:22:33:44:55", n_services=2, n_chars=4)
+        async with BleakClient("00:11:22:33:44:55", loop=loop) as client:
+            ...
+
+While the server runs inside ``async with``, ``DBUS_SYSTEM_BUS_ADDRESS`` points
+at the private daemon, which is where the BlueZ backend connects to. The
+server's objects are served on the same event loop as the backend.
+
+Adapters implement ``StartDiscovery``, ``StopDiscovery``,
+``SetDiscoveryFilter`` and ``RemoveDevice``. While discovering, they send
+``RSSI`` updates of the devices that are not connected every
+``advertising_interval`` seconds. Devices implement ``Connect`` and
+``Disconnect``, with ``ServicesResolved`` set ``resolve_delay`` seconds after
+connecting. Characteristics implement ``ReadValue``, ``WriteValue``,
+``StartNotify`` and ``StopNotify``, sending notifications at ``notify_rate``
+per second while notifying. ``AcquireWrite`` and ``AcquireNotify`` fail with
+``org.bluez.Error.NotSupported``, as they do with BlueZ before 5.46. Every
+method reply is delayed by ``latency`` seconds, plus or minus up to
+``jitter``.
+
+"""
+import asyncio
+import collections
+import os
+import random
+import shutil
+import struct
+import subprocess
+import tempfile
+
+from txdbus import message, marshal
+from txdbus.interface import DBusInterface, Method, Signal
+from txdbus.objects import DBusObject
+
+from bleak.backends.bluezdbus import defs, get_reactor
+
+_CONFIG = """<!DOCTYPE busconfig PUBLIC "-//freedesktop//DTD D-Bus Bus Configuration 1.0//EN"
+ "http://www.freedesktop.org/standards/dbus/1.0/busconfig.dtd">
+<busconfig>
+  <type>session</type>
+  <listen>unix:dir={0}</listen>
+  <auth>EXTERNAL</auth>
+  <policy context="default">
+    <allow send_destination="*" eavesdrop="true"/>
+    <allow eavesdrop="true"/>
+    <allow own="*"/>
+  </policy>
+</busconfig>
+"""
+
+_PROPERTIES = DBusInterface(
+    defs.PROPERTIES_INTERFACE,
+    Method("Get", "ss", "v"),
+    Method("Set", "ssv"),
+    Method("GetAll", "s", "a{sv}"),
+    Signal("PropertiesChanged", "sa{sv}as"),
+)
+
+_INTERFACES = {
+    defs.ADAPTER_INTERFACE: DBusInterface(
+        defs.ADAPTER_INTERFACE,
+        Method("StartDiscovery"),
+        Method("StopDiscovery"),
+        Method("SetDiscoveryFilter", "a{sv}"),
+        Method("RemoveDevice", "o"),
+    ),
+    defs.DEVICE_INTERFACE: DBusInterface(
+        defs.DEVICE_INTERFACE, Method("Connect"), Method("Disconnect")
+    ),
+    defs.GATT_SERVICE_INTERFACE: DBusInterface(defs.GATT_SERVICE_INTERFACE),
+    defs.GATT_CHARACTERISTIC_INTERFACE: DBusInterface(
+        defs.GATT_CHARACTERISTIC_INTERFACE,
+        Method("ReadValue", "a{sv}", "ay"),
+        Method("WriteValue", "aya{sv}"),
+        Method("StartNotify"),
+        Method("StopNotify"),
+        Method("AcquireWrite", "a{sv}", "hq"),
+        Method("AcquireNotify", "a{sv}", "hq"),
+    ),
+    defs.GATT_DESCRIPTOR_INTERFACE: DBusInterface(
+        defs.GATT_DESCRIPTOR_INTERFACE,
+        Method("ReadValue", "a{sv}", "ay"),
+        Method("WriteValue", "aya{sv}"),
+    ),
+}
+
+# The D-Bus types of the properties, for the ones txdbus cannot guess, like
+# empty arrays and 16-bit integers.
+_SIGNATURES = {
+    "Adapter": "o",
+    "Characteristic": "o",
+    "Class": "u",
+    "Device": "o",
+    "Flags": "as",
+    "Includes": "ao",
+    "ManufacturerData": "a{qv}",
+    "MTU": "q",
+    "RSSI": "n",
+    "Service": "o",
+    "ServiceData": "a{sv}",
+    "TxPower": "n",
+    "UUIDs": "as",
+    "Value": "ay",
+}
+
+
+class _Array(list):
+    pass
+
+
+class _Dict(dict):
+    pass
+
+
+def _variant(name, value):
+    """Wrap a property value so that txdbus marshals it with the type BlueZ uses."""
+    sig = _SIGNATURES.get(name)
+    if sig is None:
+        return value
+    if sig in marshal.variantClassMap:
+        return marshal.variantClassMap[sig](value)
+    if sig == "ay":
+        return bytearray(value)
+    if sig.startswith("a{"):
+        # Manufacturer and service data, with byte array values.
+        wrapped = _Dict((k, bytearray(v)) for k, v in value.items())
+    else:
+        wrapped = _Array(value)
+    wrapped.dbusSignature = sig
+    return wrapped
+
+
+class BlueZError(Exception):
+    """Sent to the caller of a method as the D-Bus error ``name``."""
+
+    def __init__(self, name, text=""):
+        Exception.__init__(self, text or name)
+        self.dbusErrorName = name
+
+
+class _Object(DBusObject):
+    """An object with one BlueZ interface and its properties."""
+
+    interface = None
+
+    def __init__(self, server, path, props):
+        DBusObject.__init__(self, path)
+        self.server = server
+        self.path = path
+        self.props = props
+
+    def getInterfaces(self):
+        return [_PROPERTIES, _INTERFACES[self.interface]]
+
+    def getAllProperties(self, interfaceName):
+        if interfaceName != self.interface:
+            return {}
+        return {k: _variant(k, v) for k, v in self.props.items()}
+
+    def executeMethod(self, interfaceObj, methodName, methodArguments, sender):
+        self.server._check_failure(methodName)
+        return DBusObject.executeMethod(
+            self, interfaceObj, methodName, methodArguments, sender
+        )
+
+    def set_properties(self, changed):
+        self.props.update(changed)
+        self.emitSignal(
+            "PropertiesChanged",
+            self.interface,
+            {k: _variant(k, v) for k, v in changed.items()},
+            [],
+            interface=defs.PROPERTIES_INTERFACE,
+        )
+
+    def dbus_Get(self, interface, name):
+        if interface != self.interface or name not in self.props:
+            raise BlueZError("org.freedesktop.DBus.Error.InvalidArgs")
+        return _variant(name, self.props[name])
+
+    def dbus_GetAll(self, interface):
+        return self.getAllProperties(interface)
+
+    def dbus_Set(self, interface, name, value):
+        if interface != self.interface or name not in self.props:
+            raise BlueZError("org.freedesktop.DBus.Error.InvalidArgs")
+        self.set_properties({name: value})
+
+
+class _Adapter(_Object):
+    interface = defs.ADAPTER_INTERFACE
+
+    def __init__(self, server, path, props):
+        _Object.__init__(self, server, path, props)
+        self.discovery_filter = {}
+        self._advertising = None
+
+    def dbus_SetDiscoveryFilter(self, discovery_filter):
+        self.discovery_filter = dict(discovery_filter)
+
+    def dbus_StartDiscovery(self):
+        if self.props["Discovering"]:
+            raise BlueZError(
+                "org.bluez.Error.InProgress", "Operation already in progress"
+            )
+        self.set_properties({"Discovering": True})
+        self._advertising = self.server.loop.call_soon(self._advertise)
+
+    def dbus_StopDiscovery(self):
+        if not self.props["Discovering"]:
+            raise BlueZError("org.bluez.Error.Failed", "No discovery started")
+        self.stop()
+        self.set_properties({"Discovering": False})
+
+    def dbus_RemoveDevice(self, path):
+        if path not in self.server.objects:
+            raise BlueZError("org.bluez.Error.DoesNotExist", "Does Not Exist")
+        self.server.remove(path)
+
+    def stop(self):
+        if self._advertising is not None:
+            self._advertising.cancel()
+            self._advertising = None
+
+    def _advertise(self):
+        server = self.server
+        for obj in list(server.objects.values()):
+            if (
+                isinstance(obj, _Device)
+                and obj.props["Adapter"] == self.path
+                and not obj.props["Connected"]
+            ):
+                obj.set_properties(
+                    {"RSSI": obj.base_rssi + server.random.randint(-5, 5)}
+                )
+        self._advertising = server.loop.call_later(
+            server.advertising_interval, self._advertise
+        )
+
+
+class _Device(_Object):
+    interface = defs.DEVICE_INTERFACE
+
+    def __init__(self, server, path, props):
+        _Object.__init__(self, server, path, props)
+        self.base_rssi = props["RSSI"]
+        self._resolving = None
+
+    def dbus_Connect(self):
+        if self.props["Connected"]:
+            return
+        self.set_properties({"Connected": True})
+        self._resolving = self.server.loop.call_later(
+            self.server.resolve_delay,
+            self.set_properties,
+            {"ServicesResolved": True},
+        )
+
+    def dbus_Disconnect(self):
+        self.stop()
+        if self.props["Connected"]:
+            self.set_properties({"Connected": False, "ServicesResolved": False})
+
+    def stop(self):
+        if self._resolving is not None:
+            self._resolving.cancel()
+            self._resolving = None
+        prefix = self.path + "/"
+        for path, obj in self.server.objects.items():
+            if path.startswith(prefix) and isinstance(obj, _Characteristic):
+                obj.stop()
+
+
+class _Service(_Object):
+    interface = defs.GATT_SERVICE_INTERFACE
+
+
+class _Attribute(_Object):
+    """A characteristic or descriptor, with a value to read and write."""
+
+    def dbus_ReadValue(self, options):
+        return bytearray(self.props["Value"])
+
+    def dbus_WriteValue(self, value, options):
+        self.props["Value"] = bytearray(value)
+        self.server.written[self.path] += len(value)
+
+
+class _Characteristic(_Attribute):
+    interface = defs.GATT_CHARACTERISTIC_INTERFACE
+
+    def __init__(self, server, path, props):
+        _Attribute.__init__(self, server, path, props)
+        self.notify_rate = server.notify_rate
+        self._notifying = None
+        self._count = 0
+
+    def dbus_StartNotify(self):
+        if self.props["Notifying"]:
+            return
+        self.set_properties({"Notifying": True})
+        if self.notify_rate:
+            self._notifying = self.server.loop.call_later(
+                self.server._interval(self.notify_rate), self._notify
+            )
+
+    def dbus_StopNotify(self):
+        self.stop()
+        if self.props["Notifying"]:
+            self.set_properties({"Notifying": False})
+
+    def dbus_AcquireWrite(self, options):
+        raise BlueZError("org.bluez.Error.NotSupported", "Operation is not supported")
+
+    def dbus_AcquireNotify(self, options):
+        raise BlueZError("org.bluez.Error.NotSupported", "Operation is not supported")
+
+    def notify(self, value):
+        self.server.notified[self.path] += 1
+        self.set_properties({"Value": value})
+
+    def stop(self):
+        if self._notifying is not None:
+            self._notifying.cancel()
+            self._notifying = None
+
+    def _notify(self):
+        # A counter, padded to the size of the value.
+        self._count += 1
+        size = max(4, len(self.props["Value"]))
+        self.notify(struct.pack("<I", self._count & 0xFFFFFFFF) + bytes(size - 4))
+        self._notifying = self.server.loop.call_later(
+            self.server._interval(self.notify_rate), self._notify
+        )
+
+
+class _Descriptor(_Attribute):
+    interface = defs.GATT_DESCRIPTOR_INTERFACE
+
+
+class _Root(DBusObject):
+    """The object manager on ``/``, whose ``GetManagedObjects`` txdbus answers."""
+
+    def getInterfaces(self):
+        return []
+
+
+class FakeBlueZServer(object):
+    """A simulated BlueZ on a private D-Bus daemon.
+
+    An adapter, ``hci0``, is added on creation. Objects can be added and
+    removed before and after :py:meth:`start`; after it, BlueZ's
+    ``InterfacesAdded`` and ``InterfacesRemoved`` signals are sent for them.
+
+    Args:
+        loop (asyncio.events.AbstractEventLoop): The event loop to serve on.
+        latency (float): Delay of every method reply, in seconds.
+        jitter (float): Maximum random deviation from ``latency`` and from
+            the notification interval, in seconds.
+        resolve_delay (float): Time from ``Connect`` until ``ServicesResolved``.
+        notify_rate (float): Notifications per second sent by notifying
+            characteristics. ``0`` for none, see :py:meth:`notify`.
+        advertising_interval (float): Seconds between ``RSSI`` updates of the
+            devices while discovering.
+        seed: Seed of the random numbers used for jitter and RSSI.
+        dbus_daemon (str): The ``dbus-daemon`` executable. Defaults to the one
+            found on ``PATH``.
+
+    """
+
+    def __init__(
+        self,
+        loop=None,
+        latency=0.0,
+        jitter=0.0,
+        resolve_delay=0.0,
+        notify_rate=0.0,
+        advertising_interval=0.1,
+        seed=None,
+        dbus_daemon=None,
+    ):
+        self.loop = loop if loop else asyncio.get_event_loop()
+        self.latency = latency
+        self.jitter = jitter
+        self.resolve_delay = resolve_delay
+        self.notify_rate = notify_rate
+        self.advertising_interval = advertising_interval
+        self.random = random.Random(seed)
+        self.dbus_daemon = dbus_daemon or shutil.which("dbus-daemon")
+
+        self.bus_address = None
+        self.objects = collections.OrderedDict()
+        self.calls = collections.Counter()
+        self.written = collections.Counter()
+        self.notified = collections.Counter()
+
+        self._failures = {}
+        self._directory = None
+        self._daemon = None
+        self._connection = None
+        self._saved_address = None
+
+        self.add_adapter("hci0")
+
+    async def __aenter__(self):
+        await self.start()
+        self._saved_address = os.environ.get("DBUS_SYSTEM_BUS_ADDRESS")
+        os.environ["DBUS_SYSTEM_BUS_ADDRESS"] = self.bus_address
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._saved_address is None:
+            os.environ.pop("DBUS_SYSTEM_BUS_ADDRESS", None)
+        else:
+            os.environ["DBUS_SYSTEM_BUS_ADDRESS"] = self._saved_address
+        await self.stop()
+
+    async def start(self) -> None:
+        """Start the D-Bus daemon and export the objects as ``org.bluez`` on it."""
+        from txdbus.client import connect as txdbus_connect
+
+        if self.dbus_daemon is None:
+            raise RuntimeError("dbus-daemon not found.")
+        self._directory = tempfile.mkdtemp(prefix="fakebluez-")
+        config = os.path.join(self._directory, "bus.conf")
+        with open(config, "w") as f:
+            f.write(_CONFIG.format(self._directory))
+        self._daemon = subprocess.Popen(
+            [self.dbus_daemon, "--config-file", config, "--print-address", "--nofork"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        line = await self.loop.run_in_executor(None, self._daemon.stdout.readline)
+        if not line:
+            await self.stop()
+            raise RuntimeError("dbus-daemon did not start.")
+        self.bus_address = line.decode().strip()
+
+        self._connection = await txdbus_connect(
+            get_reactor(self.loop), busAddress=self.bus_address
+        ).asFuture(self.loop)
+        # Replies are sent from here, after the simulated latency.
+        self._connection.methodCallReceived = self._method_call_received
+        handler = self._connection.objHandler
+        root = _Root("/")
+        handler.exports["/"] = root
+        root.setObjectHandler(handler)
+        for obj in self.objects.values():
+            handler.exports[obj.path] = obj
+            obj.setObjectHandler(handler)
+        await self._connection.requestBusName(defs.BLUEZ_SERVICE).asFuture(self.loop)
+
+    async def stop(self) -> None:
+        """Stop all timers, disconnect and stop the D-Bus daemon."""
+        for obj in self.objects.values():
+            if hasattr(obj, "stop"):
+                obj.stop()
+        if self._connection is not None:
+            self._connection.disconnect()
+            self._connection = None
+        if self._daemon is not None:
+            self._daemon.terminate()
+            await self.loop.run_in_executor(None, self._daemon.wait)
+            self._daemon.stdout.close()
+            self._daemon = None
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+    def add_adapter(self, name: str, address: str = None, powered: bool = True) -> str:
+        """Add an adapter, e.g. ``"hci1"``.
+
+        Returns:
+            The object path of the adapter.
+
+        """
+        index = int(name[3:]) if name[3:].isdigit() else len(self.objects)
+        path = "/org/bluez/" + name
+        props = {
+            "Address": address or "00:00:00:00:00:{0:02X}".format(index + 1),
+            "Name": name,
+            "Alias": name,
+            "Class": 0,
+            "Powered": powered,
+            "Discoverable": False,
+            "Pairable": False,
+            "Discovering": False,
+            "UUIDs": [],
+            "Modalias": "usb:v1D6Bp0246d0535",
+        }
+        self._add(_Adapter(self, path, props))
+        return path
+
+    def add_device(
+        self,
+        address: str,
+        adapter: str = "hci0",
+        name: str = "Fake",
+        rssi: int = -60,
+        n_services: int = 1,
+        n_chars: int = 1,
+        n_descs: int = 0,
+        value_size: int = 20,
+        manufacturer_data: dict = None,
+    ) -> str:
+        """Add a device with a GATT database of the given size.
+
+        Every characteristic can be read, written with and without response
+        and notified, and has a value of ``value_size`` bytes.
+
+        Returns:
+            The object path of the device.
+
+        """
+        adapter_path = "/org/bluez/" + adapter
+        path = "{0}/dev_{1}".format(adapter_path, address.upper().replace(":", "_"))
+        uuids = [
+            "{0:08x}-0000-1000-8000-00805f9b34fb".format(0x1800 + s)
+            for s in range(n_services)
+        ]
+        props = {
+            "Address": address.upper(),
+            "Name": name,
+            "Alias": name,
+            "RSSI": rssi,
+            "Paired": False,
+            "Trusted": False,
+            "Blocked": False,
+            "Connected": False,
+            "ServicesResolved": False,
+            "UUIDs": uuids,
+            "Adapter": adapter_path,
+        }
+        if manufacturer_data:
+            props["ManufacturerData"] = manufacturer_data
+        self._add(_Device(self, path, props))
+
+        handle = 1
+        for s_uuid in uuids:
+            s_path = "{0}/service{1:04x}".format(path, handle)
+            self._add(
+                _Service(
+                    self,
+                    s_path,
+                    {"UUID": s_uuid, "Primary": True, "Device": path, "Includes": []},
+                )
+            )
+            handle += 1
+            for c in range(n_chars):
+                c_path = "{0}/char{1:04x}".format(s_path, handle)
+                c_props = {
+                    "UUID": "{0:08x}-0000-1000-8000-00805f9b34fb".format(
+                        0x10000 + handle
+                    ),
+                    "Service": s_path,
+                    "Value": bytes(value_size),
+                    "Notifying": False,
+                    "Flags": ["read", "write", "write-without-response", "notify"],
+                }
+                self._add(_Characteristic(self, c_path, c_props))
+                handle += 1
+                for d in range(n_descs):
+                    d_path = "{0}/desc{1:04x}".format(c_path, handle)
+                    d_props = {
+                        "UUID": "00002902-0000-1000-8000-00805f9b34fb",
+                        "Characteristic": c_path,
+                        "Value": bytes(2),
+                        "Flags": ["read", "write"],
+                    }
+                    self._add(_Descriptor(self, d_path, d_props))
+                    handle += 1
+        return path
+
+    def remove(self, path: str) -> None:
+        """Remove an object and all objects below it, e.g. a device going out of range."""
+        prefix = path + "/"
+        for p in reversed(list(self.objects)):
+            if p == path or p.startswith(prefix):
+                obj = self.objects.pop(p)
+                if hasattr(obj, "stop"):
+                    obj.stop()
+                if self._connection is not None:
+                    del self._connection.objHandler.exports[p]
+                    self._send_object_manager_signal(
+                        "InterfacesRemoved", "oas", [p, [obj.interface]]
+                    )
+
+    def set_properties(self, path: str, changed: dict) -> None:
+        """Change properties of an object and send ``PropertiesChanged``."""
+        self.objects[path].set_properties(changed)
+
+    def notify(self, path: str, value: bytes) -> None:
+        """Send a notification of the characteristic at ``path``."""
+        self.objects[path].notify(value)
+
+    def set_notify_rate(self, path: str, rate: float) -> None:
+        """Set the notifications per second of a characteristic, from its next ``StartNotify``."""
+        self.objects[path].notify_rate = rate
+
+    def fail(self, method: str, error: str = "org.bluez.Error.Failed", count: int = 1):
+        """Make the next ``count`` calls of ``method`` fail with the D-Bus error ``error``."""
+        self._failures[method] = (error, count)
+
+    def characteristics(self, device_path: str) -> list:
+        """The object paths of the characteristics of a device."""
+        prefix = device_path + "/"
+        return [
+            p
+            for p, obj in self.objects.items()
+            if p.startswith(prefix) and isinstance(obj, _Characteristic)
+        ]
+
+    # Internal methods
+
+    def _add(self, obj) -> None:
+        self.objects[obj.path] = obj
+        if self._connection is not None:
+            handler = self._connection.objHandler
+            handler.exports[obj.path] = obj
+            obj.setObjectHandler(handler)
+            self._send_object_manager_signal(
+                "InterfacesAdded",
+                "oa{sa{sv}}",
+                [obj.path, {obj.interface: obj.getAllProperties(obj.interface)}],
+            )
+
+    def _send_object_manager_signal(self, member, signature, body) -> None:
+        self._connection.sendMessage(
+            message.SignalMessage(
+                "/",
+                member,
+                defs.OBJECT_MANAGER_INTERFACE,
+                signature=signature,
+                body=body,
+            )
+        )
+
+    def _check_failure(self, method) -> None:
+        failure = self._failures.get(method)
+        if failure is None:
+            return
+        error, count = failure
+        if count <= 1:
+            del self._failures[method]
+        else:
+            self._failures[method] = (error, count - 1)
+        raise BlueZError(error)
+
+    def _interval(self, rate) -> float:
+        return self._delay(1.0 / rate)
+
+    def _delay(self, delay) -> float:
+        if self.jitter:
+            delay += self.random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+    def _method_call_received(self, mcall) -> None:
+        self.calls[mcall.member] += 1
+        handle = self._connection.objHandler.handleMethodCallMessage
+        delay = self._delay(self.latency)
+        if delay:
+            self.loop.call_later(delay, handle, mcall)
+        else:
+            handle(mcall)
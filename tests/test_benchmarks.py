@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for comparing benchmark results."""
+
+from benchmarks.__main__ import compare, _direction
+
+# A metric of each kind the benchmarks report, and if higher values are better.
+_METRICS = {
+    "read_s": -1,
+    "device_store_per_signal_s": -1,
+    "shared_10_devices_per_signal_s": -1,
+    "notifications_per_s": 1,
+    "write_stream_fd_bytes_per_s": 1,
+    "slotted_bytes_per_device": -1,
+    "dbus_calls_per_connect": -1,
+    "discovered_devices": 0,
+    "shared_10_devices_deliveries_per_signal": 0,
+}
+
+
+def test_metric_directions():
+    assert {metric: _direction(metric) for metric in _METRICS} == _METRICS
+
+
+def test_compare_flags_regressions_of_every_kind():
+    old = {"results": {"bench": {metric: 100.0 for metric in _METRICS}}}
+    # Every metric gets 50 % worse, or for counts just larger.
+    new = {
+        "results": {
+            "bench": {
+                metric: 50.0 if direction > 0 else 150.0
+                for metric, direction in _METRICS.items()
+            }
+        }
+    }
+    rows, regressions = compare(old, new, threshold=0.2)
+
+    assert len(rows) == len(_METRICS)
+    assert sorted(metric for _, metric, _, _, _ in regressions) == sorted(
+        metric for metric, direction in _METRICS.items() if direction
+    )
+    assert all(change == -0.5 for _, _, _, _, change in regressions)
+    assert compare(old, old)[1] == []
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for signal routing on the shared BlueZ system bus."""
+
+import asyncio
+import platform
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    platform.system() != "Linux", reason="BlueZ backend is only used on Linux."
+)
+
+
+class _Message(object):
+    def __init__(self, member, path, body):
+        self.member = member
+        self.path = path
+        self.body = body
+
+
+def test_signals_are_routed_by_object_path():
+    """Test that handlers get signals for their object and the objects below it."""
+    from bleak.backends.bluezdbus.bus import (
+        SharedBus,
+        PROPERTIES_CHANGED,
+        INTERFACES_ADDED,
+    )
+
+    loop = asyncio.new_event_loop()
+    bus = SharedBus(loop)
+    adapter, device, other = [], [], []
+    bus.add_signal_handler(INTERFACES_ADDED, "/org/bluez/hci0", adapter.append)
+    bus.add_signal_handler(PROPERTIES_CHANGED, "/org/bluez/hci0", adapter.append)
+    bus.add_signal_handler(
+        PROPERTIES_CHANGED, "/org/bluez/hci0/dev_00_11_22_33_44_55", device.append
+    )
+    bus.add_signal_handler(
+        PROPERTIES_CHANGED, "/org/bluez/hci0/dev_00_11_22_33_44_66", other.append
+    )
+
+    char_signal = _Message(
+        PROPERTIES_CHANGED,
+        "/org/bluez/hci0/dev_00_11_22_33_44_55/service000c/char000d",
+        ["org.bluez.GattCharacteristic1", {"Value": b"\x01"}, []],
+    )
+    added_signal = _Message(
+        INTERFACES_ADDED, "/", ["/org/bluez/hci0/dev_00_11_22_33_44_77", {}]
+    )
+    bus._dispatch(char_signal)
+    bus._dispatch(added_signal)
+
+    assert device == [char_signal]
+    assert adapter == [char_signal, added_signal]
+    assert other == []
+
+    bus.remove_signal_handler(
+        PROPERTIES_CHANGED, "/org/bluez/hci0/dev_00_11_22_33_44_55", device.append
+    )
+    bus._dispatch(char_signal)
+    assert device == [char_signal]
+    loop.close()
+
+
+def test_signals_are_routed_to_the_root():
+    """Test that handlers on ``/`` get the signals of all objects."""
+    from bleak.backends.bluezdbus.bus import SharedBus, INTERFACES_REMOVED
+
+    loop = asyncio.new_event_loop()
+    bus = SharedBus(loop)
+    root = []
+    bus.add_signal_handler(INTERFACES_REMOVED, "/", root.append)
+
+    device_signal = _Message(
+        INTERFACES_REMOVED, "/", ["/org/bluez/hci0/dev_00_11_22_33_44_55", []]
+    )
+    root_signal = _Message(INTERFACES_REMOVED, "/", ["/", []])
+    bus._dispatch(device_signal)
+    bus._dispatch(root_signal)
+
+    assert root == [device_signal, root_signal]
+    loop.close()
+
+
+class _Connection(object):
+    """Connection answering method calls with futures the test resolves."""
+
+    def __init__(self, loop):
+        self.replies = []
+        self.members = []
+        self._loop = loop
+
+    def callRemote(self, path, member, **kwargs):
+        reply = self._loop.create_future()
+        self.replies.append(reply)
+        self.members.append(member)
+        return _Deferred(reply)
+
+
+class _Deferred(object):
+    def __init__(self, future):
+        self._future = future
+
+    def asFuture(self, loop):
+        return self._future
+
+
+def test_method_calls_are_counted_and_passed_to_hooks():
+    """Test that call hooks see every call, with its duration and error."""
+    from bleak.backends.bluezdbus.bus import (
+        add_call_hook,
+        call_remote,
+        in_flight,
+        peak_in_flight,
+        remove_call_hook,
+    )
+
+    loop = asyncio.new_event_loop()
+    connection = _Connection(loop)
+    started, finished = [], []
+
+    def hook(call):
+        started.append((call.member, call.in_flight, call.payload_size))
+        return finished.append
+
+    async def calls():
+        first = call_remote(
+            connection,
+            loop,
+            "/org/bluez/hci0/dev_00_11_22_33_44_55/service000c/char000d",
+            "WriteValue",
+            interface="org.bluez.GattCharacteristic1",
+            signature="aya{sv}",
+            body=[bytearray(4), {}],
+        )
+        second = call_remote(connection, loop, "/", "GetManagedObjects")
+        assert in_flight(connection) == 2
+
+        connection.replies[0].set_result(None)
+        connection.replies[1].set_exception(RuntimeError())
+        await first
+        with pytest.raises(RuntimeError):
+            await second
+
+    add_call_hook(hook)
+    try:
+        loop.run_until_complete(calls())
+    finally:
+        remove_call_hook(hook)
+        loop.close()
+
+    assert started == [("WriteValue", 1, 16), ("GetManagedObjects", 2, 0)]
+    assert [call.error for call in finished][0] is None
+    assert isinstance(finished[1].error, RuntimeError)
+    assert all(call.duration >= 0 for call in finished)
+    assert in_flight(connection) == 0
+    assert peak_in_flight(connection, reset=True) == 2
+    assert peak_in_flight(connection) == 0
+
+
+def test_concurrent_discovery_waits_for_the_start():
+    """Test that users starting discovery while it is started wait for it."""
+    from bleak.backends.bluezdbus.bus import SharedBus
+
+    loop = asyncio.new_event_loop()
+    bus = SharedBus(loop)
+    bus.connection = connection = _Connection(loop)
+    adapter = "/org/bluez/hci0"
+
+    async def answer(error=None):
+        while all(reply.done() for reply in connection.replies):
+            await asyncio.sleep(0)
+        reply = [reply for reply in connection.replies if not reply.done()][0]
+        if error is None:
+            reply.set_result(None)
+        else:
+            reply.set_exception(error)
+
+    async def start_twice():
+        first = asyncio.ensure_future(bus.start_discovery(adapter, {}))
+        second = asyncio.ensure_future(bus.start_discovery(adapter, {}))
+        await answer()
+        await asyncio.sleep(0)
+        assert not first.done() and not second.done()
+        await answer()
+        await asyncio.gather(first, second)
+
+    async def fail_twice():
+        first = asyncio.ensure_future(bus.start_discovery(adapter, {}))
+        second = asyncio.ensure_future(bus.start_discovery(adapter, {}))
+        await answer(error=RuntimeError())
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+
+    async def cancel_waiting():
+        first = asyncio.ensure_future(bus.start_discovery(adapter, {}))
+        second = asyncio.ensure_future(bus.start_discovery(adapter, {}))
+        await asyncio.sleep(0)
+        second.cancel()
+        await answer()
+        await answer()
+        await first
+        await asyncio.sleep(0)
+        assert bus._discovery_sessions[adapter] == 1
+
+    try:
+        loop.run_until_complete(start_twice())
+        assert connection.members == ["SetDiscoveryFilter", "StartDiscovery"]
+        assert bus._discovery_sessions[adapter] == 2
+
+        loop.run_until_complete(bus.stop_discovery(adapter))
+        stop = asyncio.ensure_future(bus.stop_discovery(adapter), loop=loop)
+        loop.run_until_complete(answer())
+        loop.run_until_complete(stop)
+        assert bus._discovery_sessions[adapter] == 0
+
+        loop.run_until_complete(fail_twice())
+        assert bus._discovery_sessions[adapter] == 0
+
+        loop.run_until_complete(cancel_waiting())
+        assert connection.members == [
+            "SetDiscoveryFilter",
+            "StartDiscovery",
+            "StopDiscovery",
+            "SetDiscoveryFilter",
+            "SetDiscoveryFilter",
+            "StartDiscovery",
+        ]
+    finally:
+        loop.close()
+
+
+def test_conflicting_discovery_filters_are_warned_about(caplog):
+    """Test that filters of later discovery users are not applied, with a warning."""
+    from bleak.backends.bluezdbus.bus import SharedBus
+
+    loop = asyncio.new_event_loop()
+    bus = SharedBus(loop)
+    bus.connection = connection = _Connection(loop)
+    adapter = "/org/bluez/hci0"
+
+    async def start():
+        first = asyncio.ensure_future(bus.start_discovery(adapter, {"Transport": "le"}))
+        while not first.done():
+            await asyncio.sleep(0)
+            for reply in connection.replies:
+                if not reply.done():
+                    reply.set_result(None)
+        await first
+        await bus.start_discovery(adapter, {"Transport": "le"})
+        await bus.start_discovery(adapter, {"Transport": "le", "UUIDs": ["180d"]})
+
+    try:
+        loop.run_until_complete(start())
+    finally:
+        loop.close()
+
+    assert connection.members == ["SetDiscoveryFilter", "StartDiscovery"]
+    warnings = [r for r in caplog.records if r.levelname == "WARNING"]
+    assert len(warnings) == 1
+    assert "not applying" in warnings[0].getMessage()
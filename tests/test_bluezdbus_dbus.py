@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests of the BlueZ backend against a simulated BlueZ on a private D-Bus daemon."""
+
+import asyncio
+import platform
+import shutil
+
+import pytest
+
+pytestmark = [
+    pytest.mark.skipif(
+        platform.system() != "Linux", reason="BlueZ backend is only used on Linux."
+    ),
+    pytest.mark.skipif(
+        shutil.which("dbus-daemon") is None, reason="dbus-daemon is not installed."
+    ),
+]
+
+_ADDRESS = "00:11:22:33:44:55"
+
+
+def _run(test, **kwargs):
+    from tests.fakebluez import FakeBlueZServer
+
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        async with FakeBlueZServer(loop, **kwargs) as server:
+            server.add_device(_ADDRESS, n_services=2, n_chars=2, n_descs=1)
+            return await test(server, loop)
+
+    try:
+        return loop.run_until_complete(asyncio.wait_for(run(), 10))
+    finally:
+        loop.close()
+
+
+def test_discover_connect_read_write_and_notify():
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+    from bleak.backends.bluezdbus.discovery import discover
+
+    async def test(server, loop):
+        devices = await discover(timeout=0.2, loop=loop)
+        assert [d.address for d in devices] == [_ADDRESS]
+
+        received = []
+        async with BleakClientBlueZDBus(_ADDRESS, loop=loop, metrics=True) as client:
+            assert len(client.services.characteristics) == 4
+            char = next(iter(client.services.characteristics.values()))
+            await client.write_gatt_char(char, bytearray(b"\x01\x02"), True)
+            assert await client.read_gatt_char(char) == b"\x01\x02"
+            assert await client.bind(char).read() == b"\x01\x02"
+
+            await client.start_notify(char, lambda sender, data: received.append(data))
+            await asyncio.sleep(0.1)
+            await client.stop_notify(char)
+        return received, server.written, char.uuid, client.metrics.as_dict()
+
+    received, written, uuid, metrics = _run(test, notify_rate=200)
+    assert received and received[0] == b"\x01\x00\x00\x00"
+    assert sum(written.values()) == 2
+    for operation in ("connect", "discovery", "get_services", "disconnect"):
+        assert metrics[operation]["count"] == 1
+    assert list(metrics["read_gatt_char"]["targets"]) == [uuid]
+    assert metrics["read_gatt_char"]["count"] == 2
+    assert metrics["notification_interval"]["count"] == len(received) - 1
+
+
+def test_connect_errors_are_raised():
+    from bleak.exc import BleakError
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    async def test(server, loop):
+        server.fail("Connect", "org.bluez.Error.Failed")
+        client = BleakClientBlueZDBus(_ADDRESS, loop=loop)
+        with pytest.raises(BleakError, match="org.bluez.Error.Failed"):
+            await client.connect()
+        # The next attempt goes through.
+        await client.connect()
+        await client.disconnect()
+
+    _run(test)
+
+
+def test_gatt_cache_is_validated_by_device_uuids():
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+    from bleak.backends.bluezdbus.gattcache import GATTCache
+
+    device_path = "/org/bluez/hci0/dev_" + _ADDRESS.replace(":", "_")
+    battery = "0000180f-0000-1000-8000-00805f9b34fb"
+
+    async def test(server, loop):
+        # BlueZ lists services it does not export, like the battery service.
+        uuids = server.objects[device_path].props["UUIDs"]
+        server.set_properties(device_path, {"UUIDs": uuids + [battery]})
+
+        cache = GATTCache()
+        for _ in range(2):
+            async with BleakClientBlueZDBus(_ADDRESS, loop=loop, gatt_cache=cache):
+                pass
+        assert cache.stats()["invalidations"] == 0
+        assert cache.stats()["hits"] == 1
+
+        server.set_properties(device_path, {"UUIDs": uuids})
+        async with BleakClientBlueZDBus(_ADDRESS, loop=loop, gatt_cache=cache):
+            pass
+        assert cache.stats()["invalidations"] == 1
+
+    _run(test)
+
+
+def test_database_hash_is_only_read_to_validate_an_entry():
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+    from bleak.backends.bluezdbus.gattcache import GATTCache, DATABASE_HASH_UUID
+
+    async def test(server, loop):
+        device_path = "/org/bluez/hci0/dev_" + _ADDRESS.replace(":", "_")
+        hash_char = server.characteristics(device_path)[0]
+        server.objects[hash_char].props["UUID"] = DATABASE_HASH_UUID
+
+        cache = GATTCache()
+        reads = []
+        for _ in range(3):
+            calls = server.calls["ReadValue"]
+            async with BleakClientBlueZDBus(_ADDRESS, loop=loop, gatt_cache=cache):
+                pass
+            reads.append(server.calls["ReadValue"] - calls)
+        return reads, cache.stats()
+
+    reads, stats = _run(test)
+    # Not read on the first connection, then read to store and to validate.
+    assert reads == [0, 1, 1]
+    assert stats["hits"] == 2 and stats["invalidations"] == 0
+
+
+def test_reconnect_resolves_services_again():
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+    from bleak.backends.bluezdbus.gattcache import GATTCache
+
+    async def test(server, loop):
+        cache = GATTCache()
+        client = BleakClientBlueZDBus(_ADDRESS, loop=loop, gatt_cache=cache)
+        counts = []
+        for _ in range(2):
+            await client.connect()
+            counts.append(len(client.services.characteristics))
+            await client.disconnect()
+        return counts, cache.stats()
+
+    counts, stats = _run(test)
+    assert counts == [4, 4]
+    assert stats["hits"] == 1
+
+
+def test_unexpected_disconnect_keeps_gatt_cache_entry():
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+    from bleak.backends.bluezdbus.gattcache import GATTCache
+
+    async def test(server, loop):
+        device_path = "/org/bluez/hci0/dev_" + _ADDRESS.replace(":", "_")
+        cache = GATTCache()
+        disconnected = loop.create_future()
+        client = BleakClientBlueZDBus(_ADDRESS, loop=loop, gatt_cache=cache)
+        client.set_disconnected_callback(lambda c, f: disconnected.set_result(None))
+        await client.connect()
+
+        # The device goes away: BlueZ reports the disconnection, then removes
+        # the GATT objects.
+        server.set_properties(
+            device_path, {"Connected": False, "ServicesResolved": False}
+        )
+        for path in list(server.objects):
+            if path.startswith(device_path + "/service") and path.count("/") == 5:
+                server.remove(path)
+        await disconnected
+        return len(cache)
+
+    assert _run(test) == 1
+
+
+def _connect_calls(server, loop, **kwargs):
+    """Connect and disconnect, returning the lookup and scan calls made."""
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    async def connect():
+        before = dict(server.calls)
+        client = BleakClientBlueZDBus(_ADDRESS, loop=loop)
+        await client.connect(**kwargs)
+        path = client._device_path
+        await client.disconnect()
+        calls = [
+            server.calls[m] - before.get(m, 0)
+            for m in ("GetManagedObjects", "StartDiscovery")
+        ]
+        # One GetManagedObjects call is made to get the services.
+        calls[0] -= 1
+        return path, calls
+
+    return connect()
+
+
+def test_connect_uses_a_known_device_path():
+    device_path = "/org/bluez/hci0/dev_" + _ADDRESS.replace(":", "_")
+    stale_path = "/org/bluez/hci0/dev_00_11_22_33_44_66"
+
+    async def test(server, loop):
+        known = await _connect_calls(server, loop, device_path=device_path)
+        # A path of no device, or of another one, is looked up instead.
+        stale = await _connect_calls(server, loop, device_path=stale_path)
+        server.add_device("00:11:22:33:44:66")
+        other = await _connect_calls(server, loop, device_path=stale_path)
+        return known, stale, other
+
+    known, stale, other = _run(test)
+    assert known == (device_path, [0, 0])
+    assert stale == (device_path, [1, 0])
+    assert other == (device_path, [1, 0])
+
+
+def test_connect_looks_up_a_device_known_to_bluez():
+    device_path = "/org/bluez/hci0/dev_" + _ADDRESS.replace(":", "_")
+
+    async def test(server, loop):
+        return await _connect_calls(server, loop)
+
+    assert _run(test) == (device_path, [1, 0])
+
+
+def test_connect_scans_until_the_device_is_seen():
+    device_path = "/org/bluez/hci0/dev_" + _ADDRESS.replace(":", "_")
+
+    async def test(server, loop):
+        server.remove(device_path)
+        loop.call_later(0.1, server.add_device, _ADDRESS)
+        path, calls = await _connect_calls(server, loop, timeout=5)
+        return path, calls, server.calls["StopDiscovery"]
+
+    assert _run(test) == (device_path, [1, 1], 1)
+
+
+def test_disconnect_is_detected_on_the_adapter_of_the_device():
+    from bleak.backends.bluezdbus import bus
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+    from bleak.backends.device import BLEDevice
+
+    async def test(server, loop):
+        server.add_adapter("hci1")
+        device_path = server.add_device(_ADDRESS, adapter="hci1")
+        ble_device = BLEDevice(_ADDRESS, "Fake", {"path": device_path, "props": {}})
+
+        disconnected = loop.create_future()
+        client = BleakClientBlueZDBus(_ADDRESS, loop=loop, device="hci0")
+        client.set_disconnected_callback(lambda c, f: disconnected.set_result(None))
+        await client.connect(ble_device=ble_device)
+        assert server.objects[device_path].props["Connected"]
+        assert client.device == "hci1"
+
+        server.set_properties(
+            device_path, {"Connected": False, "ServicesResolved": False}
+        )
+        await disconnected
+        await asyncio.sleep(0)
+        return loop in bus._buses
+
+    assert _run(test) is False
+
+
+def test_cancelled_discover_stops_discovery_and_releases_the_bus():
+    from bleak.backends.bluezdbus import bus
+    from bleak.backends.bluezdbus.discovery import discover
+
+    async def test(server, loop):
+        task = asyncio.ensure_future(discover(timeout=5, loop=loop), loop=loop)
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return server.calls["StopDiscovery"], loop in bus._buses
+
+    assert _run(test) == (1, False)
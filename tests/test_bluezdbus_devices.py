@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the device store of the BlueZ scanner."""
+
+import platform
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    platform.system() != "Linux", reason="BlueZ backend is only used on Linux."
+)
+
+_DEVICE = "/org/bluez/hci0/dev_00_11_22_33_44_55"
+
+
+class _Signal(object):
+    def __init__(self, member, path, body):
+        self.member = member
+        self.path = path
+        self.body = body
+
+
+def _properties_changed(changed):
+    return _Signal("PropertiesChanged", _DEVICE, ["org.bluez.Device1", changed, []])
+
+
+def test_device_store_updates_in_place():
+    from bleak.backends.bluezdbus.devices import DeviceStore
+
+    cached = {"Address": "00:11:22:33:44:55", "Name": "Cached", "RSSI": -90}
+    store = DeviceStore({_DEVICE: cached})
+
+    assert store.handle_message(_properties_changed({"RSSI": -50})) == _DEVICE
+    (device,) = store.get_discovered_devices()
+    assert (device.name, device.rssi) == ("Cached", -50)
+    assert cached["RSSI"] == -90
+
+    # An RSSI update shows through the same BLEDevice.
+    store.handle_message(_properties_changed({"RSSI": -40}))
+    assert store.get_discovered_devices() == [device]
+    assert device.rssi == -40
+
+    store.handle_message(_properties_changed({"Name": "Renamed"}))
+    (renamed,) = store.get_discovered_devices()
+    assert renamed is not device
+    assert renamed.name == "Renamed"
+
+
+def test_device_details_do_not_change_under_the_caller():
+    from bleak.backends.bluezdbus.devices import DeviceStore
+
+    store = DeviceStore()
+    store.handle_message(
+        _properties_changed({"Address": "00:11:22:33:44:55", "Name": "Old"})
+    )
+    (device,) = store.get_discovered_devices()
+    details = device.details
+
+    store.handle_message(_properties_changed({"Name": "New", "RSSI": -40}))
+    assert details["props"] == {"Address": "00:11:22:33:44:55", "Name": "Old"}
+    assert store.get(_DEVICE).props["Name"] == "New"
+
+
+def test_device_store_ignores_other_interfaces():
+    from bleak.backends.bluezdbus.devices import DeviceStore
+
+    store = DeviceStore()
+    service = _Signal(
+        "InterfacesAdded",
+        "/",
+        [_DEVICE + "/service000c", {"org.bluez.GattService1": {}}],
+    )
+    assert store.handle_message(service) is None
+    assert len(store) == 0
+
+
+def test_device_store_drops_old_devices():
+    from bleak.backends.bluezdbus.devices import DeviceStore
+
+    now = [0.0]
+    evicted = []
+    store = DeviceStore(
+        ttl=10, max_size=2, on_evict=evicted.append, clock=lambda: now[0]
+    )
+
+    def seen(address):
+        path = "/org/bluez/hci0/dev_" + address.replace(":", "_")
+        store.handle_message(
+            _Signal(
+                "InterfacesAdded",
+                "/",
+                [path, {"org.bluez.Device1": {"Address": address}}],
+            )
+        )
+        return path
+
+    first = seen("00:00:00:00:00:01")
+    now[0] = 5
+    second = seen("00:00:00:00:00:02")
+    seen("00:00:00:00:00:01")
+    # Full, the least recently seen goes.
+    third = seen("00:00:00:00:00:03")
+    assert second not in store and first in store
+
+    store.handle_message(
+        _Signal("InterfacesRemoved", "/", [third, ["org.bluez.Device1"]])
+    )
+    now[0] = 20
+    assert store.get_discovered_devices() == []
+    assert [r.path for r in evicted] == [second, third, first]
+    assert store.stats() == {"size": 0, "removed": 1, "expired": 1, "evicted": 1}
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for notifications read from an AcquireNotify socket in the BlueZ backend."""
+
+import asyncio
+import platform
+import socket
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    platform.system() != "Linux", reason="BlueZ backend is only used on Linux."
+)
+
+
+def test_acquired_notification_reads_packets_until_closed():
+    from bleak.backends.bluezdbus.notify import AcquiredNotification
+
+    loop = asyncio.new_event_loop()
+    bluez, ours = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    received = []
+    closed = loop.create_future()
+
+    AcquiredNotification(
+        loop,
+        ours.detach(),
+        23,
+        "00002a37-0000-1000-8000-00805f9b34fb",
+        lambda sender, data: received.append((sender, bytes(data))),
+        lambda: closed.set_result(None),
+    )
+    bluez.send(b"\x01\x02")
+    bluez.send(b"\x03")
+    bluez.close()
+
+    try:
+        loop.run_until_complete(asyncio.wait_for(closed, 1))
+    finally:
+        loop.close()
+
+    assert received == [
+        ("00002a37-0000-1000-8000-00805f9b34fb", b"\x01\x02"),
+        ("00002a37-0000-1000-8000-00805f9b34fb", b"\x03"),
+    ]
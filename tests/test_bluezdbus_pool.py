@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the BlueZ connection pool."""
+
+import asyncio
+import platform
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    platform.system() != "Linux", reason="BlueZ backend is only used on Linux."
+)
+
+
+class _SharedBus(object):
+    refcount = 0
+
+    async def release(self):
+        _SharedBus.refcount -= 1
+
+
+async def _get_shared_bus(loop):
+    await asyncio.sleep(0)
+    _SharedBus.refcount += 1
+    return _SharedBus()
+
+
+class _Client(object):
+    """Just enough of a client to connect and disconnect."""
+
+    connecting = 0
+    max_connecting = 0
+    log = []
+    in_progress = set()
+
+    def __init__(self, address, loop=None, device="hci0"):
+        self.address = address
+        self.device = device
+        self.connected = False
+
+    def set_disconnected_callback(self, callback):
+        self.disconnected_callback = callback
+
+    async def connect(self, **kwargs):
+        from bleak.exc import BleakError
+
+        self.connect_kwargs = kwargs
+        cls = _Client
+        cls.connecting += 1
+        cls.max_connecting = max(cls.max_connecting, cls.connecting)
+        try:
+            await asyncio.sleep(0.01)
+            if self.address in cls.in_progress:
+                cls.in_progress.discard(self.address)
+                raise BleakError(
+                    "org.bluez.Error.InProgress: Operation already in progress"
+                )
+            cls.log.append(("connect", self.address))
+            self.connected = True
+        finally:
+            cls.connecting -= 1
+
+    async def disconnect(self):
+        _Client.log.append(("disconnect", self.address))
+        self.connected = False
+        return True
+
+
+@pytest.fixture
+def pool_module(monkeypatch):
+    from bleak.backends.bluezdbus import pool
+
+    monkeypatch.setattr(pool, "get_shared_bus", _get_shared_bus)
+    _Client.connecting = _Client.max_connecting = 0
+    _Client.log = []
+    _Client.in_progress = set()
+    _SharedBus.refcount = 0
+    return pool
+
+
+def test_connection_attempts_are_queued_per_adapter(pool_module):
+    loop = asyncio.new_event_loop()
+    pool = pool_module.BleakConnectionPool(
+        loop, max_connecting=1, retry_delay=0, client_class=_Client
+    )
+    addresses = ["00:00:00:00:00:0{0}".format(i) for i in range(4)]
+    _Client.in_progress.add(addresses[1])
+
+    async def connect_all():
+        clients = await asyncio.gather(*(pool.acquire(a) for a in addresses))
+        return clients, pool.stats()
+
+    try:
+        clients, stats = loop.run_until_complete(connect_all())
+        loop.run_until_complete(pool.close())
+    finally:
+        loop.close()
+
+    assert [c.address for c in clients] == addresses
+    assert _Client.max_connecting == 1
+    assert [a for op, a in _Client.log if op == "connect"] == addresses
+    assert stats["connections"] == 4
+    assert stats["retries"] == 1
+    assert stats["adapters"]["hci0"]["connections"] == 4
+    # The bus is acquired once for the concurrent attempts, and released.
+    assert _SharedBus.refcount == 0
+
+
+def test_connections_are_reused_and_closed_when_idle(pool_module):
+    loop = asyncio.new_event_loop()
+    pool = pool_module.BleakConnectionPool(
+        loop, idle_timeout=0.02, client_class=_Client
+    )
+    address = "00:11:22:33:44:55"
+
+    async def use():
+        async with pool.connection(address) as first:
+            second = await pool.acquire(address.lower())
+            assert second is first
+            await pool.release(second)
+        assert pool.stats()["idle"] == 1
+        # Acquired again before the idle timeout.
+        async with pool.connection(address) as third:
+            assert third is first
+        await asyncio.sleep(0.05)
+        return pool.stats()
+
+    try:
+        stats = loop.run_until_complete(use())
+        loop.run_until_complete(pool.close())
+    finally:
+        loop.close()
+
+    assert _Client.log == [("connect", address), ("disconnect", address)]
+    assert stats["connections"] == 0
+    assert stats["connects"] == 1
+    assert stats["reuses"] == 2
+    assert stats["idle_closed"] == 1
+
+
+def _adapter(address):
+    return {"org.bluez.Adapter1": {"Address": address, "Powered": True}}
+
+
+def _device(address, rssi):
+    return {"org.bluez.Device1": {"Address": address, "RSSI": rssi}}
+
+
+def test_scheduler_spreads_connections_over_adapters(pool_module):
+    from bleak.backends.bluezdbus.scheduler import BleakAdapterScheduler
+
+    loop = asyncio.new_event_loop()
+    scheduler = BleakAdapterScheduler(
+        loop, scan_adapter="hci0", retry_delay=0, client_class=_Client
+    )
+    scheduler._load_objects(
+        {
+            "/org/bluez/hci0": _adapter("AA:AA:AA:AA:AA:00"),
+            "/org/bluez/hci1": _adapter("AA:AA:AA:AA:AA:01"),
+            "/org/bluez/hci2": _adapter("AA:AA:AA:AA:AA:02"),
+            "/org/bluez/hci1/dev_00_00_00_00_00_01": _device("00:00:00:00:00:01", -90),
+            "/org/bluez/hci2/dev_00_00_00_00_00_01": _device("00:00:00:00:00:01", -50),
+            "/org/bluez/hci1/dev_00_00_00_00_00_02": _device("00:00:00:00:00:02", -60),
+        }
+    )
+
+    async def connect_all():
+        return await asyncio.gather(
+            scheduler.acquire("00:00:00:00:00:01"),
+            scheduler.acquire("00:00:00:00:00:02"),
+            scheduler.acquire("00:00:00:00:00:03"),
+        )
+
+    try:
+        clients = loop.run_until_complete(connect_all())
+        stats = scheduler.stats()
+        loop.run_until_complete(scheduler.close())
+    finally:
+        loop.close()
+
+    # The best RSSI, then the least loaded. The scan adapter is left alone.
+    assert [c.device for c in clients] == ["hci2", "hci1", "hci1"]
+    assert stats["hci0"]["scan_adapter"] and stats["hci0"]["load"] == 0
+    assert (stats["hci1"]["connections"], stats["hci1"]["assigned"]) == (2, 2)
+    assert stats["hci2"]["seen"] == 1
+
+
+class _Signal(object):
+    def __init__(self, member, path, body):
+        self.member = member
+        self.path = path
+        self.body = body
+
+
+def test_scheduler_keeps_rssi_of_every_adapter(pool_module):
+    from bleak.backends.bluezdbus.scheduler import BleakAdapterScheduler
+
+    loop = asyncio.new_event_loop()
+    scheduler = BleakAdapterScheduler(
+        loop, scan_adapter="hci0", max_devices=2, client_class=_Client
+    )
+    scheduler._load_objects(
+        {
+            "/org/bluez/hci0": _adapter("AA:AA:AA:AA:AA:00"),
+            "/org/bluez/hci1": _adapter("AA:AA:AA:AA:AA:01"),
+            "/org/bluez/hci2": _adapter("AA:AA:AA:AA:AA:02"),
+        }
+    )
+    loop.close()
+
+    def changed(adapter, device, rssi):
+        path = "/org/bluez/{0}/dev_00_00_00_00_00_0{1}".format(adapter, device)
+        props = {"RSSI": rssi}
+        scheduler._on_signal(
+            _Signal("PropertiesChanged", path, ["org.bluez.Device1", props, []])
+        )
+
+    changed("hci0", 1, -30)
+    changed("hci1", 1, -80)
+    changed("hci2", 1, -40)
+    assert scheduler.choose_adapter("00:00:00:00:00:01") == "hci2"
+
+    changed("hci2", 1, -90)
+    assert scheduler.choose_adapter("00:00:00:00:00:01") == "hci1"
+
+    # The entry of a removed device or adapter expires.
+    scheduler._on_signal(
+        _Signal(
+            "InterfacesRemoved",
+            "/org/bluez",
+            ["/org/bluez/hci1/dev_00_00_00_00_00_01", ["org.bluez.Device1"]],
+        )
+    )
+    assert scheduler._rssi["00:00:00:00:00:01"] == {"hci0": -30, "hci2": -90}
+    scheduler._on_signal(
+        _Signal(
+            "InterfacesRemoved",
+            "/org/bluez",
+            ["/org/bluez/hci0", ["org.bluez.Adapter1"]],
+        )
+    )
+    assert scheduler._rssi["00:00:00:00:00:01"] == {"hci2": -90}
+
+    # Only the most recently seen devices are kept.
+    changed("hci1", 2, -50)
+    changed("hci1", 1, -50)
+    changed("hci1", 3, -50)
+    assert list(scheduler._rssi) == ["00:00:00:00:00:01", "00:00:00:00:00:03"]
+
+
+def test_scheduler_connects_scanned_devices_on_the_chosen_adapter(pool_module):
+    from bleak.backends.device import BLEDevice
+    from bleak.backends.bluezdbus.scheduler import BleakAdapterScheduler
+
+    loop = asyncio.new_event_loop()
+    scheduler = BleakAdapterScheduler(
+        loop, scan_adapter="hci0", retry_delay=0, client_class=_Client
+    )
+    scheduler._load_objects(
+        {
+            "/org/bluez/hci0": _adapter("AA:AA:AA:AA:AA:00"),
+            "/org/bluez/hci1": _adapter("AA:AA:AA:AA:AA:01"),
+        }
+    )
+
+    def scanned(address, adapter):
+        path = "/org/bluez/{0}/dev_{1}".format(adapter, address.replace(":", "_"))
+        return BLEDevice(address, "Fake", {"path": path, "props": {}})
+
+    async def connect_all():
+        return await asyncio.gather(
+            scheduler.acquire(
+                "00:00:00:00:00:01", ble_device=scanned("00:00:00:00:00:01", "hci0")
+            ),
+            scheduler.acquire(
+                "00:00:00:00:00:02", ble_device=scanned("00:00:00:00:00:02", "hci1")
+            ),
+        )
+
+    try:
+        clients = loop.run_until_complete(connect_all())
+        stats = scheduler.stats()
+        loop.run_until_complete(scheduler.close())
+    finally:
+        loop.close()
+
+    assert [c.device for c in clients] == ["hci1", "hci1"]
+    # The path on the scan adapter is dropped, the one on hci1 is kept.
+    assert clients[0].connect_kwargs == {}
+    assert clients[1].connect_kwargs == {
+        "device_path": "/org/bluez/hci1/dev_00_00_00_00_00_02"
+    }
+    assert stats["hci0"]["load"] == 0 and stats["hci1"]["connections"] == 2
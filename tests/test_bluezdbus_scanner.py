@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the advertisement callbacks of the BlueZ scanner."""
+
+import asyncio
+import platform
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    platform.system() != "Linux", reason="BlueZ backend is only used on Linux."
+)
+
+_DEVICE = "/org/bluez/hci0/dev_00_11_22_33_44_55"
+
+
+class _Signal(object):
+    def __init__(self, member, path, body):
+        self.member = member
+        self.path = path
+        self.body = body
+        self.interface = "org.freedesktop.DBus.Properties"
+
+
+def _properties_changed(changed):
+    return _Signal("PropertiesChanged", _DEVICE, ["org.bluez.Device1", changed, []])
+
+
+def test_advertisements_are_deduplicated():
+    from bleak.backends.bluezdbus.scanner import BleakScannerBlueZDBus
+
+    loop = asyncio.new_event_loop()
+    try:
+        scanner = BleakScannerBlueZDBus(loop)
+    finally:
+        loop.close()
+    received = []
+    scanner.register_advertisement_callback(received.append, rssi_hysteresis=5)
+
+    scanner.parse_msg(
+        _Signal(
+            "InterfacesAdded",
+            "/",
+            [
+                _DEVICE,
+                {
+                    "org.bluez.Device1": {
+                        "Address": "00:11:22:33:44:55",
+                        "RSSI": -70,
+                        "ManufacturerData": {0x0059: [1, 2]},
+                    }
+                },
+            ],
+        )
+    )
+    scanner.parse_msg(_properties_changed({"RSSI": -72}))
+    scanner.parse_msg(_properties_changed({"RSSI": -76}))
+    scanner.parse_msg(_properties_changed({"ManufacturerData": {0x0059: [1, 2]}}))
+    scanner.parse_msg(_properties_changed({"ManufacturerData": {0x0059: [3]}}))
+
+    assert [(d.rssi, d.manufacturer_data) for d in received] == [
+        (-70, {0x0059: b"\x01\x02"}),
+        (-76, {0x0059: b"\x01\x02"}),
+        (-76, {0x0059: b"\x03"}),
+    ]
+    assert received[0].address == "00:11:22:33:44:55"
+
+    # Seen anew after BlueZ has removed it.
+    scanner.parse_msg(
+        _Signal("InterfacesRemoved", "/", [_DEVICE, ["org.bluez.Device1"]])
+    )
+    scanner.parse_msg(_properties_changed({"RSSI": -76}))
+    assert len(received) == 4
+
+
+def test_advertisement_tracker_is_bounded():
+    from bleak.backends.scanner import AdvertisementData, AdvertisementTracker
+
+    tracker = AdvertisementTracker(max_size=2)
+    addresses = ["00:00:00:00:00:0{0}".format(i) for i in range(3)]
+    assert tracker.update(AdvertisementData(addresses[0], rssi=-50))
+    assert tracker.update(AdvertisementData(addresses[1], rssi=-50))
+    # Seen again, so the other one is the least recently seen.
+    assert not tracker.update(AdvertisementData(addresses[0], rssi=-51))
+    assert tracker.update(AdvertisementData(addresses[2], rssi=-50))
+
+    assert list(tracker._last) == [addresses[0], addresses[2]]
+    assert not tracker.update(AdvertisementData(addresses[0], rssi=-50))
+    assert tracker.update(AdvertisementData(addresses[1], rssi=-50))
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for building the GATT service collection in the BlueZ backend."""
+
+import asyncio
+import platform
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    platform.system() != "Linux", reason="BlueZ backend is only used on Linux."
+)
+
+_DEVICE = "/org/bluez/hci0/dev_00_11_22_33_44_55"
+
+
+def _managed_objects():
+    service = _DEVICE + "/service000c"
+    char = service + "/char000d"
+    return {
+        # Deliberately listed children first.
+        char + "/desc000f": {
+            "org.bluez.GattDescriptor1": {
+                "UUID": "00002902-0000-1000-8000-00805f9b34fb",
+                "Characteristic": char,
+            }
+        },
+        char: {
+            "org.bluez.GattCharacteristic1": {
+                "UUID": "00002a37-0000-1000-8000-00805f9b34fb",
+                "Service": service,
+                "Flags": ["notify"],
+            }
+        },
+        service: {
+            "org.bluez.GattService1": {
+                "UUID": "0000180d-0000-1000-8000-00805f9b34fb",
+                "Primary": True,
+                "Device": _DEVICE,
+            }
+        },
+    }
+
+
+def test_gatt_objects_are_linked_by_path():
+    """Test that the tree is built regardless of the order of the managed objects."""
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    loop = asyncio.new_event_loop()
+    client = BleakClientBlueZDBus("00:11:22:33:44:55", loop=loop)
+    client._add_gatt_objects(_managed_objects())
+    loop.close()
+
+    service = client.services.get_service_by_path(_DEVICE + "/service000c")
+    assert service.uuid == "0000180d-0000-1000-8000-00805f9b34fb"
+    char = client.services.get_characteristic_by_path(
+        _DEVICE + "/service000c/char000d"
+    )
+    assert char.handle == 0x0D
+    assert service.characteristics == [char]
+    assert [d.handle for d in char.descriptors] == [0x0F]
+    assert client.services.get_descriptor(0x0F).characteristic_handle == 0x0D
+
+
+def test_get_characteristic_by_uuid():
+    """Test UUID lookup with short forms, UUID objects and ambiguous UUIDs."""
+    import uuid
+
+    from bleak.exc import BleakError
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    objs = _managed_objects()
+    second = _DEVICE + "/service000c/char0010"
+    objs[second] = {
+        "org.bluez.GattCharacteristic1": {
+            "UUID": "00002a38-0000-1000-8000-00805f9b34fb",
+            "Service": _DEVICE + "/service000c",
+            "Flags": ["read"],
+        }
+    }
+    loop = asyncio.new_event_loop()
+    client = BleakClientBlueZDBus("00:11:22:33:44:55", loop=loop)
+    client._add_gatt_objects(objs)
+    loop.close()
+    services = client.services
+
+    char = services.get_characteristic(0x0D)
+    assert services.get_characteristic("00002a37-0000-1000-8000-00805f9b34fb") is char
+    assert services.get_characteristic("00002A37-0000-1000-8000-00805F9B34FB") is char
+    assert services.get_characteristic("2a37") is char
+    assert services.get_characteristic("0x2A37") is char
+    assert (
+        services.get_characteristic(uuid.UUID("00002a37-0000-1000-8000-00805f9b34fb"))
+        is char
+    )
+    assert services.get_characteristic("2a39") is None
+
+    # Second instance of the same characteristic UUID.
+    objs[_DEVICE + "/service000c/char0012"] = {
+        "org.bluez.GattCharacteristic1": {
+            "UUID": "00002a37-0000-1000-8000-00805f9b34fb",
+            "Service": _DEVICE + "/service000c",
+            "Flags": ["read"],
+        }
+    }
+    client.services = type(services)()
+    client._add_gatt_objects(objs)
+    with pytest.raises(BleakError):
+        client.services.get_characteristic("2a37")
+
+
+def test_gatt_cache_entries_are_kept_on_disk(tmp_path):
+    from bleak.backends.bluezdbus import gattcache
+
+    objects = _managed_objects()
+    objects[_DEVICE + "/service000c/char000d"]["org.bluez.GattCharacteristic1"][
+        "Value"
+    ] = [1, 2]
+    cache = gattcache.GATTCache(str(tmp_path))
+    cache.put(
+        "00:11:22:33:44:55", gattcache.strip_device_path(objects, _DEVICE), "ab"
+    )
+
+    entry = gattcache.GATTCache(str(tmp_path)).get("00:11:22:33:44:55")
+    assert entry["hash"] == "ab"
+    # The entry is valid for a connection through another adapter.
+    other = "/org/bluez/hci1/dev_00_11_22_33_44_55"
+    restored = gattcache.add_device_path(entry["objects"], other)
+    char = restored[other + "/service000c/char000d"]["org.bluez.GattCharacteristic1"]
+    assert char["Service"] == other + "/service000c"
+    assert "Value" not in char
+    assert gattcache.service_uuids(restored) == ["0000180d-0000-1000-8000-00805f9b34fb"]
+
+    cache.invalidate("00:11:22:33:44:55")
+    assert gattcache.GATTCache(str(tmp_path)).get("00:11:22:33:44:55") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_battery_level_fallback_accepts_short_uuids():
+    """Test that BlueZ >= 5.48 battery reads work with any form of the UUID."""
+    import uuid
+
+    from bleak.exc import BleakError
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    loop = asyncio.new_event_loop()
+    client = BleakClientBlueZDBus("00:11:22:33:44:55", loop=loop)
+    client._bluez_version = (5, 50)
+
+    async def get_device_properties(interface=None):
+        return {"Percentage": 42}
+
+    client._get_device_properties = get_device_properties
+    battery_level = uuid.UUID("00002a19-0000-1000-8000-00805f9b34fb")
+    try:
+        for specifier in ("2a19", "2A19", "0x2a19", battery_level):
+            value = loop.run_until_complete(client.read_gatt_char(specifier))
+            assert value == bytearray([42])
+        # A handle, not the UUID.
+        with pytest.raises(BleakError):
+            loop.run_until_complete(client.read_gatt_char(0x2A19))
+    finally:
+        loop.close()
+
+
+class _Message(object):
+    def __init__(self, member, path, body):
+        self.member = member
+        self.path = path
+        self.body = body
+
+
+def _wait_for_services_resolved(resolved, signal_after=None, timeout=1.0):
+    """Run ``_wait_for_services_resolved`` with the device properties faked."""
+    from bleak.backends.bluezdbus.bus import SharedBus, PROPERTIES_CHANGED
+    from bleak.backends.bluezdbus.client import BleakClientBlueZDBus
+
+    loop = asyncio.new_event_loop()
+    bus = SharedBus(loop)
+    client = BleakClientBlueZDBus("00:11:22:33:44:55", loop=loop)
+    client._shared_bus = bus
+    client._device_path = _DEVICE
+
+    async def get_device_properties():
+        return {"Connected": True, "ServicesResolved": resolved}
+
+    client._get_device_properties = get_device_properties
+    if signal_after is not None:
+        signal = _Message(
+            PROPERTIES_CHANGED,
+            _DEVICE,
+            ["org.bluez.Device1", {"ServicesResolved": True}, []],
+        )
+        loop.call_later(signal_after, bus._dispatch, signal)
+
+    try:
+        loop.run_until_complete(
+            asyncio.wait_for(client._wait_for_services_resolved(timeout), 5)
+        )
+    finally:
+        loop.close()
+        # The signal handler is removed however the wait ends.
+        assert bus._handlers[PROPERTIES_CHANGED] == {}
+
+
+def test_services_resolved_at_connect_is_not_waited_for():
+    _wait_for_services_resolved(True, timeout=0)
+
+
+def test_services_resolved_is_waited_for():
+    _wait_for_services_resolved(False, signal_after=0.01)
+
+
+def test_services_resolved_wait_times_out():
+    from bleak.exc import BleakError
+
+    with pytest.raises(BleakError, match="Services discovery error"):
+        _wait_for_services_resolved(False, timeout=0.05)
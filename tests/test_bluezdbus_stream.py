@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for splitting streamed writes into chunks in the BlueZ backend."""
+
+import asyncio
+import platform
+import socket
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    platform.system() != "Linux", reason="BlueZ backend is only used on Linux."
+)
+
+
+def test_split_carries_remainder_over():
+    from bleak.backends.bluezdbus.stream import split
+
+    buffer = bytearray()
+    chunks = []
+    for item in (b"abc", b"defgh", b"", b"ij", b"klmnopq"):
+        chunks.extend(split(buffer, item, 4))
+
+    assert chunks == [b"abcd", b"efgh", b"ijkl", b"mnop"]
+    assert buffer == b"q"
+
+
+def test_fd_writer_removes_its_writer_when_cancelled():
+    from bleak.backends.bluezdbus.stream import FdWriter
+
+    loop = asyncio.new_event_loop()
+    sock, peer = socket.socketpair()
+    writer = FdWriter(loop, sock.detach())
+
+    async def fill():
+        while True:
+            await writer.write(bytes(4096))
+
+    async def run():
+        task = asyncio.ensure_future(fill(), loop=loop)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Waiting for the full socket to become writable, but not anymore.
+        return loop.remove_writer(writer.fd)
+
+    try:
+        assert loop.run_until_complete(run()) is False
+        writer.close()
+    finally:
+        peer.close()
+        loop.close()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the lazy probe of the BlueZ version."""
+
+import asyncio
+import platform
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    platform.system() != "Linux", reason="BlueZ backend is only used on Linux."
+)
+
+
+class _Bus(object):
+    """Bus answering ``Get`` of ``Modalias`` after a loop iteration."""
+
+    def __init__(self, loop, modalias):
+        self.calls = 0
+        self._loop = loop
+        self._modalias = modalias
+
+    def callRemote(self, path, member, **kwargs):
+        self.calls += 1
+        reply = self._loop.create_future()
+        self._loop.call_soon(reply.set_result, self._modalias)
+        return _Deferred(reply)
+
+
+class _Deferred(object):
+    def __init__(self, future):
+        self._future = future
+
+    def asFuture(self, loop):
+        return self._future
+
+
+@pytest.fixture
+def version(monkeypatch):
+    from bleak.backends.bluezdbus import version
+
+    monkeypatch.setattr(version, "_bluez_version", None)
+    return version
+
+
+def _get_versions(version, modalias, n=1):
+    loop = asyncio.new_event_loop()
+    bus = _Bus(loop, modalias)
+
+    async def get():
+        return await asyncio.gather(
+            *(version.get_bluez_version(bus, loop) for _ in range(n))
+        )
+
+    try:
+        return loop.run_until_complete(get()), bus.calls
+    finally:
+        loop.close()
+
+
+def test_version_from_modalias(version):
+    assert version._version_from_modalias("usb:v1D6Bp0246d0535") == (5, 53)
+    assert version._version_from_modalias("usb:v1D6Bp0246d052B") == (5, 43)
+    assert version._version_from_modalias("usb:v1D6Bp0246d05") is None
+    assert version._version_from_modalias("usb:v05ACp0001d0001") is None
+    assert version._version_from_modalias(None) is None
+
+
+def test_version_is_probed_once_for_many_clients(version, monkeypatch):
+    monkeypatch.setattr(version, "_version_from_bluetoothctl", pytest.fail)
+
+    versions, calls = _get_versions(version, "usb:v1D6Bp0246d0532", n=5)
+    assert versions == [(5, 50)] * 5
+    assert calls == 1
+
+    versions, calls = _get_versions(version, "usb:v1D6Bp0246d0532")
+    assert versions == [(5, 50)]
+    assert calls == 0
+
+
+def test_bluetoothctl_is_run_once_if_modalias_is_not_of_bluez(version, monkeypatch):
+    runs = []
+
+    def bluetoothctl():
+        runs.append(None)
+        return 5, 48
+
+    monkeypatch.setattr(version, "_version_from_bluetoothctl", bluetoothctl)
+
+    versions, _ = _get_versions(version, "usb:v05ACp0001d0001", n=3)
+    assert versions == [(5, 48)] * 3
+    versions, _ = _get_versions(version, "usb:v05ACp0001d0001")
+    assert versions == [(5, 48)]
+    assert len(runs) == 1
+
+
+def test_versions_before_5_43_are_rejected(version):
+    from bleak.exc import BleakError
+
+    for _ in range(2):
+        with pytest.raises(BleakError, match="5.42"):
+            _get_versions(version, "usb:v1D6Bp0246d052A")
+
+
+def test_import_bleak_does_not_import_backends():
+    """Importing bleak imports neither the backends nor twisted and txdbus."""
+    code = (
+        "import sys, bleak\n"
+        "loaded = [m for m in sys.modules if m.split('.')[0] in ('twisted', 'txdbus')"
+        " or m.startswith('bleak.backends')]\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.check_call([sys.executable, "-c", code])
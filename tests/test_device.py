@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `bleak.backends.device` module."""
+
+from bleak.backends.device import BLEDevice
+
+
+def test_address_as_int():
+    device = BLEDevice(0x0011223344AA, "Sensor", rssi=-60, uuids=["180f"])
+    assert device.address == "00:11:22:33:44:AA"
+    assert BLEDevice("00:11:22:33:44:AA", None).address_int == 0x0011223344AA
+    # macOS identifies devices by UUID.
+    uuid = "2F0EB1D1-C83A-4E5A-9DE6-58F8E3F63BE0"
+    assert BLEDevice(uuid, None).address_int is None
+    assert BLEDevice(uuid, None).address == uuid
+    assert device.metadata == {"uuids": ["180f"], "manufacturer_data": {}}
+
+
+def test_metadata_changes_are_kept():
+    device = BLEDevice("00:11:22:33:44:AA", "Sensor", uuids=["180f"], source="scan")
+    device.metadata["uuids"].append("180a")
+    device.metadata["tag"] = 1
+    assert device.metadata == {
+        "uuids": ["180f", "180a"],
+        "manufacturer_data": {},
+        "source": "scan",
+        "tag": 1,
+    }
+
+
+def test_details_are_built_on_first_access():
+    calls = []
+
+    def details():
+        calls.append(1)
+        return {"path": "/org/bluez/hci0/dev_00_11_22_33_44_AA", "props": {}}
+
+    device = BLEDevice("00:11:22:33:44:AA", "Sensor", details_factory=details)
+    assert calls == []
+    assert device.details["props"] == {}
+    assert device.details is device.details
+    assert calls == [1]
+    # Not passed, so read from the details.
+    assert device.rssi == 0
+
+
+def test_metadata_follows_the_fields():
+    device = BLEDevice("00:11:22:33:44:AA", "Sensor", uuids=["180f"])
+    device.metadata["tag"] = 1
+    device.uuids = ["180a"]
+    device.manufacturer_data = {0x004C: b"\x02"}
+    assert device.uuids == ("180a",)
+    assert device.metadata == {
+        "uuids": ["180a"],
+        "manufacturer_data": {0x004C: b"\x02"},
+        "tag": 1,
+    }
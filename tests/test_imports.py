@@ -5,6 +5,8 @@
 
 import os
 import platform
+import subprocess
+import sys
 
 import pytest
 
@@ -32,3 +34,17 @@ def test_import():
         from bleak import BleakClient
 
         assert BleakClient.__name__ == "BleakClientCoreBluetooth"
+
+
+def test_name_tables_are_loaded_on_first_use():
+    """The UUID and manufacturer name tables are not loaded by importing bleak."""
+    code = (
+        "import sys, bleak, bleak.backends.device, bleak.backends.service\n"
+        "assert 'bleak._uuid_names' not in sys.modules\n"
+        "assert 'bleak.backends._manufacturers' not in sys.modules\n"
+        "from bleak.uuids import uuid16_dict\n"
+        "from bleak.backends.device import MANUFACTURERS\n"
+        "assert uuid16_dict[0x180F] == 'Battery Service'\n"
+        "assert MANUFACTURERS[0x004C] == 'Apple, Inc.'\n"
+    )
+    subprocess.check_call([sys.executable, "-c", code])
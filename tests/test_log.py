@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for hot path logging."""
+
+import logging
+
+import bleak.log
+
+
+def test_trace_records_instead_of_logging(caplog):
+    logger = bleak.log.get_logger("bleak.test")
+    bleak.log.enable_trace(capacity=2)
+    try:
+        with caplog.at_level(logging.DEBUG, logger="bleak.test"):
+            logger.debug("first %s", 1)
+            logger.info("second %s", 2)
+            logger.warning("third %s", 3)
+    finally:
+        records = bleak.log.disable_trace()
+
+    assert [(name, level, msg, args) for _, name, level, msg, args in records] == [
+        ("bleak.test", logging.INFO, "second %s", (2,)),
+        ("bleak.test", logging.WARNING, "third %s", (3,)),
+    ]
+    assert [r.getMessage() for r in caplog.records] == ["third 3"]
+    assert bleak.log.get_trace() == []
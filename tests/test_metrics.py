@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the latency histograms and error counters of client operations."""
+
+import random
+
+import pytest
+
+from bleak.backends.metrics import ClientMetrics, LatencyHistogram
+
+
+def test_histogram_percentiles_are_within_a_bucket():
+    rng = random.Random(1)
+    durations = sorted(rng.lognormvariate(-6, 1.5) for _ in range(10000))
+    histogram = LatencyHistogram()
+    for d in durations:
+        histogram.record(d)
+
+    assert histogram.count == len(durations)
+    for q in (50, 90, 99, 99.9):
+        exact = durations[int(len(durations) * q / 100.0) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=0.02, abs=2e-6)
+    assert histogram.percentile(100) == durations[-1]
+
+
+def test_spans_errors_and_prometheus_export():
+    metrics = ClientMetrics(labels={"address": "00:11:22:33:44:55"})
+    metrics.record("read_gatt_char", 0.002, "uuid-a")
+    metrics.record("read_gatt_char", 0.2, "uuid-b")
+    with metrics.span("connect"):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.span("read_gatt_char", "uuid-a"):
+            raise ValueError()
+
+    stats = metrics.as_dict()
+    assert stats["read_gatt_char"]["count"] == 2
+    assert stats["read_gatt_char"]["errors"] == 1
+    assert stats["read_gatt_char"]["targets"]["uuid-a"]["errors"] == 1
+    assert stats["connect"]["count"] == 1
+
+    text = metrics.prometheus()
+    assert (
+        'bleak_operation_seconds_bucket{address="00:11:22:33:44:55",'
+        'operation="read_gatt_char",target="uuid-a",le="0.0025"} 1'
+    ) in text
+    assert 'operation="read_gatt_char",target=""' not in text
+    assert 'operation="connect",target=""' in text
+    assert (
+        'bleak_operation_errors_total{address="00:11:22:33:44:55",'
+        'operation="read_gatt_char",target="uuid-a"} 1'
+    ) in text
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for batched and streamed delivery of notifications."""
+
+import asyncio
+
+from bleak.backends.notification import NotificationBatcher, NotificationStream
+
+
+def test_batches_flush_by_size_and_time():
+    loop = asyncio.new_event_loop()
+    batches = []
+    batcher = NotificationBatcher(
+        loop, "sender", lambda sender, records: batches.append(records), 3, 0.01
+    )
+
+    async def feed():
+        for i in range(4):
+            batcher.append(i)
+        await asyncio.sleep(0)
+        assert [[payload for _, payload in b] for b in batches] == [[0, 1, 2, 3]]
+        batcher.append(4)
+        await asyncio.sleep(0.05)
+
+    try:
+        loop.run_until_complete(feed())
+    finally:
+        loop.close()
+
+    assert [[payload for _, payload in b] for b in batches] == [[0, 1, 2, 3], [4]]
+    assert batcher.stats() == {
+        "received": 5,
+        "delivered": 5,
+        "dropped": 0,
+        "flushes": 2,
+        "depth": 0,
+        "max_depth": 4,
+    }
+
+
+def test_oldest_records_dropped_while_callback_is_busy():
+    loop = asyncio.new_event_loop()
+    batches = []
+    release = loop.create_future()
+
+    async def callback(sender, records):
+        batches.append([payload for _, payload in records])
+        await release
+
+    batcher = NotificationBatcher(loop, "sender", callback, 2, capacity=4)
+
+    async def feed():
+        batcher.append(0)
+        batcher.append(1)
+        await asyncio.sleep(0)
+        for i in range(2, 8):
+            batcher.append(i)
+        release.set_result(None)
+        await asyncio.sleep(0.01)
+
+    try:
+        loop.run_until_complete(feed())
+    finally:
+        loop.close()
+
+    assert batches == [[0, 1], [4, 5, 6, 7]]
+    assert batcher.stats()["dropped"] == 2
+
+
+class _Client(object):
+    """Just enough of a client to start and stop notifications."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.callback = None
+        self.calls = []
+
+    async def start_notify(self, char_specifier, callback, **kwargs):
+        self.calls.append("start")
+        await asyncio.sleep(0)
+        self.callback = callback
+
+    async def stop_notify(self, char_specifier):
+        self.calls.append("stop")
+        self.callback = None
+
+    def notify(self, data):
+        if self.callback is not None:
+            self.callback("sender", data)
+
+
+def test_stream_drops_oldest_when_full():
+    loop = asyncio.new_event_loop()
+    client = _Client(loop)
+
+    async def consume():
+        received = []
+        async with NotificationStream(client, "char", maxsize=2) as stream:
+            for i in range(4):
+                client.notify(i)
+            async for data in stream:
+                received.append(data)
+                if not stream.qsize:
+                    break
+        return received, stream.dropped
+
+    try:
+        assert loop.run_until_complete(consume()) == ([2, 3], 2)
+    finally:
+        loop.close()
+    assert client.calls == ["start", "stop"]
+
+
+def test_stream_block_pauses_notifications():
+    loop = asyncio.new_event_loop()
+    client = _Client(loop)
+    stream = NotificationStream(client, "char", maxsize=4, overflow="block")
+
+    async def consume():
+        await stream.start()
+        for i in range(5):
+            client.notify(i)
+        await asyncio.sleep(0)
+        # Stopped after the queue got full.
+        client.notify(5)
+        received = []
+        async for data in stream:
+            received.append(data)
+            if len(received) == 3:
+                await stream.aclose()
+        return received
+
+    try:
+        assert loop.run_until_complete(consume()) == [0, 1, 2, 3, 4]
+    finally:
+        loop.close()
+    assert client.calls == ["start", "stop", "start", "stop"]
+    assert stream.pauses == 1
+
+
+def test_stream_closed_while_resuming_stops_notifications():
+    loop = asyncio.new_event_loop()
+    client = _Client(loop)
+    stream = NotificationStream(client, "char", maxsize=2, overflow="block")
+
+    async def consume():
+        await stream.start()
+        for i in range(3):
+            client.notify(i)
+        assert await stream.__anext__() == 0
+        # Taking the next one resumes notifications.
+        resuming = asyncio.ensure_future(stream.__anext__(), loop=loop)
+        while client.calls != ["start", "stop", "start"]:
+            await asyncio.sleep(0)
+        # Closed before start_notify has returned.
+        await stream.aclose()
+        assert await resuming == 1
+
+    try:
+        loop.run_until_complete(consume())
+    finally:
+        loop.close()
+    assert client.calls == ["start", "stop", "start", "stop"]
+    assert client.callback is None
@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `bleak.uuids` module."""
+
+import uuid
+
+from bleak.uuids import normalize_uuid_str, uuidstr_to_str
+
+
+def test_uuid_forms_are_normalized():
+    expected = "00002a37-0000-1000-8000-00805f9b34fb"
+    for form in (
+        expected,
+        expected.upper(),
+        "2A37",
+        "0x2a37",
+        0x2A37,
+        uuid.UUID(expected),
+    ):
+        assert normalize_uuid_str(form) == expected
+        assert uuidstr_to_str(form) == "Heart Rate Measurement"
+    assert normalize_uuid_str(0x6E400001B5A3F393E0A9E50E24DCCA9E) == (
+        "6e400001-b5a3-f393-e0a9-e50e24dcca9e"
+    )
+    assert uuidstr_to_str("0000ffff-0000-1000-8000-00805f9b34fb") == "Vendor specific"
+    assert uuidstr_to_str("12345678-1234-1234-1234-123456789abc") == "Unknown"